@@ -32,6 +32,8 @@ class Settings(BaseModel):
     AP_PASSWORD: str = "radio@1234"
     AP_CHANNEL: int = 6
     AP_BAND: str = "bg"
+    AP_SCAN_INTERFACE: str = "scan0"  # Virtual interface for scanning while in AP mode
+    AP_SCAN_TIMEOUT: float = 15.0  # Seconds allowed for one scan on it
 
     # Default Station Settings
     DEFAULT_STATIONS: Dict[int, str] = {
@@ -65,6 +67,32 @@ class Settings(BaseModel):
     LONG_PRESS_DURATION: float = 3.0
     TRIPLE_PRESS_INTERVAL: float = 0.5
 
+    # Monitor broadcast cadence (in seconds)
+    MONITOR_MIN_INTERVAL: float = 2.0  # Used while values keep changing
+    MONITOR_MAX_INTERVAL: float = 30.0  # Upper bound when nothing changes
+    MONITOR_BACKOFF_FACTOR: float = 1.5  # Slowdown per unchanged sample
+
+    # Background station stream probing
+    STREAM_PROBE_ENABLED: bool = True  # Check catalog stream URLs in the background
+    STREAM_PROBE_CONCURRENCY: int = 4  # Parallel probes (paused while playing)
+    STREAM_PROBE_TIMEOUT: float = 10.0  # Seconds per probe
+    STREAM_PROBE_RECHECK: int = 86400  # Seconds before a station is probed again
+
+    # WiFi scan cache (in seconds)
+    WIFI_SCAN_TTL: float = 15.0  # Scan results served without rescanning
+    WIFI_SCAN_MAX_STALE: float = 300.0  # Older results make the caller wait for a scan
+    WIFI_SCAN_REFRESH_INTERVAL: float = 10.0  # Background rescans while a page watches
+
+    # NetworkManager access, nmcli is used where D-Bus is unavailable
+    NETWORK_DBUS_ENABLED: bool = True  # Talk to NetworkManager over D-Bus
+    NETWORK_DBUS_RETRY: float = 60.0  # Seconds before an unreachable bus is retried
+
+    # Internet connectivity checks (also run after network events)
+    CONNECTIVITY_CHECK_INTERVAL: float = 60.0  # Seconds between scheduled checks
+
+    # Mode switching (in seconds)
+    MODE_SWITCH_TIMEOUT: float = 30.0  # Deadline for the network to come up
+
     def export_frontend_config(self) -> None:
         """Export relevant settings for frontend use"""
         frontend_config = {
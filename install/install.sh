@@ -462,6 +462,8 @@ python3 -m venv ${VENV_PATH}
 source ${VENV_PATH}/bin/activate
 pip install --upgrade pip
 pip install -r "$REQUIREMENTS_FILE"
+# Compile the station catalog for fast memory-mapped loading
+cd ${RADIO_HOME} && python -m src.core.station_binary config/stations.json config/stations.bin || echo "Warning: could not compile station catalog, using stations.json"
 EOF
 
 echo "8. Setting up audio and MPV..."
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Compare station catalog load time and memory per storage approach.
+
+Usage: python scripts/benchmark_catalog.py [station count]
+"""
+
+import gc
+import json
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.models import RadioStation, StationRecord  # noqa: E402
+from src.core.station_binary import BinaryCatalog, compile_catalog  # noqa: E402
+
+
+def make_entries(count: int) -> list:
+    random.seed(0)
+    countries = ["Switzerland", "Germany", "France", "United Kingdom", "USA"]
+    return [
+        {
+            "name": f"Radio {''.join(random.choices(string.ascii_letters, k=10))}",
+            "url": f"https://stream.example.com/{i}/{''.join(random.choices(string.ascii_lowercase, k=12))}",
+            "country": random.choice(countries),
+            "location": random.choice([None, "Zurich", "Berlin", "Paris", "London"]),
+        }
+        for i in range(count)
+    ]
+
+
+def load_models(path: Path) -> dict:
+    with open(path) as f:
+        entries = json.load(f)
+    return {
+        index: RadioStation(**{"id": index, **entry})
+        for index, entry in enumerate(entries, start=1)
+    }
+
+
+def load_records(path: Path) -> dict:
+    with open(path) as f:
+        entries = json.load(f)
+    return {
+        index: StationRecord.from_entry(index, entry)
+        for index, entry in enumerate(entries, start=1)
+    }
+
+
+def measure(name: str, load, path: Path) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    catalog = load(path)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<28} {elapsed * 1000:9.1f} ms {current / 2**20:9.1f} MiB"
+        f" {peak / 2**20:9.1f} MiB  ({len(catalog)} stations)",
+    )
+    del catalog
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "stations.json"
+        source.write_text(json.dumps(make_entries(count)))
+        binary = source.with_suffix(".bin")
+        compile_catalog(source, binary)
+
+        print(f"{'approach':<28} {'load':>12} {'retained':>13} {'peak':>13}")
+        measure("RadioStation per entry", load_models, source)
+        measure("StationRecord per entry", load_records, source)
+        measure("mapped binary catalog", BinaryCatalog, binary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Compare nmcli scan parsing: ad hoc split(":") against the terse parser.
+
+Usage: python scripts/benchmark_nmcli_parser.py [network count]
+"""
+
+import gc
+import random
+import string
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.models import WiFiNetwork  # noqa: E402
+from src.utils.nmcli_parser import parse_wifi_list  # noqa: E402
+
+
+def make_output(count: int, colon_ratio: float = 0.05) -> str:
+    random.seed(0)
+    lines = []
+    for _ in range(count):
+        ssid = "".join(random.choices(string.ascii_letters + " ", k=12))
+        if random.random() < colon_ratio:
+            ssid = ssid[:6] + ":" + ssid[6:]
+        ssid = ssid.replace("\\", "\\\\").replace(":", "\\:")
+        lines.append(f"{ssid}:{random.randint(0, 100)}:WPA2:{random.choice('* ')}")
+    return "\n".join(lines) + "\n"
+
+
+def parse_split(output: str, saved: frozenset = frozenset()) -> list:
+    """The previous approach, which drops SSIDs containing colons"""
+    networks = []
+    for line in output.strip().split("\n"):
+        try:
+            ssid, signal, security, in_use = line.split(":")
+        except ValueError:
+            continue
+        if ssid:
+            networks.append(
+                WiFiNetwork(
+                    ssid=ssid,
+                    signal_strength=int(signal),
+                    security=security or None,
+                    in_use=in_use == "*",
+                    saved=ssid in saved,
+                ),
+            )
+    return networks
+
+
+def parse_terse(output: str) -> list:
+    return list(parse_wifi_list(output))
+
+
+def measure(name: str, parse, output: str) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    networks = parse(output)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<20} {elapsed * 1000:9.1f} ms {peak / 2**20:9.1f} MiB"
+        f"  ({len(networks)} networks)",
+    )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    output = make_output(count)
+    print(f"{'parser':<20} {'time':>12} {'peak':>13}")
+    measure("split(':')", parse_split, output)
+    measure("terse parser", parse_terse, output)
+
+
+if __name__ == "__main__":
+    main()
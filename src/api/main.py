@@ -14,17 +14,25 @@ from fastapi.staticfiles import StaticFiles
 from config.config import settings
 
 # Local imports
-from src.api.routes import ap, mode, monitor, stations, system, websocket, wifi
-from src.core.mode_manager import ModeManagerSingleton
+from src.api.routes import ap, metrics, mode, monitor, stations, system, websocket, wifi
+from src.core.assignment_store import AssignmentStore
+from src.core.connectivity_monitor import ConnectivityMonitor
+from src.core.metrics import WS_CONNECTIONS, WS_MESSAGES_RECEIVED
+from src.core.mode_manager import ModeManagerSingleton, NetworkMode
 from src.core.models import Station
+from src.core.network_events import NetworkEventMonitor
 from src.core.service_factory import ServiceFactory
 from src.core.singleton_manager import RadioManagerSingleton
+from src.core.station_search import StationSearch
+from src.core.stream_prober import StreamProber
+from src.core.system_sampler import SystemSampler
+from src.utils.logger import setup_logging
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
 # Set up logging first
-logging.basicConfig(level=logging.INFO)
+setup_logging(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -41,8 +49,41 @@ async def lifespan(app: FastAPI):
     app.state.gpio = gpio_service
     app.state.audio = audio_service
 
+    # Record system metrics history in the background
+    system_sampler = SystemSampler.get_instance()
+    system_sampler.start()
+
+    # Check catalog streams in the background, never while audio plays
+    stream_prober = StreamProber.get_instance()
+    stream_prober.is_playing = (
+        lambda: RadioManagerSingleton.get_instance().get_status().is_playing
+    )
+    if settings.STREAM_PROBE_ENABLED:
+        stream_prober.start()
+
+    # Build the station search index in the background
+    StationSearch.get_instance().refresh()
+
+    # Drop cached saved connections when NetworkManager reports changes
+    network_events = NetworkEventMonitor.get_instance()
+    network_events.start()
+
+    # Keep internet connectivity current for status reads and monitor clients
+    connectivity = ConnectivityMonitor.get_instance()
+    connectivity.start()
+
+    # Learn the mode once, network events keep it current from here on
+    await ModeManagerSingleton.get_instance().detect_current_mode()
+
     logger.info("Application startup complete")
     yield
+    await wifi.scan_cache.stop()
+    await connectivity.stop()
+    await network_events.stop()
+    await stream_prober.stop()
+    await system_sampler.stop()
+    # Write assignments still waiting for the write-behind delay
+    AssignmentStore.get_instance().flush()
     logger.info("Application shutdown")
 
 
@@ -87,6 +128,8 @@ app.include_router(websocket.router, prefix=settings.API_V1_STR)
 app.include_router(monitor.router, prefix=settings.API_V1_STR)
 app.include_router(mode.router, prefix=settings.API_V1_STR)
 app.include_router(ap.router, prefix="/api/v1")
+# Prometheus scrape endpoint, outside the API prefix by convention
+app.include_router(metrics.router)
 
 
 # API endpoints first (before static files and catch-all)
@@ -159,9 +202,18 @@ async def internal_error_handler(request, exc):
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
+    WS_CONNECTIONS.inc("main")
+
+    async def send_mode(mode: NetworkMode) -> None:
+        await websocket.send_json({"type": "mode_update", "data": {"mode": mode.value}})
+
+    # Tell the client about mode changes as they happen
+    mode_manager = ModeManagerSingleton.get_instance()
+    mode_manager.subscribe(send_mode)
     try:
         while True:
             data = await websocket.receive_json()
+            WS_MESSAGES_RECEIVED.inc("main")
             if data.get("type") == "status_request":
                 radio_manager = RadioManagerSingleton.get_instance()
                 status = radio_manager.get_status()
@@ -182,8 +234,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     {"type": "status_response", "data": status_dict},
                 )
             elif data.get("type") == "monitor_request":
-                mode_manager = ModeManagerSingleton.get_instance()
-                current_mode = mode_manager.detect_current_mode()
+                current_mode = await mode_manager.detect_current_mode()
                 logger.debug(f"Current mode detected as: {current_mode}")
 
                 await websocket.send_json(
@@ -199,6 +250,9 @@ async def websocket_endpoint(websocket: WebSocket):
 
     except WebSocketDisconnect:
         pass
+    finally:
+        mode_manager.unsubscribe(send_mode)
+        WS_CONNECTIONS.dec("main")
 
 
 if __name__ == "__main__":
@@ -12,19 +12,25 @@ logger = logging.getLogger(__name__)
 
 
 @router.get("/networks", response_model=WiFiStatus)
-async def get_saved_networks():
-    """Get the last saved WiFi networks from before AP mode was enabled"""
+async def get_saved_networks(scan: bool = False):
+    """Get the last saved WiFi networks from before AP mode was enabled.
+
+    With scan=true the networks come from a fresh scan, which keeps the
+    access point and its clients up.
+    """
     try:
         status = await ap_manager.get_saved_networks()
         if status is None:
             # Return empty status if no saved data
-            return WiFiStatus(
+            status = WiFiStatus(
                 ssid=None,
                 signal_strength=None,
                 is_connected=False,
                 has_internet=False,
                 available_networks=[],
             )
+        if scan:
+            status.available_networks = await ap_manager.scan_networks()
         return status
     except Exception as e:
         logger.error(f"Error getting saved networks: {e}")
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from src.core.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["Monitor"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Expose metrics in the Prometheus text format"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -1,9 +1,10 @@
 import logging
+from typing import Optional
 
 from fastapi import APIRouter, HTTPException
 
 from src.core.mode_manager import ModeManagerSingleton, NetworkMode
-from src.core.models import ModeResponse
+from src.core.models import ModeResponse, ModeTransition
 from src.core.wifi_manager import WiFiManager
 
 router = APIRouter(prefix="/mode", tags=["Mode"])
@@ -17,7 +18,7 @@ async def get_current_mode():
     """Get current network mode (AP/Client)"""
     try:
         mode_manager = ModeManagerSingleton.get_instance()
-        current_mode = mode_manager.detect_current_mode()
+        current_mode = await mode_manager.detect_current_mode()
         logger.info(f"API: Current mode detected as: {current_mode}")
         return ModeResponse(mode=current_mode.value)
     except Exception as e:
@@ -25,6 +26,12 @@ async def get_current_mode():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/transition", response_model=Optional[ModeTransition])
+async def get_last_transition():
+    """Timings of the last switch between AP and client mode, if any"""
+    return mode_manager.last_transition
+
+
 @router.post("/ap")
 async def enable_ap_mode():
     """Switch to Access Point mode"""
@@ -57,7 +64,7 @@ async def enable_client_mode():
 async def toggle_network_mode():
     """Toggle between AP and Client modes"""
     try:
-        current_mode = mode_manager.detect_current_mode()
+        current_mode = await mode_manager.detect_current_mode()
         new_mode = await mode_manager.toggle_mode()
 
         response = {
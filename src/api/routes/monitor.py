@@ -1,22 +1,30 @@
 import asyncio
+import json
 import logging
 import socket
-import subprocess
 from pathlib import Path
+from typing import Optional
 
-import psutil
-from fastapi import APIRouter, WebSocket
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
 
 from config.config import settings
-from src.core.mode_manager import ModeManagerSingleton
+from src.core.command_executor import run_command
+from src.core.connectivity_monitor import ConnectivityMonitor
+from src.core.metrics import WS_BYTES_SENT, WS_MESSAGES_RECEIVED, WS_MESSAGES_SENT
+from src.core.metrics_store import parse_range
+from src.core.mode_manager import ModeManagerSingleton, NetworkMode
+from src.core.monitor_broadcaster import MonitorBroadcaster
+from src.core.system_sampler import SystemSampler
+from src.utils.log_tail import LogFollower, tail_lines
+from src.utils.logger import ring_buffer
+from src.utils.nmcli_parser import parse_device_show
 
 from ..models.requests import SystemInfo
 
 router = APIRouter(prefix="/monitor", tags=["Monitor"])
 
-# Store active WebSocket connections
-active_connections: set[WebSocket] = set()
-broadcast_task = None
+LOG_FILE = Path("/home/radio/radio/logs/radio.log")
+RECENT_LOG_LINES = 10
 
 # Set logging level for monitor module
 logging.getLogger("monitor").setLevel(logging.DEBUG)
@@ -25,58 +33,39 @@ logging.getLogger("monitor").setLevel(logging.DEBUG)
 async def get_system_info() -> SystemInfo:
     hostname = socket.gethostname()
     ip = socket.gethostbyname(hostname)
-    cpu = psutil.cpu_percent()
-    disk = psutil.disk_usage("/")
+
+    # Use the background sampler's readings, sampling once if it isn't running
+    sampler = SystemSampler.get_instance()
+    readings = sampler.latest() or sampler.sample()
+    cpu = readings.get("cpu", 0.0)
+    temp = readings.get("temperature", 0)
 
     # Get mode information
     mode_manager = ModeManagerSingleton.get_instance()
-    current_mode = mode_manager.detect_current_mode()
+    current_mode = await mode_manager.detect_current_mode()
 
-    try:
-        with open("/sys/class/thermal/thermal_zone0/temp") as f:
-            temp = float(f.read()) / 1000.0
-    except Exception:
-        temp = 0
+    # Last result of the shared connectivity monitor, checked once if never run
+    internet_connected = (await ConnectivityMonitor.get_instance().ensure()).online
 
-    # Check internet connectivity
-    try:
-        result = subprocess.run(
-            ["nmcli", "networking", "connectivity", "check"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        internet_connected = "full" in result.stdout.lower()
-        logging.debug(f"[MONITOR] Internet connectivity check: {internet_connected}")
-    except Exception as e:
-        logging.exception(f"[MONITOR] Error checking internet connectivity: {e}")
-        internet_connected = False
-
-    # Get hotspot information
-    try:
-        result = subprocess.run(
-            ["nmcli", "device", "show", "wlan0"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-
-        hotspot_ssid = None
-        if "AP" in result.stdout or "Hotspot" in result.stdout:
-            for line in result.stdout.splitlines():
-                if "GENERAL.CONNECTION:" in line:
-                    hotspot_ssid = line.split(":")[1].strip()
-                    break
-        logging.debug(f"[MONITOR] Current hotspot SSID: {hotspot_ssid}")
-    except Exception as e:
-        logging.exception(f"[MONITOR] Error getting hotspot info: {e}")
-        hotspot_ssid = None
+    # Get hotspot information, there is only one in AP mode
+    hotspot_ssid = None
+    if current_mode == NetworkMode.AP:
+        try:
+            result = await run_command(
+                ["nmcli", "-t", "device", "show", "wlan0"],
+                dedupe=True,
+            )
+            if "AP" in result.stdout or "Hotspot" in result.stdout:
+                hotspot_ssid = parse_device_show(result.stdout).connection
+            logging.debug(f"[MONITOR] Current hotspot SSID: {hotspot_ssid}")
+        except Exception as e:
+            logging.exception(f"[MONITOR] Error getting hotspot info: {e}")
 
     system_info = SystemInfo(
         hostname=hostname,
         ip=ip,
         cpuUsage=f"{cpu}%",
-        diskSpace=f"Used: {disk.percent}%",
+        diskSpace=f"Used: {readings.get('disk', 0.0)}%",
         temperature=f"{temp:.1f}°C",
         mode=current_mode.value,
         hotspot_ssid=hotspot_ssid,
@@ -97,17 +86,16 @@ async def get_services_status():
         "pigpiod",  # GPIO daemon
         "dbus",  # System message bus
     ]
-    result = []
+    results = await asyncio.gather(
+        *(
+            run_command(["systemctl", "is-active", service], dedupe=True)
+            for service in services
+        ),
+    )
 
-    for service in services:
-        cmd = ["systemctl", "is-active", service]
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await proc.communicate()
-        status = stdout.decode().strip()
+    result = []
+    for service, completed in zip(services, results):
+        status = completed.stdout.strip()
         active = status == "active"
         result.append({"name": service, "active": active, "status": status})
 
@@ -116,63 +104,57 @@ async def get_services_status():
 
 async def check_web_access():
     async def check_url(url):
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                "curl",
-                "-s",
-                "--head",
-                "--max-time",
-                "2",
-                url,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
-            return b"200 OK" in stdout or b"304 Not Modified" in stdout
-        except Exception:
-            return False
+        result = await run_command(
+            ["curl", "-s", "--head", "--max-time", "2", url],
+            timeout=3,
+            dedupe=True,
+        )
+        return "200 OK" in result.stdout or "304 Not Modified" in result.stdout
+
+    api, ui = await asyncio.gather(
+        check_url(f"http://localhost:{settings.CONTAINER_PORT}/health"),
+        check_url(f"http://localhost:{settings.DEV_PORT}"),
+    )
+    return {"api": api, "ui": ui}
 
+
+async def collect_monitor_snapshot() -> dict:
+    """Sample the data pushed to monitor WebSocket clients"""
+    system_info = await get_system_info()
     return {
-        "api": await check_url(f"http://localhost:{settings.CONTAINER_PORT}/health"),
-        "ui": await check_url(f"http://localhost:{settings.DEV_PORT}"),
+        "systemInfo": system_info.dict(),
+        "services": await get_services_status(),
     }
 
 
-async def periodic_broadcast():
-    """Periodically broadcast system updates to all connected clients"""
-    logging.info("[MONITOR] Starting periodic broadcast task")
-    counter = 0
-    while True:
-        try:
-            if active_connections:
-                counter += 1
-                system_info = await get_system_info()
-                # Convert Pydantic model to dict before accessing
-                system_info_dict = system_info.dict()
-                logging.debug(
-                    f"[MONITOR] Broadcast #{counter}: CPU={system_info_dict['cpuUsage']}, Connections={len(active_connections)}",
-                )
-
-                status = {
-                    "type": "monitor_update",
-                    "data": {
-                        "systemInfo": system_info_dict,  # Convert to dict
-                        "services": await get_services_status(),
-                    },
-                }
-
-                for connection in active_connections:
-                    try:
-                        await connection.send_json(status)
-                    except Exception as e:
-                        logging.exception(
-                            f"[MONITOR] Error broadcasting to client: {e}",
-                        )
-                        active_connections.remove(connection)
-            await asyncio.sleep(2)
-        except Exception as e:
-            logging.exception(f"[MONITOR] Error in periodic broadcast: {e}")
-            await asyncio.sleep(2)
+broadcaster = MonitorBroadcaster(
+    sampler=collect_monitor_snapshot,
+    min_interval=settings.MONITOR_MIN_INTERVAL,
+    max_interval=settings.MONITOR_MAX_INTERVAL,
+    backoff_factor=settings.MONITOR_BACKOFF_FACTOR,
+)
+log_follower = LogFollower(LOG_FILE)
+
+
+def push_state_change(state) -> None:
+    """Send monitor clients a fresh snapshot as soon as connectivity or mode changes"""
+    broadcaster.refresh()
+
+
+ConnectivityMonitor.get_instance().subscribe(push_state_change)
+ModeManagerSingleton.get_instance().subscribe(push_state_change)
+
+
+def log_stream_sender(websocket: WebSocket):
+    """Callback streaming new log lines to one monitor client"""
+
+    async def send_lines(lines: list[str]) -> None:
+        message = json.dumps({"type": "log_lines", "data": lines})
+        await websocket.send_text(message)
+        WS_MESSAGES_SENT.inc("monitor")
+        WS_BYTES_SENT.inc("monitor", amount=len(message))
+
+    return send_lines
 
 
 @router.websocket("/ws")
@@ -180,38 +162,51 @@ async def websocket_endpoint(websocket: WebSocket):
     logging.info("[MONITOR] New WebSocket connection request")
     await websocket.accept()
 
-    # Ensure clean state
-    if websocket in active_connections:
-        active_connections.remove(websocket)
-    active_connections.add(websocket)
-
+    broadcaster.subscribe(websocket)
     logging.info(
-        f"[MONITOR] WebSocket connection accepted. Total connections: {len(active_connections)}",
+        f"[MONITOR] WebSocket connection accepted. Total connections: {broadcaster.connection_count}",
     )
 
-    # Always restart broadcast task for new connections
-    global broadcast_task
-    if broadcast_task:
-        broadcast_task.cancel()
-    broadcast_task = asyncio.create_task(periodic_broadcast())
+    # Set once the client asks for the live log stream
+    log_sender = None
 
     try:
         while True:
             msg = await websocket.receive_text()
+            WS_MESSAGES_RECEIVED.inc("monitor")
             logging.debug(f"Received WebSocket message: {msg}")
             if msg == "ping":
                 await websocket.send_json({"type": "pong"})
+                continue
+
+            try:
+                data = json.loads(msg)
+            except ValueError:
+                continue
+            if not isinstance(data, dict):
+                continue
+
+            if data.get("type") == "ack" and isinstance(data.get("seq"), int):
+                broadcaster.acknowledge(websocket, data["seq"])
+            elif data.get("type") == "logs_subscribe" and log_sender is None:
+                log_sender = log_stream_sender(websocket)
+                recent = await get_recent_logs()
+                await log_sender([line.rstrip("\n") for line in recent])
+                log_follower.subscribe(log_sender)
+            elif data.get("type") == "logs_unsubscribe" and log_sender is not None:
+                log_follower.unsubscribe(log_sender)
+                log_sender = None
+    except WebSocketDisconnect:
+        pass
     except Exception as e:
         logging.exception(f"WebSocket error: {e}")
     finally:
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+        broadcaster.unsubscribe(websocket)
+        if log_sender is not None:
+            log_follower.unsubscribe(log_sender)
         logging.info(
-            f"WebSocket disconnected. Remaining connections: {len(active_connections)}",
+            f"WebSocket disconnected. Remaining connections: {broadcaster.connection_count}",
         )
-        # Only cancel broadcast if truly no connections left
-        if len(active_connections) == 0 and broadcast_task:
-            broadcast_task.cancel()
 
 
 # REST endpoint for initial data and fallback
@@ -225,29 +220,60 @@ async def get_status():
     }
 
 
-async def get_recent_logs():
-    log_file = Path("/home/radio/radio/logs/radio.log")
-    if not log_file.exists():
-        return []
+@router.get("/history")
+async def get_metric_history(
+    metric: str,
+    range_: str = Query("10m", alias="range"),
+):
+    """Get the recorded series of a system metric (cpu, temperature, disk, memory)"""
+    try:
+        seconds = parse_range(range_)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        return SystemSampler.get_instance().store.history(metric, seconds)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown metric: {metric}")
+
+
+@router.get("/logs")
+async def get_logs(
+    level: str = "DEBUG",
+    logger_name: Optional[str] = Query(None, alias="logger"),
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    cursor: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Query recent log records held in memory, newest first.
+
+    Pass the returned next_cursor as cursor to fetch older records.
+    """
+    min_level = logging.getLevelName(level.upper())
+    if not isinstance(min_level, int):
+        raise HTTPException(status_code=400, detail=f"Unknown log level: {level}")
+
+    records, next_cursor = ring_buffer.query(
+        min_level=min_level,
+        logger_name=logger_name,
+        since=since,
+        until=until,
+        before=cursor,
+        limit=limit,
+    )
+    return {"records": records, "next_cursor": next_cursor}
 
-    with open(log_file) as f:
-        return f.readlines()[-10:]
+
+async def get_recent_logs():
+    lines = tail_lines(LOG_FILE, RECENT_LOG_LINES)
+    if not lines:
+        # No log file (e.g. development machine), use the in-memory buffer
+        lines = ring_buffer.recent_lines(RECENT_LOG_LINES)
+    return lines
 
 
 @router.get("/system-info", response_model=SystemInfo)
 async def get_system_info_endpoint() -> SystemInfo:
-    mode_manager = ModeManagerSingleton.get_instance()
-    mode = mode_manager.detect_current_mode()
-    hostname = socket.gethostname()
-    ip = socket.gethostbyname(hostname)
-
-    return SystemInfo(
-        mode=mode.value,
-        hostname=hostname,
-        ip=ip,
-        cpuUsage=f"{psutil.cpu_percent()}%",
-        diskSpace=f"Used: {psutil.disk_usage('/').percent}%",
-        temperature="N/A",  # Or implement actual temperature reading
-        internet_connected=True,  # Implement actual check if needed
-        hotspot_ssid=None,  # Implement if needed
-    )
+    # Same readings as the monitor snapshot, from the background sampler
+    return await get_system_info()
@@ -1,93 +1,59 @@
-import json
+import hashlib
 import logging
-from pathlib import Path as PathLib
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
 from src.api.routes.websocket import broadcast_status_update
+from src.core.assignment_store import AssignmentStore, assignment_entry
 from src.core.models import RadioStation
 from src.core.singleton_manager import RadioManagerSingleton
-from src.utils.station_loader import load_all_stations, load_default_stations
+from src.core.station_catalog import StationCatalog, encode_json
+from src.core.station_search import StationSearch
+from src.core.stream_prober import StreamProber
+from src.utils.station_loader import load_default_stations
 
 router = APIRouter()
 radio_manager = RadioManagerSingleton.get_instance(
     status_update_callback=broadcast_status_update,
 )
 logger = logging.getLogger(__name__)
-
-STATIONS_FILE = PathLib("data/assigned_stations.json")
-
-
-def ensure_stations_file():
-    """Ensure the stations file and directory exist"""
-    STATIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    if not STATIONS_FILE.exists():
-        with open(STATIONS_FILE, "w") as f:
-            json.dump({}, f)
-
-
-def save_stations_to_file(slot: int, station: RadioStation):
-    """Save station assignment to JSON file"""
-    ensure_stations_file()
-    try:
-        # Load existing assignments
-        with open(STATIONS_FILE) as f:
-            stations = json.load(f)
-
-        # Update or add new station
-        stations[str(slot)] = {
-            "name": station.name,
-            "url": station.url,
-            "slot": slot,
-            "country": station.country,
-            "location": station.location,
-        }
-
-        # Save back to file
-        with open(STATIONS_FILE, "w") as f:
-            json.dump(stations, f, indent=2)
-
-    except Exception as e:
-        logger.error(f"Error saving stations to file: {e}")
-        raise
-
-
-def load_stations_from_file():
-    """Load station assignments from JSON file"""
-    ensure_stations_file()
-    try:
-        with open(STATIONS_FILE) as f:
-            assigned_stations = json.load(f)
-
-        # Check if we have any non-null stations
-        has_valid_stations = any(
-            station is not None for station in assigned_stations.values()
-        )
-
-        if not has_valid_stations:
-            # If all stations are null, load defaults
-            logger.info("No valid stations in file, loading defaults")
-            default_stations = load_default_stations()
-
-            # Convert to the same format as assigned stations
-            return {
-                str(slot): {
-                    "name": station.name,
-                    "url": station.url,
-                    "slot": slot,
-                    "country": station.country,
-                    "location": station.location,
-                }
-                for slot, station in default_stations.items()
-            }
-
-        return assigned_stations
-
-    except Exception as e:
-        logger.error(f"Error loading stations from file: {e}")
-        return {}
+assignment_store = AssignmentStore.get_instance()
+station_catalog = StationCatalog.get_instance()
+station_search = StationSearch.get_instance()
+stream_prober = StreamProber.get_instance()
+
+# The catalog rarely changes, assignments must show up right away
+CATALOG_CACHE_CONTROL = "public, max-age=60"
+ASSIGNED_CACHE_CONTROL = "no-cache"
+
+# (assignments version, catalog version) -> encoded response and its ETag
+_assigned_cache: Optional[tuple[tuple, bytes, str]] = None
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match against an ETag (weak comparison, as per RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+
+def conditional_response(
+    request: Request,
+    content: bytes,
+    etag: str,
+    cache_control: str,
+) -> Response:
+    """JSON response that becomes an empty 304 when the client's copy is current"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
 class AssignStationRequest(BaseModel):
@@ -106,30 +72,72 @@ async def add_station(station: RadioStation):
 
 
 @router.get("/stations/assigned", tags=["Station-Management"])
-async def get_assigned_stations():
-    """Get all assigned stations from file, falling back to defaults if empty"""
+async def get_assigned_stations(request: Request):
+    """Get all assigned stations, with defaults for empty slots"""
+    global _assigned_cache
     try:
-        assigned_stations = load_stations_from_file()
-        if not assigned_stations:
-            logger.info("No assigned stations found, loading defaults")
-            default_stations = load_default_stations()
+        key = (assignment_store.version, station_catalog.version)
+        if _assigned_cache is None or _assigned_cache[0] != key:
+            stations = {**load_default_stations(), **assignment_store.all()}
             assigned_stations = {
-                str(slot): {
-                    "name": station.name,
-                    "url": station.url,
-                    "slot": slot,
-                    "country": station.country,
-                    "location": station.location,
-                }
-                for slot, station in default_stations.items()
+                str(slot): assignment_entry(slot, station)
+                for slot, station in sorted(stations.items())
             }
-        logger.debug(f"Returning stations: {assigned_stations}")
-        return assigned_stations
+            logger.debug(f"Returning stations: {assigned_stations}")
+            content = encode_json(assigned_stations)
+            etag = f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+            _assigned_cache = (key, content, etag)
+
+        _, content, etag = _assigned_cache
+        return conditional_response(request, content, etag, ASSIGNED_CACHE_CONTROL)
     except Exception as e:
         logger.error(f"Error getting assigned stations: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Must be declared before /stations/{slot}
+@router.get("/stations/search", tags=["Station-Management"])
+async def search_stations(
+    q: str = "",
+    country: Optional[str] = None,
+    location: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[int] = None,
+    reachable: Optional[bool] = None,
+):
+    """Search stations by name, country or location prefix, ordered by name.
+
+    Returns one page of results with the total match count, country and
+    location facet counts and the cursor for the next page. reachable
+    limits results to stations whose last stream probe succeeded (or
+    failed); each result carries that probe as "health", null if the
+    station wasn't probed yet.
+    """
+    health = stream_prober.health
+    restrict = None
+    if reachable is not None:
+        restrict = health.ids(reachable, station_catalog.all())
+    try:
+        result = await station_search.search(
+            q,
+            country=country,
+            location=location,
+            limit=limit,
+            cursor=cursor,
+            restrict=restrict,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    results = []
+    for station in result["results"]:
+        entry = station.as_dict()
+        probe = health.get(station.url)
+        entry["health"] = probe.model_dump() if probe else None
+        results.append(entry)
+    result["results"] = results
+    return result
+
+
 @router.get("/stations/{slot}", tags=["Station-Management"])
 async def get_station(slot: int):
     """Retrieve information about a radio station in a specific slot."""
@@ -164,10 +172,42 @@ async def toggle_station(slot: int):
 
 
 @router.get("/stations", tags=["Station-Management"])
-async def get_all_stations():
-    """Get a list of all available radio stations."""
-    stations_dict = load_all_stations()
-    return list(stations_dict.values())
+async def get_all_stations(
+    request: Request,
+    cursor: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    fields: Optional[str] = None,
+):
+    """Get a list of all available radio stations.
+
+    Without parameters the whole catalog is returned as a list. With cursor,
+    limit or fields (comma separated, e.g. "id,name") one page ordered by id
+    is returned as {"stations": [...], "next_cursor": ...}.
+    """
+    version = station_catalog.version
+    if cursor is None and limit is None and fields is None:
+        content = station_catalog.json_bytes()
+        etag = f'"{version}"'
+    else:
+        try:
+            content = station_catalog.page(
+                cursor=cursor,
+                limit=limit or 100,
+                fields=(
+                    [f.strip() for f in fields.split(",") if f.strip()]
+                    if fields
+                    else None
+                ),
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Same catalog and parameters always give the same page
+        params = hashlib.blake2b(
+            repr((cursor, limit, fields)).encode(),
+            digest_size=4,
+        ).hexdigest()
+        etag = f'"{version}-{params}"'
+    return conditional_response(request, content, etag, CATALOG_CACHE_CONTROL)
 
 
 @router.post("/stations/{slot}/assign", tags=["Station-Management"])
@@ -179,10 +219,7 @@ async def assign_station_to_slot(slot: int, request: AssignStationRequest):
         if slot not in [1, 2, 3]:
             raise HTTPException(status_code=400, detail="Invalid slot number")
 
-        stations = load_all_stations()
-        logger.debug(f"Available stations: {stations}")
-
-        station = stations.get(request.stationId)
+        station = station_catalog.get(request.stationId)
         if not station:
             logger.error(f"Station with ID {request.stationId} not found")
             raise HTTPException(
@@ -199,12 +236,10 @@ async def assign_station_to_slot(slot: int, request: AssignStationRequest):
             location=station.location,
         )
 
+        # Persisted through the radio manager's assignment store
         logger.info(f"Adding station to radio manager: {new_station}")
         radio_manager.add_station(new_station)
 
-        # Save to JSON file
-        save_stations_to_file(slot, new_station)
-
         return {
             "status": "success",
             "message": f"Station {station.name} assigned to slot {slot}",
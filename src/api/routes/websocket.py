@@ -1,7 +1,15 @@
+import json
 import logging
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from src.core.metrics import (
+    WS_BYTES_SENT,
+    WS_CONNECTIONS,
+    WS_DROPPED,
+    WS_MESSAGES_RECEIVED,
+    WS_MESSAGES_SENT,
+)
 from src.core.singleton_manager import RadioManagerSingleton
 
 from .monitor import (
@@ -10,6 +18,7 @@ from .monitor import (
     get_services_status,
     get_system_info,
 )
+from .wifi import scan_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,15 +29,22 @@ active_connections: set[WebSocket] = set()
 async def broadcast_status_update(status: dict):
     """Broadcast status to all connected clients"""
     logger.debug(f"Broadcasting status update to {len(active_connections)} clients")
+    # Encode once for all clients
+    message = json.dumps({"type": "status_update", "data": status})
     for connection in active_connections.copy():
         try:
-            await connection.send_json({"type": "status_update", "data": status})
+            await connection.send_text(message)
+            WS_MESSAGES_SENT.inc("status")
+            WS_BYTES_SENT.inc("status", amount=len(message))
         except WebSocketDisconnect:
             logger.debug("Client disconnected during broadcast")
-            active_connections.remove(connection)
+            active_connections.discard(connection)
+            WS_DROPPED.inc("status")
         except Exception as e:
             logger.error(f"Error broadcasting to client: {e!s}")
-            active_connections.remove(connection)
+            active_connections.discard(connection)
+            WS_DROPPED.inc("status")
+    WS_CONNECTIONS.set(len(active_connections), "status")
 
 
 radio_manager = RadioManagerSingleton.get_instance(
@@ -40,6 +56,7 @@ radio_manager = RadioManagerSingleton.get_instance(
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
     active_connections.add(websocket)
+    WS_CONNECTIONS.set(len(active_connections), "status")
     logger.info(
         f"New WebSocket connection. Total connections: {len(active_connections)}",
     )
@@ -53,6 +70,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
         while True:
             data = await websocket.receive_json()
+            WS_MESSAGES_RECEIVED.inc("status")
             logger.debug(f"Received WebSocket message: {data}")
 
             if data.get("type") == "status_request":
@@ -66,6 +84,11 @@ async def websocket_endpoint(websocket: WebSocket):
                 await websocket.send_json(
                     {"type": "wifi_scan_result", "data": networks},
                 )
+            elif data.get("type") == "wifi_subscribe":
+                # Background rescans run only while a WiFi page is open
+                scan_cache.subscribe(websocket)
+            elif data.get("type") == "wifi_unsubscribe":
+                scan_cache.unsubscribe(websocket)
             elif data.get("type") == "monitor_request":
                 logger.info("Received monitor request")
                 try:
@@ -87,7 +110,6 @@ async def websocket_endpoint(websocket: WebSocket):
                             "logs": logs,
                         },
                     }
-                    logger.info(f"Sending monitor data: {monitor_data}")
                     await websocket.send_json(monitor_data)
                 except Exception as e:
                     logger.error(
@@ -101,7 +123,10 @@ async def websocket_endpoint(websocket: WebSocket):
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
-        active_connections.remove(websocket)
+        active_connections.discard(websocket)
     except Exception as e:
         logger.error(f"WebSocket error: {e!s}")
-        active_connections.remove(websocket)
+        active_connections.discard(websocket)
+    finally:
+        scan_cache.unsubscribe(websocket)
+        WS_CONNECTIONS.set(len(active_connections), "status")
@@ -2,22 +2,38 @@ import logging
 
 from fastapi import APIRouter, HTTPException
 
+from config.config import settings
 from src.api.models.requests import WiFiConnectionRequest
 from src.core.models import WiFiStatus
 from src.core.wifi_manager import WiFiManager
+from src.core.wifi_scan_cache import WiFiScanCache
+from src.core.wifi_status_store import WiFiStatusStore
 
 router = APIRouter(prefix="/wifi")
 wifi_manager = WiFiManager()
 logger = logging.getLogger(__name__)
 
 
+scan_cache = WiFiScanCache(
+    scanner=lambda: wifi_manager.get_current_status(),
+    ttl=settings.WIFI_SCAN_TTL,
+    max_stale=settings.WIFI_SCAN_MAX_STALE,
+    refresh_interval=settings.WIFI_SCAN_REFRESH_INTERVAL,
+)
+# Serve the last snapshot at boot while the first scan runs
+scan_cache.seed(WiFiStatusStore.get_instance().status)
+
+
 @router.get("/status", response_model=WiFiStatus, tags=["WiFi"])
-async def get_wifi_status():
-    """Get current WiFi status including connection state and available networks"""
+async def get_wifi_status(refresh: bool = False):
+    """Get current WiFi status including connection state and available networks
+
+    Served from the scan cache; ``refresh=true`` waits for a new scan.
+    """
     try:
-        status = wifi_manager.get_current_status()
-        status.preconfigured_ssid = wifi_manager.get_preconfigured_ssid()
-        return status
+        if refresh:
+            return await scan_cache.refresh()
+        return await scan_cache.get()
     except Exception as e:
         logger.error(f"Error in get_wifi_status: {e}")
         return WiFiStatus(
@@ -36,7 +52,17 @@ async def connect_to_network(request: WiFiConnectionRequest):
     try:
         logger.debug(f"Attempting to connect to SSID: {request.ssid}")
 
-        result = await wifi_manager.connect_to_network(request.ssid, request.password)
+        # A network seen in a recent scan doesn't need another one
+        await scan_cache.get()
+        known = scan_cache.seen(request.ssid)
+        try:
+            result = await wifi_manager.connect_to_network(
+                request.ssid,
+                request.password,
+                rescan=not known,
+            )
+        finally:
+            scan_cache.invalidate()
 
         if result:
             return {"status": "success"}
@@ -51,7 +77,7 @@ async def connect_to_network(request: WiFiConnectionRequest):
 async def get_current_connection():
     """Get details about the current WiFi connection"""
     try:
-        status = wifi_manager.get_current_status()
+        status = await scan_cache.get()
         if status.is_connected:
             return {
                 "ssid": status.ssid,
@@ -75,7 +101,7 @@ async def debug_wifi():
         handler.setFormatter(logging.Formatter("DEBUG: %(message)s"))
         wifi.logger.addHandler(handler)
 
-    status = wifi.get_current_status()
+    status = await wifi.get_current_status()
     return status
 
 
@@ -84,7 +110,7 @@ async def debug_nmcli():
     """Debug endpoint to execute nmcli commands and return raw output"""
     try:
         # Execute the nmcli command to list available networks
-        list_result = wifi_manager._run_command(
+        list_result = await wifi_manager._run_command(
             [
                 "sudo",
                 "nmcli",
@@ -101,7 +127,7 @@ async def debug_nmcli():
         )
 
         # Execute the nmcli command to show saved connections
-        saved_result = wifi_manager._run_command(
+        saved_result = await wifi_manager._run_command(
             ["sudo", "nmcli", "-t", "-f", "NAME,TYPE,FILENAME", "connection", "show"],
             capture_output=True,
             text=True,
@@ -123,31 +149,18 @@ async def connect_to_preconfigured():
     """Connect to the preconfigured network directly"""
     try:
         logger.debug("Attempting to connect to preconfigured network")
-        result = wifi_manager._run_command(
-            ["sudo", "nmcli", "connection", "up", "preconfigured"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        try:
+            connected = await wifi_manager.activate_connection("preconfigured")
+        finally:
+            scan_cache.invalidate()
 
-        if result.returncode != 0:
-            logger.error(f"Failed to connect to preconfigured network: {result.stderr}")
-            raise HTTPException(
-                status_code=400,
-                detail="Failed to connect to preconfigured network",
-            )
-
-        # Verify connection was successful
-        verify_result = wifi_manager._run_command(
-            ["sudo", "nmcli", "-t", "-f", "GENERAL.STATE", "device", "show", "wlan0"],
-            capture_output=True,
-            text=True,
-        )
-
-        if verify_result.returncode == 0 and "100 (connected)" in verify_result.stdout:
+        if connected:
             return {"message": "Successfully connected to preconfigured network"}
 
-        raise HTTPException(status_code=400, detail="Failed to verify connection")
+        raise HTTPException(
+            status_code=400,
+            detail="Failed to connect to preconfigured network",
+        )
 
     except Exception as e:
         logger.error(f"Error connecting to preconfigured network: {e!s}")
@@ -159,7 +172,8 @@ async def forget_network(ssid: str):
     """Remove a saved network"""
     try:
         logger.debug(f"Attempting to forget network: {ssid}")
-        result = wifi_manager._remove_connection(ssid)
+        result = await wifi_manager._remove_connection(ssid)
+        scan_cache.invalidate()
         if result:
             return {"status": "success"}
         raise HTTPException(status_code=400, detail="Failed to remove network")
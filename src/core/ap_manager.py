@@ -1,13 +1,12 @@
 import asyncio
-import json
 import logging
-from pathlib import Path
 from typing import Optional
 
 from .mode_manager import ModeManagerSingleton, NetworkMode
 from .models import WiFiNetwork, WiFiStatus
-from .services.network_service import get_network_service
+from .services.network_service import get_network_service, get_networkmanager
 from .wifi_manager import WiFiManager
+from .wifi_status_store import WiFiStatusStore
 
 
 class ConnectionError(Exception):
@@ -24,14 +23,13 @@ class APManager:
         self.logger = logging.getLogger(__name__)
         self.wifi_manager = WiFiManager()
         self.mode_manager = ModeManagerSingleton.get_instance()
-        self.interface_stabilize_delay = 2  # seconds
         self.required_services = ["dnsmasq", "avahi-daemon"]
         self.network_service = get_network_service()
 
     async def verify_ap_mode(self) -> bool:
         """Verify that we're in AP mode"""
         try:
-            current_mode = self.mode_manager.detect_current_mode()
+            current_mode = await self.mode_manager.detect_current_mode()
             return current_mode == NetworkMode.AP
         except Exception as e:
             self.logger.error(f"Error verifying AP mode: {e}")
@@ -41,7 +39,7 @@ class APManager:
         """Ensure mDNS service is running after mode switch"""
         try:
             # Restart avahi-daemon to ensure mDNS works in new mode
-            result = self.wifi_manager._run_command(
+            result = await self.wifi_manager._run_command(
                 ["sudo", "systemctl", "restart", "avahi-daemon"],
                 capture_output=True,
                 text=True,
@@ -56,7 +54,7 @@ class APManager:
         try:
             action = "start" if enable else "stop"
             for service in self.required_services:
-                result = self.wifi_manager._run_command(
+                result = await self.wifi_manager._run_command(
                     ["sudo", "systemctl", action, service],
                     capture_output=True,
                     text=True,
@@ -67,68 +65,17 @@ class APManager:
         except Exception as e:
             self.logger.error(f"Error managing AP services: {e}")
 
-    async def _handle_mode_switch(self, to_client_mode: bool = True) -> bool:
-        """Handle temporary mode switching for scanning"""
-        try:
-            # Stop AP services if switching to client mode
-            if to_client_mode:
-                await self._manage_ap_services(enable=False)
-                success = await self.mode_manager.enable_client_mode()
-            else:
-                success = await self.mode_manager.enable_ap_mode()
-                if success:
-                    await self._manage_ap_services(enable=True)
-
-            if success:
-                await asyncio.sleep(self.interface_stabilize_delay)
-                await self._ensure_mdns_service()
-                # Verify network interface is up
-                result = self.wifi_manager._run_command(
-                    ["sudo", "ip", "link", "set", "wlan0", "up"],
-                    capture_output=True,
-                    text=True,
-                )
-                if result.returncode != 0:
-                    self.logger.error(f"Failed to bring up wlan0: {result.stderr}")
-
-            return success
-
-        except Exception as e:
-            self.logger.error(f"Error during mode switch: {e}")
-            return False
+    async def scan_networks(self) -> list[WiFiNetwork]:
+        """Networks in range, scanned without leaving AP mode"""
+        networks = await self.mode_manager.scan_wifi_networks()
+        return [WiFiNetwork(**network) for network in networks]
 
     async def get_saved_networks(self) -> Optional[WiFiStatus]:
-        """Get the last saved WiFi status before switching to AP mode"""
-        try:
-            status_file = Path("data/last_wifi_status.json")
-            if not status_file.exists():
-                self.logger.warning("No saved WiFi status file found")
-                return None
-
-            with open(status_file) as f:
-                data = json.load(f)
-
-            # Convert the saved JSON data back to WiFiStatus model
-            return WiFiStatus(
-                ssid=data.get("ssid"),
-                signal_strength=data.get("signal_strength"),
-                is_connected=data.get("is_connected", False),
-                has_internet=data.get("has_internet", False),
-                available_networks=[
-                    WiFiNetwork(
-                        ssid=net["ssid"],
-                        signal_strength=net["signal_strength"],
-                        security=net.get("security"),
-                        in_use=net.get("in_use", False),
-                        saved=net.get("saved", False),
-                    )
-                    for net in data.get("available_networks", [])
-                ],
-            )
-
-        except Exception as e:
-            self.logger.error(f"Error reading saved WiFi status: {e}")
-            return None
+        """Get the last WiFi status seen before switching to AP mode"""
+        status = WiFiStatusStore.get_instance().status
+        if status is None:
+            self.logger.warning("No saved WiFi status found")
+        return status
 
     async def add_network_connection(
         self,
@@ -144,8 +91,18 @@ class APManager:
                     "mode_error",
                 )
 
+            service = get_networkmanager()
+            if service is not None:
+                # Replaces an existing profile of the network
+                if not await service.add_connection(ssid, password, priority):
+                    raise ConnectionError(
+                        f"Failed to add connection for {ssid}",
+                        "connection_error",
+                    )
+                return self._added(ssid, priority)
+
             # Check if connection already exists and remove it
-            result = self.wifi_manager._run_command(
+            result = await self.wifi_manager._run_command(
                 ["sudo", "nmcli", "connection", "show"],
                 capture_output=True,
                 text=True,
@@ -153,14 +110,14 @@ class APManager:
 
             if result.returncode == 0 and ssid in result.stdout:
                 self.logger.info(f"Removing existing connection for {ssid}")
-                self.wifi_manager._run_command(
+                await self.wifi_manager._run_command(
                     ["sudo", "nmcli", "connection", "delete", ssid],
                     capture_output=True,
                     text=True,
                 )
 
             # Add the new connection
-            result = self.wifi_manager._run_command(
+            result = await self.wifi_manager._run_command(
                 [
                     "sudo",
                     "nmcli",
@@ -193,7 +150,7 @@ class APManager:
                 )
 
             # Set the connection priority
-            priority_result = self.wifi_manager._run_command(
+            priority_result = await self.wifi_manager._run_command(
                 [
                     "sudo",
                     "nmcli",
@@ -210,12 +167,7 @@ class APManager:
             if priority_result.returncode != 0:
                 self.logger.warning(f"Failed to set priority: {priority_result.stderr}")
 
-            return {
-                "status": "success",
-                "message": f"Successfully added connection for {ssid} with priority {priority}",
-                "ssid": ssid,
-                "priority": priority,
-            }
+            return self._added(ssid, priority)
 
         except ConnectionError:
             raise
@@ -223,6 +175,24 @@ class APManager:
             self.logger.error(f"Error adding network connection: {e}")
             raise ConnectionError(str(e), "unknown_error")
 
+    @staticmethod
+    def _added(ssid: str, priority: int) -> dict:
+        return {
+            "status": "success",
+            "message": f"Successfully added connection for {ssid} with priority {priority}",
+            "ssid": ssid,
+            "priority": priority,
+        }
+
+    @staticmethod
+    def _modified(ssid: str, priority: int) -> dict:
+        return {
+            "status": "success",
+            "message": f"Successfully modified connection for {ssid} with priority {priority}",
+            "ssid": ssid,
+            "priority": priority,
+        }
+
     async def modify_network_connection(
         self,
         ssid: str,
@@ -237,8 +207,24 @@ class APManager:
                     "mode_error",
                 )
 
+            service = get_networkmanager()
+            if service is not None:
+                updated = await service.update_connection(ssid, password, priority)
+                if updated is None:
+                    self.logger.error(f"Connection {ssid} does not exist")
+                    raise ConnectionError(
+                        f"Connection {ssid} does not exist",
+                        "not_found_error",
+                    )
+                if not updated:
+                    raise ConnectionError(
+                        f"Failed to modify connection for {ssid}",
+                        "connection_error",
+                    )
+                return self._modified(ssid, priority)
+
             # Check if connection exists
-            result = self.wifi_manager._run_command(
+            result = await self.wifi_manager._run_command(
                 ["sudo", "nmcli", "connection", "show"],
                 capture_output=True,
                 text=True,
@@ -252,7 +238,7 @@ class APManager:
                 )
 
             # Modify the existing connection
-            modify_result = self.wifi_manager._run_command(
+            modify_result = await self.wifi_manager._run_command(
                 [
                     "sudo",
                     "nmcli",
@@ -279,12 +265,7 @@ class APManager:
                     "connection_error",
                 )
 
-            return {
-                "status": "success",
-                "message": f"Successfully modified connection for {ssid} with priority {priority}",
-                "ssid": ssid,
-                "priority": priority,
-            }
+            return self._modified(ssid, priority)
 
         except ConnectionError:
             raise
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import re
+from subprocess import CompletedProcess
+from typing import Any, Awaitable, Callable, Container, Dict, List, Optional
+
+from config.config import settings
+
+from .command_executor import run_command
+from .models import WiFiNetwork
+
+logger = logging.getLogger(__name__)
+
+# "#{ managed } <= 1" and "total <= 3" in iw list's interface combinations
+_GROUP_RE = re.compile(r"#\{\s*([^}]*)\}\s*<=\s*(\d+)")
+_TOTAL_RE = re.compile(r"total\s*<=\s*(\d+)")
+# iw escapes spaces at the edges and unprintable bytes of SSIDs as \xNN
+_ESCAPE_RE = re.compile(rb"\\x([0-9a-fA-F]{2})")
+
+Runner = Callable[..., Awaitable[CompletedProcess]]
+
+
+def supports_managed_with_ap(iw_list: str) -> bool:
+    """Whether iw list allows a managed interface next to an AP"""
+    combinations: List[str] = []
+    in_section = False
+    for line in iw_list.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("valid interface combinations"):
+            in_section = True
+        elif in_section and stripped.startswith("*"):
+            combinations.append(stripped)
+        elif in_section and stripped.startswith(("#", "total")) and combinations:
+            combinations[-1] += " " + stripped
+        else:
+            in_section = False
+
+    for combination in combinations:
+        total = _TOTAL_RE.search(combination)
+        if total is None or int(total.group(1)) < 2:
+            continue
+        groups = [
+            ({kind.strip() for kind in kinds.split(",")}, int(limit))
+            for kinds, limit in _GROUP_RE.findall(combination)
+        ]
+        managed = [i for i, (kinds, _) in enumerate(groups) if "managed" in kinds]
+        access_point = [i for i, (kinds, _) in enumerate(groups) if "AP" in kinds]
+        for m in managed:
+            for a in access_point:
+                if m != a or groups[m][1] >= 2:
+                    return True
+    return False
+
+
+def decode_iw_ssid(raw: str) -> str:
+    data = _ESCAPE_RE.sub(lambda m: bytes([int(m.group(1), 16)]), raw.encode())
+    return data.decode("utf-8", errors="replace")
+
+
+def _security(privacy: bool, wpa: bool, rsn_suites: str) -> Optional[str]:
+    parts = []
+    if privacy and not wpa and not rsn_suites:
+        parts.append("WEP")
+    if wpa:
+        parts.append("WPA1")
+    if "PSK" in rsn_suites or "802.1X" in rsn_suites:
+        parts.append("WPA2")
+    if "SAE" in rsn_suites:
+        parts.append("WPA3")
+    return " ".join(parts) or None
+
+
+def parse_iw_scan(
+    output: str,
+    saved: Container[str] = frozenset(),
+) -> List[WiFiNetwork]:
+    """Networks from iw dev <iface> scan, strongest per SSID, hidden ones left out"""
+    networks: Dict[str, WiFiNetwork] = {}
+
+    def add(bss: Dict[str, Any]) -> None:
+        ssid = bss.get("ssid")
+        if not ssid:
+            return
+        network = WiFiNetwork(
+            ssid=ssid,
+            # The dBm to percent mapping NetworkManager uses
+            signal_strength=max(0, min(100, 2 * (int(bss.get("dbm", -100)) + 100))),
+            security=_security(
+                bool(bss.get("privacy")),
+                bool(bss.get("wpa")),
+                str(bss.get("rsn", "")),
+            ),
+            saved=ssid in saved,
+        )
+        known = networks.get(ssid)
+        if known is None or known.signal_strength < network.signal_strength:
+            networks[ssid] = network
+
+    bss: Optional[Dict[str, Any]] = None
+    section = None
+    for line in output.splitlines():
+        if line.startswith("BSS "):
+            if bss is not None:
+                add(bss)
+            bss, section = {}, None
+            continue
+        if bss is None:
+            continue
+        stripped = line.strip()
+        if line.startswith("\t") and not line.startswith("\t\t"):
+            section = None
+        if stripped.startswith("signal:"):
+            try:
+                bss["dbm"] = float(stripped.split()[1])
+            except (IndexError, ValueError):
+                pass
+        elif stripped.startswith("SSID:"):
+            bss["ssid"] = decode_iw_ssid(line.split("SSID:", 1)[1].strip(" "))
+        elif stripped.startswith("capability:"):
+            bss["privacy"] = "Privacy" in stripped
+        elif stripped.startswith("RSN:"):
+            section = "rsn"
+            bss["rsn"] = stripped
+        elif stripped.startswith("WPA:"):
+            section = "wpa"
+            bss["wpa"] = True
+        elif section == "rsn" and "Authentication suites" in stripped:
+            bss["rsn"] = f"{bss['rsn']} {stripped}"
+    if bss is not None:
+        add(bss)
+    return list(networks.values())
+
+
+class APScanner:
+    """Scans for networks while wlan0 serves the access point.
+
+    Where the driver allows a managed interface next to an AP, a temporary
+    virtual interface scans while the hotspot and its clients stay up.
+    Otherwise ``scan`` returns None and callers fall back to a snapshot.
+    """
+
+    def __init__(
+        self,
+        run: Optional[Runner] = None,
+        interface: str = "wlan0",
+        scan_interface: str = settings.AP_SCAN_INTERFACE,
+    ):
+        self._run = run or run_command
+        self._interface = interface
+        self._scan_interface = scan_interface
+        self._supported: Optional[bool] = None
+        self._lock = asyncio.Lock()
+
+    async def supported(self) -> bool:
+        """Whether the radio can scan next to the AP, asked once"""
+        if self._supported is None:
+            result = await self._run(["iw", "list"], dedupe=True)
+            self._supported = result.returncode == 0 and supports_managed_with_ap(
+                result.stdout,
+            )
+            logger.info(
+                f"Scanning next to the access point "
+                f"{'is' if self._supported else 'is not'} supported",
+            )
+        return self._supported
+
+    async def scan(
+        self,
+        saved: Container[str] = frozenset(),
+    ) -> Optional[List[WiFiNetwork]]:
+        """Scan through the virtual interface, None when that is not possible"""
+        if not await self.supported():
+            return None
+
+        iface = self._scan_interface
+        async with self._lock:
+            try:
+                result = await self._run(
+                    [
+                        "sudo",
+                        "iw",
+                        "dev",
+                        self._interface,
+                        "interface",
+                        "add",
+                        iface,
+                        "type",
+                        "managed",
+                    ],
+                )
+                if result.returncode != 0 and "exists" not in result.stderr:
+                    logger.warning(f"Could not add {iface}: {result.stderr.strip()}")
+                    return None
+                # Keep NetworkManager from connecting it, which would move the AP
+                await self._run(
+                    ["sudo", "nmcli", "device", "set", iface, "managed", "no"],
+                )
+                await self._run(["sudo", "ip", "link", "set", iface, "up"])
+
+                result = await self._run(
+                    ["sudo", "iw", "dev", iface, "scan"],
+                    timeout=settings.AP_SCAN_TIMEOUT,
+                )
+                if result.returncode != 0:
+                    logger.warning(f"Scan on {iface} failed: {result.stderr.strip()}")
+                    return None
+                return parse_iw_scan(result.stdout, saved)
+            finally:
+                await self._run(["sudo", "iw", "dev", iface, "del"])
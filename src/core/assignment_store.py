@@ -0,0 +1,121 @@
+import atexit
+import itertools
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from src.core.models import RadioStation
+from src.utils.atomic_write import WriteBehind, write_json
+
+logger = logging.getLogger(__name__)
+
+ASSIGNMENTS_FILE = Path("data/assigned_stations.json")
+
+# Assignments made within this many seconds are written together
+WRITE_DELAY = 0.5
+
+# Versions are unique across stores, so they can key caches
+_versions = itertools.count(1)
+
+
+def assignment_entry(slot: int, station: RadioStation) -> dict:
+    """A slot's entry as stored in the assignments file"""
+    return {
+        "name": station.name,
+        "url": station.url,
+        "slot": slot,
+        "country": station.country,
+        "location": station.location,
+    }
+
+
+class AssignmentStore:
+    """Slot assignments, kept in memory and written behind to one file.
+
+    The in-memory copy is authoritative: reads never touch the disk. Changes
+    made from the event loop are coalesced into one write WRITE_DELAY
+    seconds after the first change; changes made outside a running loop are
+    written right away. Writes replace the file atomically, so a crash or
+    power loss leaves either the old or the new assignments.
+    """
+
+    _instance: Optional["AssignmentStore"] = None
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ASSIGNMENTS_FILE,
+        write_delay: float = WRITE_DELAY,
+    ):
+        self.path = Path(path)
+        self.version = next(_versions)
+        self._stations: Dict[int, RadioStation] = self._load()
+        self._dirty = False
+        self._writer = WriteBehind(self.flush, write_delay)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "AssignmentStore":
+        if cls._instance is None:
+            cls._instance = cls()
+            atexit.register(cls._instance.flush)
+        return cls._instance
+
+    def _load(self) -> Dict[int, RadioStation]:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            stations = {
+                int(slot): RadioStation(**station_data)
+                for slot, station_data in data.items()
+                if station_data is not None
+            }
+            logger.info(f"Loaded {len(stations)} assigned stations from {self.path}")
+            return stations
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(f"Error loading assigned stations from {self.path}: {e}")
+            return {}
+
+    def get(self, slot: int) -> Optional[RadioStation]:
+        return self._stations.get(slot)
+
+    def all(self) -> Dict[int, RadioStation]:
+        return self._stations.copy()
+
+    def set(self, slot: int, station: RadioStation) -> None:
+        """Assign a station to a slot"""
+        self._stations[slot] = station.model_copy(update={"slot": slot})
+        self._changed()
+
+    def remove(self, slot: int) -> None:
+        if self._stations.pop(slot, None) is not None:
+            self._changed()
+
+    def _changed(self) -> None:
+        self.version = next(_versions)
+        self._dirty = True
+        self._writer.schedule()
+
+    def flush(self) -> None:
+        """Write pending changes now"""
+        self._writer.cancel()
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            data = {
+                str(slot): assignment_entry(slot, station)
+                for slot, station in sorted(self._stations.items())
+            }
+            try:
+                self._write(data)
+            except OSError as e:
+                # Try again with the next change or flush
+                self._dirty = True
+                logger.error(f"Error saving assigned stations to {self.path}: {e}")
+
+    def _write(self, data: dict) -> None:
+        write_json(self.path, data, indent=2)
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import os
+import subprocess
+import time
+import weakref
+from typing import Dict, Optional, Sequence, Tuple
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+COMMAND_RUNS = REGISTRY.counter(
+    "radio_command_runs_total",
+    "External commands run, by program",
+    ("program",),
+)
+COMMAND_SECONDS = REGISTRY.histogram(
+    "radio_command_duration_seconds",
+    "External command run time, by program",
+    ("program",),
+)
+COMMAND_TIMEOUTS = REGISTRY.counter(
+    "radio_command_timeouts_total",
+    "External commands that hit their timeout, by program",
+    ("program",),
+)
+COMMAND_FAILURES = REGISTRY.counter(
+    "radio_command_failures_total",
+    "External commands that exited non-zero or failed to start, by program",
+    ("program",),
+)
+COMMAND_SHARED = REGISTRY.counter(
+    "radio_command_shared_total",
+    "Command runs answered by an identical command already in flight, by program",
+    ("program",),
+)
+
+# nmcli serializes on NetworkManager anyway, more parallel runs only queue there
+MAX_CONCURRENT_COMMANDS = 4
+DEFAULT_TIMEOUT = 5.0
+
+
+def command_program(command: Sequence[str]) -> str:
+    """Metric label for a command: the program name, ignoring sudo"""
+    args = command[1:] if command and command[0] == "sudo" else command
+    return os.path.basename(args[0]) if args else "unknown"
+
+
+class CommandExecutor:
+    """Runs external commands as asyncio subprocesses.
+
+    At most max_concurrent commands run at once, later ones wait for a free
+    slot. Failures never raise: a command that can't start, exits non-zero
+    or times out comes back as a CompletedProcess with its return code and
+    stderr, like subprocess.run(capture_output=True, text=True). Cancelling
+    the caller kills the process.
+
+    Read-only commands can be run with dedupe=True: callers asking for a
+    command that is already running wait for that run instead of starting
+    another one.
+    """
+
+    _instance: Optional["CommandExecutor"] = None
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT_COMMANDS,
+        default_timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.max_concurrent = max_concurrent
+        self.default_timeout = default_timeout
+        # Semaphores and tasks belong to one event loop
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._in_flight: Dict[Tuple[int, Tuple[str, ...]], asyncio.Task] = {}
+        self._waiters: Dict[Tuple[int, Tuple[str, ...]], int] = {}
+
+    @classmethod
+    def get_instance(cls) -> "CommandExecutor":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(
+                self.max_concurrent,
+            )
+        return semaphore
+
+    async def run(
+        self,
+        command: Sequence[str],
+        timeout: Optional[float] = None,
+        dedupe: bool = False,
+    ) -> subprocess.CompletedProcess:
+        """Run a command and return its result.
+
+        Args:
+            command: Program and arguments, run without a shell
+            timeout: Seconds the command may run, default_timeout if None
+            dedupe: Share the result of an identical command in flight,
+                only for commands without side effects
+
+        """
+        command = list(command)
+        if not dedupe:
+            return await self._execute(command, timeout)
+
+        key = (id(asyncio.get_running_loop()), tuple(command))
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._execute(command, timeout))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            COMMAND_SHARED.inc(command_program(command))
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Kill the shared run once nobody waits for it any more
+            if self._waiters[key] == 1:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    async def _execute(
+        self,
+        command: list[str],
+        timeout: Optional[float],
+    ) -> subprocess.CompletedProcess:
+        program = command_program(command)
+        timeout = self.default_timeout if timeout is None else timeout
+        async with self._semaphore():
+            COMMAND_RUNS.inc(program)
+            start = time.perf_counter()
+            process = None
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                COMMAND_TIMEOUTS.inc(program)
+                logger.error(f"Command timed out: {' '.join(command)}")
+                return subprocess.CompletedProcess(
+                    args=command,
+                    returncode=1,
+                    stdout="",
+                    stderr="Command timed out",
+                )
+            except OSError as e:
+                COMMAND_FAILURES.inc(program)
+                logger.error(f"Command failed: {' '.join(command)} - {e}")
+                return subprocess.CompletedProcess(
+                    args=command,
+                    returncode=1,
+                    stdout="",
+                    stderr=str(e),
+                )
+            finally:
+                # Timed out or cancelled
+                if process is not None and process.returncode is None:
+                    try:
+                        process.kill()
+                    except ProcessLookupError:
+                        pass
+                COMMAND_SECONDS.observe(time.perf_counter() - start, program)
+
+        if process.returncode != 0:
+            COMMAND_FAILURES.inc(program)
+        return subprocess.CompletedProcess(
+            args=command,
+            returncode=process.returncode,
+            stdout=stdout.decode(errors="replace"),
+            stderr=stderr.decode(errors="replace"),
+        )
+
+
+async def run_command(
+    command: Sequence[str],
+    timeout: Optional[float] = None,
+    dedupe: bool = False,
+) -> subprocess.CompletedProcess:
+    """Run a command with the shared executor"""
+    return await CommandExecutor.get_instance().run(command, timeout, dedupe)
@@ -0,0 +1,168 @@
+import logging
+import time
+from subprocess import CompletedProcess
+from typing import Awaitable, Callable, ClassVar, Dict, List, Optional, Set
+
+from pydantic import BaseModel
+
+from src.utils.nmcli_parser import iter_rows, iter_sections
+
+from .command_executor import run_command
+from .network_events import NetworkEvent, NetworkEventMonitor
+from .services.network_service import get_networkmanager
+
+logger = logging.getLogger(__name__)
+
+INVENTORY_TTL = 300.0  # seconds, fallback when no events arrive
+WIRELESS_TYPES = {"802-11-wireless", "wifi"}
+CONNECTION_FIELDS = ("NAME", "UUID", "TYPE")
+
+Runner = Callable[..., Awaitable[CompletedProcess]]
+
+
+class SavedConnection(BaseModel):
+    name: str
+    uuid: str
+    type: str
+    ssid: Optional[str] = None
+
+    @property
+    def wireless(self) -> bool:
+        return self.type.lower() in WIRELESS_TYPES
+
+
+def parse_connection_list(output: str) -> List[SavedConnection]:
+    """Parse nmcli -t -f NAME,UUID,TYPE connection show"""
+    return [
+        SavedConnection(name=row["NAME"], uuid=row["UUID"], type=row["TYPE"])
+        for row in iter_rows(output, CONNECTION_FIELDS)
+        if row["NAME"]
+    ]
+
+
+def parse_ssids(output: str) -> Dict[str, str]:
+    """Map UUIDs to SSIDs from one batched nmcli connection show"""
+    ssids: Dict[str, str] = {}
+    for section in iter_sections(output):
+        uuid = section.get("connection.uuid", "").strip()
+        ssid = section.get("802-11-wireless.ssid", "").strip()
+        if uuid and ssid:
+            ssids[uuid] = ssid
+    return ssids
+
+
+class ConnectionInventory:
+    """Cached list of NetworkManager's saved connection profiles.
+
+    Profiles are read over D-Bus, or with two nmcli calls that cover every
+    profile however many are saved. The result is kept until a connection
+    profile event arrives or the TTL runs out.
+    """
+
+    _instance: ClassVar[Optional["ConnectionInventory"]] = None
+
+    def __init__(self, run: Optional[Runner] = None, ttl: float = INVENTORY_TTL):
+        self._run = run or run_command
+        self._ttl = ttl
+        self._connections: Optional[List[SavedConnection]] = None
+        self._loaded_at = 0.0
+        self._generation = 0
+
+    @classmethod
+    def get_instance(cls) -> "ConnectionInventory":
+        if cls._instance is None:
+            cls._instance = cls()
+            NetworkEventMonitor.get_instance().subscribe(cls._instance.on_event)
+        return cls._instance
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._connections = None
+
+    def on_event(self, event: NetworkEvent) -> None:
+        if event.kind == "connection" or event.action == "restart":
+            logger.debug(f"Saved connections changed ({event.action})")
+            self.invalidate()
+
+    def _fresh(self) -> bool:
+        return (
+            self._connections is not None
+            and time.monotonic() - self._loaded_at < self._ttl
+        )
+
+    async def connections(self) -> List[SavedConnection]:
+        if self._fresh():
+            return self._connections
+        generation = self._generation
+        connections = await self._load()
+        # Don't keep a result an event has already made stale
+        if connections is not None and generation == self._generation:
+            self._connections = connections
+            self._loaded_at = time.monotonic()
+        return connections or []
+
+    async def _load(self) -> Optional[List[SavedConnection]]:
+        service = get_networkmanager()
+        if service is not None:
+            try:
+                return await service.list_connections()
+            except Exception as e:
+                logger.warning(f"Listing connections over D-Bus failed: {e}")
+        return await self._load_nmcli()
+
+    async def _load_nmcli(self) -> Optional[List[SavedConnection]]:
+        result = await self._run(
+            [
+                "sudo",
+                "nmcli",
+                "-t",
+                "-f",
+                ",".join(CONNECTION_FIELDS),
+                "connection",
+                "show",
+            ],
+            dedupe=True,
+        )
+        if result.returncode != 0:
+            logger.error(f"Failed to list saved connections: {result.stderr}")
+            return None
+        connections = parse_connection_list(result.stdout)
+
+        uuids = [c.uuid for c in connections if c.wireless and c.uuid]
+        if uuids:
+            result = await self._run(
+                [
+                    "sudo",
+                    "nmcli",
+                    "-t",
+                    "-f",
+                    "connection.uuid,802-11-wireless.ssid",
+                    "connection",
+                    "show",
+                    *uuids,
+                ],
+                dedupe=True,
+            )
+            if result.returncode != 0:
+                logger.error(f"Failed to read saved SSIDs: {result.stderr}")
+            else:
+                ssids = parse_ssids(result.stdout)
+                for connection in connections:
+                    connection.ssid = ssids.get(connection.uuid)
+        return connections
+
+    async def saved_ssids(self) -> Set[str]:
+        """Names and SSIDs of all saved wireless profiles"""
+        saved = set()
+        for connection in await self.connections():
+            if connection.wireless:
+                saved.add(connection.name)
+                if connection.ssid:
+                    saved.add(connection.ssid)
+        return saved
+
+    async def ssid_for(self, name: str) -> Optional[str]:
+        for connection in await self.connections():
+            if connection.name == name:
+                return connection.ssid
+        return None
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import re
+import time
+from subprocess import CompletedProcess
+from typing import Awaitable, Callable, ClassVar, List, Optional, Union
+
+from pydantic import BaseModel
+
+from config.config import settings
+
+from .command_executor import run_command
+from .metrics import REGISTRY
+from .network_events import NetworkEvent, NetworkEventMonitor
+from .services.network_service import get_networkmanager
+
+logger = logging.getLogger(__name__)
+
+CHECK_COMMAND = ("nmcli", "networking", "connectivity", "check")
+STATES = ("full", "limited", "portal", "none", "unknown")
+
+# "Connectivity is now 'full'" from nmcli monitor
+_CONNECTIVITY_RE = re.compile(r"^Connectivity is now '(?P<state>\w+)'")
+
+Runner = Callable[..., Awaitable[CompletedProcess]]
+Listener = Callable[["ConnectivityState"], Union[None, Awaitable[None]]]
+
+
+class ConnectivityState(BaseModel):
+    state: str = "unknown"  # NetworkManager's full, limited, portal, none, unknown
+    checked_at: Optional[float] = None  # Unix time of the last check
+    changed_at: Optional[float] = None  # Unix time the state last changed
+
+    @property
+    def online(self) -> bool:
+        return self.state == "full"
+
+
+class ConnectivityMonitor:
+    """Single source of truth for internet connectivity.
+
+    NetworkManager's connectivity check runs every ``interval`` seconds and
+    shortly after network events. The last result is kept, so ``status`` and
+    ``online`` are plain attribute reads. Listeners are told about changes.
+    """
+
+    _instance: ClassVar[Optional["ConnectivityMonitor"]] = None
+
+    def __init__(
+        self,
+        run: Optional[Runner] = None,
+        interval: float = settings.CONNECTIVITY_CHECK_INTERVAL,
+        settle: float = 2.0,
+    ):
+        self._run = run or run_command
+        self._interval = interval
+        self._settle = settle
+        self._status = ConnectivityState()
+        self._listeners: List[Listener] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get_instance(cls) -> "ConnectivityMonitor":
+        if cls._instance is None:
+            cls._instance = cls()
+            NetworkEventMonitor.get_instance().subscribe(cls._instance.on_event)
+        return cls._instance
+
+    @property
+    def status(self) -> ConnectivityState:
+        return self._status
+
+    @property
+    def online(self) -> bool:
+        return self._status.online
+
+    def subscribe(self, listener: Listener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def check(self) -> ConnectivityState:
+        """Ask NetworkManager now and record the answer"""
+        state = await self._check_dbus()
+        if state is None:
+            result = await self._run(list(CHECK_COMMAND), dedupe=True)
+            state = result.stdout.strip().lower() if result.returncode == 0 else ""
+            if state not in STATES:
+                logger.warning(f"Connectivity check failed: {result.stderr or state}")
+                state = "unknown"
+        await self._record(state)
+        return self._status
+
+    async def _check_dbus(self) -> Optional[str]:
+        """The state checked over D-Bus, None to ask nmcli instead"""
+        service = get_networkmanager()
+        if service is None:
+            return None
+        try:
+            return await service.check_connectivity()
+        except Exception as e:
+            logger.warning(f"Connectivity check over D-Bus failed: {e}")
+            return None
+
+    async def ensure(self) -> ConnectivityState:
+        """The last result, checking first if there has never been one"""
+        if self._status.checked_at is None:
+            return await self.check()
+        return self._status
+
+    async def _record(self, state: str) -> None:
+        now = time.time()
+        previous = self._status
+        changed = state != previous.state
+        self._status = ConnectivityState(
+            state=state,
+            checked_at=now,
+            changed_at=now if changed else previous.changed_at,
+        )
+        if changed:
+            logger.info(f"Connectivity changed: {previous.state} -> {state}")
+            for listener in list(self._listeners):
+                try:
+                    result = listener(self._status)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"Connectivity listener failed: {e}")
+
+    async def on_event(self, event: NetworkEvent) -> None:
+        match = _CONNECTIVITY_RE.match(event.action)
+        if match and match.group("state") in STATES:
+            # NetworkManager already checked, take its answer
+            await self._record(match.group("state"))
+        elif event.kind in ("device", "connection") or event.action == "restart":
+            self._wake()
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Check now and then on schedule and after network events"""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_checks())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run_checks(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Error checking connectivity: {e}")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._interval)
+            except asyncio.TimeoutError:
+                continue
+            # Give the network a moment after an event, folding bursts into one
+            await asyncio.sleep(self._settle)
+
+
+REGISTRY.gauge(
+    "radio_internet_connected",
+    "1 while NetworkManager reports full connectivity",
+    function=lambda: (
+        None
+        if ConnectivityMonitor._instance is None
+        else float(ConnectivityMonitor._instance.online)
+    ),
+)
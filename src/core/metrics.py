@@ -0,0 +1,299 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, cast
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    """Base class for one metric family.
+
+    Updates only mark the family dirty; the text block is rendered again on
+    the next scrape that sees the flag, otherwise the cached text is reused.
+    Updates are expected on the event loop and are not locked, except for
+    counters registered as threadsafe.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._dirty = True
+        self._text = ""
+
+    def _label_values(self, labels: Sequence[object]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}",
+            )
+        return tuple(str(label) for label in labels)
+
+    def _format_labels(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        if self._dirty:
+            header = (
+                f"# HELP {self.name} {_escape(self.documentation)}\n"
+                f"# TYPE {self.name} {self.kind}\n"
+            )
+            self._text = header + "".join(self._samples())
+            self._dirty = False
+        return self._text
+
+
+class Counter(_Metric):
+    """Monotonically increasing value, optionally safe to update from threads"""
+
+    kind = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        threadsafe: bool = False,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock: AbstractContextManager = (
+            threading.Lock() if threadsafe else nullcontext()
+        )
+
+    def inc(self, *labels: object, amount: float = 1.0) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+            self._dirty = True
+
+    def render(self) -> str:
+        with self._lock:
+            return super().render()
+
+    def value(self, *labels: object) -> float:
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{self._format_labels(key)} {_format_value(value)}\n"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be read from a function at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], Optional[float]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        if function is not None and self.labelnames:
+            raise ValueError("Function gauges cannot have labels")
+        self._values: Dict[LabelValues, float] = {}
+        self._function = function
+
+    def set(self, value: float, *labels: object) -> None:
+        self._values[self._label_values(labels)] = float(value)
+        self._dirty = True
+
+    def inc(self, *labels: object, amount: float = 1.0) -> None:
+        key = self._label_values(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+        self._dirty = True
+
+    def dec(self, *labels: object, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def value(self, *labels: object) -> float:
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def render(self) -> str:
+        if self._function is not None:
+            self._dirty = True
+        return super().render()
+
+    def _samples(self) -> List[str]:
+        if self._function is not None:
+            value = self._function()
+            if value is None:
+                return []
+            return [f"{self.name} {_format_value(value)}\n"]
+        return [
+            f"{self.name}{self._format_labels(key)} {_format_value(value)}\n"
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (+Inf last), sum, count
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *labels: object) -> None:
+        key = self._label_values(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] = self._sums.get(key, 0.0) + value
+        self._dirty = True
+
+    @contextmanager
+    def time(self, *labels: object) -> Iterator[None]:
+        """Observe the duration of the enclosed block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels: object) -> int:
+        return sum(self._counts.get(self._label_values(labels), ()))
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{self._format_labels(key, le)} {cumulative}\n",
+                )
+            labels = self._format_labels(key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(self._sums[key])}\n")
+            lines.append(f"{self.name}_count{labels} {cumulative}\n")
+        return lines
+
+
+class Registry:
+    """Collection of metric families rendered together for /metrics"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_add(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is None:
+            self._metrics[metric.name] = metric
+            return metric
+        if type(existing) is not type(metric):
+            raise ValueError(
+                f"Metric {metric.name} already registered as {existing.kind}"
+            )
+        return existing
+
+    def counter(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        threadsafe: bool = False,
+    ) -> Counter:
+        counter = Counter(name, documentation, labelnames, threadsafe)
+        return cast(Counter, self._get_or_add(counter))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], Optional[float]]] = None,
+    ) -> Gauge:
+        gauge = Gauge(name, documentation, labelnames, function)
+        return cast(Gauge, self._get_or_add(gauge))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        histogram = Histogram(name, documentation, labelnames, buckets)
+        return cast(Histogram, self._get_or_add(histogram))
+
+    def render(self) -> bytes:
+        """Render all families in the text exposition format"""
+        return "".join(metric.render() for metric in self._metrics.values()).encode()
+
+
+REGISTRY = Registry()
+
+# WebSocket hub metrics, shared by every WebSocket endpoint
+WS_CONNECTIONS = REGISTRY.gauge(
+    "radio_websocket_connections",
+    "Open WebSocket connections",
+    ("endpoint",),
+)
+WS_MESSAGES_SENT = REGISTRY.counter(
+    "radio_websocket_messages_sent_total",
+    "Messages sent to WebSocket clients",
+    ("endpoint",),
+)
+WS_BYTES_SENT = REGISTRY.counter(
+    "radio_websocket_sent_bytes_total",
+    "Bytes of JSON sent to WebSocket clients",
+    ("endpoint",),
+)
+WS_MESSAGES_RECEIVED = REGISTRY.counter(
+    "radio_websocket_messages_received_total",
+    "Messages received from WebSocket clients",
+    ("endpoint",),
+)
+WS_DROPPED = REGISTRY.counter(
+    "radio_websocket_dropped_total",
+    "WebSocket clients dropped after a failed send",
+    ("endpoint",),
+)
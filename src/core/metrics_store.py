@@ -0,0 +1,149 @@
+import math
+import re
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# (step in seconds, number of buckets): 10 minutes at 1 s, 24 hours at 1 min,
+# 30 days at 1 h. Every metric costs about 45 KB across all resolutions.
+DEFAULT_RESOLUTIONS: Tuple[Tuple[int, int], ...] = ((1, 600), (60, 1440), (3600, 720))
+
+_RANGE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_range(value: str) -> int:
+    """Convert a range like '90', '10m', '24h' or '7d' to seconds"""
+    match = re.fullmatch(r"\s*(\d+)\s*([smhd]?)\s*", value)
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Invalid range: {value!r}")
+    return int(match.group(1)) * _RANGE_UNITS[match.group(2) or "s"]
+
+
+class _Ring:
+    """Fixed-size circular buffer of mean/max samples at one resolution.
+
+    Samples are accumulated into the current bucket and written to the ring
+    when a sample for a newer bucket arrives. The slot array stores the
+    absolute bucket number so stale entries from a previous lap are ignored.
+    """
+
+    def __init__(self, step: int, capacity: int):
+        self.step = step
+        self.capacity = capacity
+        self.slots = array("q", [-1]) * capacity
+        self.means = array("f", [0.0]) * capacity
+        self.peaks = array("f", [0.0]) * capacity
+        self._slot = -1
+        self._sum = 0.0
+        self._count = 0
+        self._peak = -math.inf
+
+    @property
+    def span(self) -> int:
+        return self.step * self.capacity
+
+    def add(self, timestamp: float, value: float) -> None:
+        slot = int(timestamp // self.step)
+        if slot != self._slot:
+            self._flush()
+            self._slot = slot
+        self._sum += value
+        self._count += 1
+        self._peak = max(self._peak, value)
+
+    def _flush(self) -> None:
+        if self._count:
+            index = self._slot % self.capacity
+            self.slots[index] = self._slot
+            self.means[index] = self._sum / self._count
+            self.peaks[index] = self._peak
+        self._sum = 0.0
+        self._count = 0
+        self._peak = -math.inf
+
+    def read(self, first: int, last: int) -> Tuple[List[Optional[float]], ...]:
+        means: List[Optional[float]] = []
+        peaks: List[Optional[float]] = []
+        for slot in range(first, last + 1):
+            if slot == self._slot and self._count:
+                means.append(round(self._sum / self._count, 2))
+                peaks.append(round(self._peak, 2))
+                continue
+            index = slot % self.capacity
+            if self.slots[index] == slot:
+                means.append(round(self.means[index], 2))
+                peaks.append(round(self.peaks[index], 2))
+            else:
+                means.append(None)
+                peaks.append(None)
+        return means, peaks
+
+
+class MetricsStore:
+    """Array-backed time series for a fixed set of metrics.
+
+    Memory is allocated up front and never grows: each metric keeps one ring
+    per resolution, coarser rings being fed the same samples and averaging
+    them per bucket (max is kept alongside so short spikes stay visible).
+    """
+
+    def __init__(
+        self,
+        metrics: Iterable[str],
+        resolutions: Iterable[Tuple[int, int]] = DEFAULT_RESOLUTIONS,
+    ):
+        resolutions = sorted(resolutions)
+        self._rings: Dict[str, List[_Ring]] = {
+            metric: [_Ring(step, capacity) for step, capacity in resolutions]
+            for metric in metrics
+        }
+        self._latest: Dict[str, float] = {}
+
+    @property
+    def metrics(self) -> List[str]:
+        return list(self._rings)
+
+    def record(
+        self,
+        metric: str,
+        value: float,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Add a sample to every resolution of a metric"""
+        timestamp = time.time() if timestamp is None else timestamp
+        for ring in self._rings[metric]:
+            ring.add(timestamp, value)
+        self._latest[metric] = value
+
+    def latest(self, metric: str) -> Optional[float]:
+        """Most recent raw sample of a metric"""
+        return self._latest.get(metric)
+
+    def history(
+        self,
+        metric: str,
+        seconds: int,
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Return the series covering the last seconds at the finest resolution
+        that spans the whole range. Missing buckets are None.
+
+        Raises:
+            KeyError: If the metric is unknown
+
+        """
+        rings = self._rings[metric]
+        ring = next((r for r in rings if r.span >= seconds), rings[-1])
+        now = time.time() if now is None else now
+
+        last = int(now // ring.step)
+        count = min(ring.capacity, max(1, math.ceil(seconds / ring.step)))
+        first = last - count + 1
+        means, peaks = ring.read(first, last)
+        return {
+            "metric": metric,
+            "step": ring.step,
+            "start": first * ring.step,
+            "mean": means,
+            "max": peaks,
+        }
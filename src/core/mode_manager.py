@@ -1,26 +1,80 @@
 import asyncio
 import json
 import logging
-import subprocess
+import time
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
 from subprocess import CompletedProcess
-from typing import Any, ClassVar, Dict, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
 
 from config.config import settings
 from src.core.sound_manager import SoundManager, SystemEvent
-
-from .services.network_service import get_network_service
+from src.utils.nmcli_parser import (
+    WIFI_LIST_FIELDS,
+    DeviceState,
+    parse_device_show,
+    parse_wifi_list,
+)
+
+from .ap_scanner import APScanner
+from .command_executor import CommandExecutor
+from .connection_inventory import ConnectionInventory
+from .connectivity_monitor import ConnectivityMonitor
+from .metrics import REGISTRY
+from .models import ModeTransition, PhaseTiming, WiFiNetwork, WiFiStatus
+from .network_events import NetworkEvent, NetworkEventMonitor
+from .services.network_service import (
+    NetworkManagerUnavailable,
+    get_network_service,
+    get_networkmanager,
+)
+from .wifi_status_store import WiFiStatusStore
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# NetworkManager device state once the interface can take a connection
+DEVICE_DISCONNECTED = 30
+# Connection profile of the access point, as named by nmcli
+HOTSPOT_CONNECTION = "Hotspot"
+# Re-read the device state this often in case an event was missed
+DEVICE_RECHECK_INTERVAL = 5.0
+
+MODE_SWITCH_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+MODE_SWITCH_SECONDS = REGISTRY.histogram(
+    "radio_mode_switch_seconds",
+    "Duration of switches between AP and client mode",
+    ("target", "result"),
+    buckets=MODE_SWITCH_BUCKETS,
+)
+MODE_SWITCH_PHASE_SECONDS = REGISTRY.histogram(
+    "radio_mode_switch_phase_seconds",
+    "Duration of each phase of a mode switch",
+    ("target", "phase"),
+    buckets=MODE_SWITCH_BUCKETS,
+)
+
 
 class NetworkMode(Enum):
     AP = "AP"
     CLIENT = "CLIENT"
 
 
+ModeListener = Callable[[NetworkMode], Union[None, Awaitable[None]]]
+
+
 class ModeManagerSingleton:
     _instance: ClassVar[Optional["ModeManagerSingleton"]] = None
 
@@ -31,17 +85,41 @@ class ModeManagerSingleton:
         self.AP_SSID = settings.HOSTNAME
         self.AP_PASS = settings.AP_PASSWORD
         self._MODE_FILE = Path("/tmp/radio/radio_mode.json")
-        self._current_mode = None
+        self.last_transition: Optional[ModeTransition] = None
         self._sound_manager = SoundManager()
-        self._load_state()
+        # Persisted mode, trusted once NetworkManager has confirmed it
+        self._current_mode: Optional[NetworkMode] = self._load_state()
+        self._mode_checked_at: Optional[float] = None
+        self._mode_listeners: List[ModeListener] = []
+        self._refresh_pending = False
+        self._refresh_task: Optional[asyncio.Task] = None
         self.network_service = get_network_service()
+        self._executor = CommandExecutor.get_instance()
+        self._ap_scanner = APScanner(
+            run=lambda cmd, **kwargs: self._run_command(cmd, **kwargs),
+        )
 
     @classmethod
     def get_instance(cls) -> "ModeManagerSingleton":
         if cls._instance is None:
             cls._instance = cls()
+            NetworkEventMonitor.get_instance().subscribe(cls._instance.on_event)
         return cls._instance
 
+    @property
+    def current_mode(self) -> NetworkMode:
+        """The last known mode, AP if it has never been known"""
+        return self._current_mode or NetworkMode.AP
+
+    def subscribe(self, listener: ModeListener) -> None:
+        """Call listener with the new mode whenever the mode changes"""
+        if listener not in self._mode_listeners:
+            self._mode_listeners.append(listener)
+
+    def unsubscribe(self, listener: ModeListener) -> None:
+        if listener in self._mode_listeners:
+            self._mode_listeners.remove(listener)
+
     def _save_state(self, mode: NetworkMode) -> None:
         """Save current mode to state file"""
         try:
@@ -63,37 +141,92 @@ class ModeManagerSingleton:
             logger.error(f"Failed to load state: {e}")
         return None
 
-    def detect_current_mode(self) -> NetworkMode:
-        """Detect current network mode based on actual network configuration."""
-        try:
-            logger.debug("Starting mode detection...")
-
-            # Check if running as AP/Hotspot
-            result = subprocess.run(
-                ["nmcli", "device", "show", "wlan0"],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-
-            logger.debug(f"Network status from nmcli: {result.stdout}")
+    async def detect_current_mode(self) -> NetworkMode:
+        """The current mode, asking NetworkManager only if it never has.
 
-            if "AP" in result.stdout or "Hotspot" in result.stdout:
-                logger.info("Detected AP/Hotspot mode from network status")
-                return NetworkMode.AP
+        The mode is kept up to date by mode switches and network events, so
+        this is normally a plain read.
+        """
+        if self._mode_checked_at is None:
+            return await self.refresh_mode()
+        return self.current_mode
 
-            logger.info("Detected client mode from network status")
-            return NetworkMode.CLIENT
+    async def refresh_mode(self) -> NetworkMode:
+        """Read the mode from wlan0's active connection and record it"""
+        try:
+            logger.debug("Starting mode detection...")
+            ap_active = await self._dbus_ap_active()
+            if ap_active is None:
+                result = await self._run_command(
+                    ["nmcli", "-t", "device", "show", "wlan0"],
+                    dedupe=True,
+                )
+                logger.debug(f"Network status from nmcli: {result.stdout}")
+                ap_active = "AP" in result.stdout or "Hotspot" in result.stdout
 
+            mode = NetworkMode.AP if ap_active else NetworkMode.CLIENT
+            logger.debug(f"Detected {mode.value} mode from network status")
         except Exception as e:
             logger.error(f"Error detecting mode: {e!s}", exc_info=True)
-            return NetworkMode.AP  # Default to AP mode
-
-    def _verify_mode(self, mode: NetworkMode) -> bool:
+            # Default to AP mode
+            mode = NetworkMode.AP
+        await self._record_mode(mode)
+        return mode
+
+    async def _dbus_ap_active(self) -> Optional[bool]:
+        """Whether wlan0 serves the access point, None to ask nmcli instead"""
+        service = get_networkmanager()
+        if service is None:
+            return None
+        try:
+            return await service.ap_active()
+        except Exception as e:
+            logger.warning(f"Reading the mode over D-Bus failed: {e}")
+            return None
+
+    async def _record_mode(self, mode: NetworkMode) -> None:
+        self._mode_checked_at = time.time()
+        if mode == self._current_mode:
+            return
+        logger.info(f"Mode changed to {mode.value}")
+        self._current_mode = mode
+        self._save_state(mode)
+        for listener in list(self._mode_listeners):
+            try:
+                result = listener(mode)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Mode listener failed: {e}")
+
+    def on_event(self, event: NetworkEvent) -> None:
+        """Re-read the mode when wlan0 or its connections change"""
+        if self.last_transition is not None and self.last_transition.success is None:
+            # A switch in progress records the mode it ends in
+            return
+        if (
+            event.subject == "wlan0"
+            or event.kind == "connection"
+            or event.action == "restart"
+        ):
+            self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        # Events arriving during a refresh get one more, bursts share it
+        self._refresh_pending = True
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_while_pending())
+
+    async def _refresh_while_pending(self) -> None:
+        while self._refresh_pending:
+            self._refresh_pending = False
+            await self.refresh_mode()
+
+    async def _verify_mode(self, mode: NetworkMode) -> bool:
         """Verify that saved mode matches actual mode"""
         try:
             if mode == NetworkMode.AP:
-                result = subprocess.run(
+                result = await self._run_command(
                     [
                         "nmcli",
                         "-t",
@@ -105,121 +238,169 @@ class ModeManagerSingleton:
                         "ifname",
                         "wlan0",
                     ],
-                    capture_output=True,
-                    text=True,
-                    check=False,
+                    dedupe=True,
                 )
                 return "AP" in result.stdout
-            result = subprocess.run(
+            result = await self._run_command(
                 ["nmcli", "-t", "-f", "GENERAL.STATE", "device", "show", "wlan0"],
-                capture_output=True,
-                text=True,
-                check=False,
+                dedupe=True,
             )
             return "AP" not in result.stdout
         except Exception as e:
             self.logger.error(f"Mode verification failed: {e}")
             return False
 
+    async def _device_state(self) -> DeviceState:
+        service = get_networkmanager()
+        if service is not None:
+            try:
+                return await service.get_device_state()
+            except Exception as e:
+                logger.warning(f"Reading wlan0 over D-Bus failed: {e}")
+        result = await self._run_command(
+            ["nmcli", "-t", "device", "show", "wlan0"],
+            dedupe=True,
+        )
+        return parse_device_show(result.stdout)
+
+    async def _wait_for_device(
+        self,
+        ready: Callable[[DeviceState], bool],
+        deadline: float,
+    ) -> bool:
+        """Wait until wlan0's state satisfies ready or the deadline passes.
+
+        The state is read again whenever NetworkManager reports a change to
+        the device, so this returns as soon as the device gets there.
+        """
+        changed = asyncio.Event()
+
+        def on_event(event: NetworkEvent) -> None:
+            if event.subject == "wlan0" or event.action == "restart":
+                changed.set()
+
+        loop = asyncio.get_running_loop()
+        events = NetworkEventMonitor.get_instance()
+        events.subscribe(on_event)
+        try:
+            while True:
+                changed.clear()
+                if ready(await self._device_state()):
+                    return True
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(
+                        changed.wait(),
+                        timeout=min(remaining, DEVICE_RECHECK_INTERVAL),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            events.unsubscribe(on_event)
+
+    def _begin_transition(self, target: NetworkMode) -> ModeTransition:
+        self.last_transition = ModeTransition(
+            target=target.value, started_at=time.time()
+        )
+        return self.last_transition
+
+    @contextmanager
+    def _phase(self, transition: ModeTransition, name: str) -> Iterator[None]:
+        """Time one phase of a mode switch"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            transition.phases.append(PhaseTiming(name=name, seconds=round(elapsed, 3)))
+            MODE_SWITCH_PHASE_SECONDS.observe(elapsed, transition.target.value, name)
+
+    def _finish_transition(self, transition: ModeTransition, success: bool) -> None:
+        transition.success = success
+        transition.seconds = round(time.time() - transition.started_at, 3)
+        MODE_SWITCH_SECONDS.observe(
+            transition.seconds,
+            transition.target.value,
+            "success" if success else "failure",
+        )
+        phases = ", ".join(f"{p.name} {p.seconds:.2f}s" for p in transition.phases)
+        logger.info(
+            f"Switch to {transition.target.value} mode "
+            f"{'done' if success else 'failed'} in {transition.seconds:.2f}s ({phases})",
+        )
+        if not success:
+            # Events were ignored during the switch, find out where it ended
+            self._schedule_refresh()
+
     async def enable_ap_mode(self) -> bool:
         """Enable AP mode using NetworkManager"""
+        transition = self._begin_transition(NetworkMode.AP)
         try:
             logger.info(f"Enabling AP mode with SSID: {self.AP_SSID}")
 
             # Save current WiFi status before switching
-            await self._save_wifi_status()
-
-            # Create AP connection if it doesn't exist
-            result = subprocess.run(
-                [
-                    "sudo",
-                    "nmcli",
-                    "device",
-                    "wifi",
-                    "hotspot",
-                    "ifname",
-                    "wlan0",
-                    "ssid",
-                    self.AP_SSID,
-                    "password",
-                    self.AP_PASS,
-                ],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
+            with self._phase(transition, "save_wifi_status"):
+                await self._save_wifi_status()
+
+            with self._phase(transition, "start_hotspot"):
+                started = await self._start_hotspot()
 
-            if result.returncode != 0:
-                logger.error(f"Failed to create AP: {result.stderr}")
+            if not started:
+                self._finish_transition(transition, False)
                 return False
 
-            self._save_state(NetworkMode.AP)
+            self._finish_transition(transition, True)
+            await self._record_mode(NetworkMode.AP)
             return True
 
         except Exception as e:
             logger.error(f"Error enabling AP mode: {e}", exc_info=True)
+            self._finish_transition(transition, False)
             return False
 
     async def enable_client_mode(self) -> bool:
-        """Enable client mode and connect to saved networks."""
+        """Enable client mode and connect to saved networks.
+
+        Each phase moves on as soon as NetworkManager reports the device
+        ready, bounded by one MODE_SWITCH_TIMEOUT deadline for the switch.
+        """
+        transition = self._begin_transition(NetworkMode.CLIENT)
+        deadline = asyncio.get_running_loop().time() + settings.MODE_SWITCH_TIMEOUT
         try:
             logger.info("Enabling client mode...")
 
-            # 1. Stop and delete AP/Hotspot
-            subprocess.run(
-                ["sudo", "nmcli", "connection", "down", "Hotspot"],
-                capture_output=True,
-                check=False,
-            )
-            subprocess.run(
-                ["sudo", "nmcli", "connection", "delete", "Hotspot"],
-                capture_output=True,
-                check=False,
-            )
-
-            # 2. Switch to managed mode and enable WiFi
-            subprocess.run(
-                ["sudo", "nmcli", "device", "set", "wlan0", "managed"],
-                capture_output=True,
-                check=False,
-            )
-            subprocess.run(
-                ["sudo", "nmcli", "radio", "wifi", "on"],
-                capture_output=True,
-                check=False,
-            )
+            # 1. Delete the AP/Hotspot, which also takes it down
+            with self._phase(transition, "stop_hotspot"):
+                await self._stop_hotspot()
+
+            # 2. Managed mode and the WiFi radio are independent, set both at
+            # once and wait for the device to become available
+            with self._phase(transition, "prepare_device"):
+                await self._prepare_device()
+                await self._wait_for_device(
+                    lambda device: (device.state or 0) >= DEVICE_DISCONNECTED,
+                    deadline,
+                )
 
-            # 3. Force reconnection
-            await asyncio.sleep(1)
-            subprocess.run(
-                ["sudo", "nmcli", "device", "connect", "wlan0"],
-                capture_output=True,
-                check=False,
-            )
+            # 3. Ask for a connection, the next phase waits for the result
+            with self._phase(transition, "activate"):
+                await self._connect_device()
 
-            # 4. Let NetworkManager auto-connect and wait for result
-            max_attempts = 15
-            connected = False
-            for attempt in range(max_attempts):
-                logger.debug(
-                    f"Checking connection status (attempt {attempt + 1}/{max_attempts})",
-                )
-                check = subprocess.run(
-                    ["nmcli", "-t", "-f", "GENERAL.STATE", "device", "show", "wlan0"],
-                    capture_output=True,
-                    text=True,
-                    check=False,
+            # 4. Done as soon as NetworkManager reports the device connected
+            with self._phase(transition, "wait_connected"):
+                connected = await self._wait_for_device(
+                    lambda device: device.connected,
+                    deadline,
                 )
-                if "connected" in check.stdout.lower():
-                    logger.info("Network connection established")
-                    connected = True
-                    break
-                await asyncio.sleep(1)
 
-            # 5. Save state and notify
-            self._save_state(NetworkMode.CLIENT)
+            # 5. Record the mode and notify
+            self._finish_transition(transition, connected)
+            await self._record_mode(NetworkMode.CLIENT)
 
             if connected:
+                logger.info("Network connection established")
                 await self._sound_manager.notify(SystemEvent.WIFI_CONNECTED)
                 return True
             await self._sound_manager.notify(SystemEvent.STARTUP_ERROR)
@@ -228,16 +409,101 @@ class ModeManagerSingleton:
 
         except Exception as e:
             logger.error(f"Error enabling client mode: {e}", exc_info=True)
+            self._finish_transition(transition, False)
             await self._sound_manager.notify(SystemEvent.STARTUP_ERROR)
             raise
 
-    async def toggle_mode(self) -> NetworkMode:
-        """Toggle between AP and Client modes with stability checks"""
+    async def _start_hotspot(self) -> bool:
+        """Bring up the access point, returns once it's up"""
+        service = get_networkmanager()
+        if service is not None:
+            try:
+                return await service.start_ap(self.AP_SSID, self.AP_PASS)
+            except NetworkManagerUnavailable as e:
+                logger.warning(f"Starting the hotspot over D-Bus failed: {e}")
+
+        result = await self._run_command(
+            [
+                "sudo",
+                "nmcli",
+                "device",
+                "wifi",
+                "hotspot",
+                "ifname",
+                "wlan0",
+                "ssid",
+                self.AP_SSID,
+                "password",
+                self.AP_PASS,
+            ],
+            timeout=settings.MODE_SWITCH_TIMEOUT,
+        )
+        if result.returncode != 0:
+            logger.error(f"Failed to create AP: {result.stderr}")
+            return False
+        return True
+
+    async def _stop_hotspot(self) -> None:
+        service = get_networkmanager()
+        if service is not None:
+            try:
+                await service.delete_connections(HOTSPOT_CONNECTION)
+                return
+            except NetworkManagerUnavailable as e:
+                logger.warning(f"Stopping the hotspot over D-Bus failed: {e}")
+        await self._run_command(
+            ["sudo", "nmcli", "connection", "delete", HOTSPOT_CONNECTION],
+        )
+
+    async def _prepare_device(self) -> None:
+        service = get_networkmanager()
+        if service is not None:
+            try:
+                await service.prepare_device()
+                return
+            except Exception as e:
+                logger.warning(f"Preparing wlan0 over D-Bus failed: {e}")
+        await asyncio.gather(
+            self._run_command(["sudo", "nmcli", "device", "set", "wlan0", "managed"]),
+            self._run_command(["sudo", "nmcli", "radio", "wifi", "on"]),
+        )
+
+    async def _connect_device(self) -> None:
+        """Ask NetworkManager to connect wlan0, without waiting for it"""
+        service = get_networkmanager()
+        if service is not None:
+            try:
+                await service.connect_device()
+                return
+            except NetworkManagerUnavailable as e:
+                logger.warning(f"Connecting wlan0 over D-Bus failed: {e}")
+        await self._run_command(
+            ["sudo", "nmcli", "--wait", "0", "device", "connect", "wlan0"],
+            timeout=settings.MODE_SWITCH_TIMEOUT,
+        )
+
+    async def _dbus_networks(
+        self,
+        saved: Collection[str],
+        rescan: bool = False,
+    ) -> Optional[List[WiFiNetwork]]:
+        """Networks seen, read over D-Bus, None to use nmcli instead"""
+        service = get_networkmanager()
+        if service is None:
+            return None
         try:
-            # Allow interface to stabilize
-            await asyncio.sleep(1)
+            if rescan:
+                return await service.scan(saved)
+            return await service.get_access_points(saved)
+        except Exception as e:
+            logger.warning(f"Reading networks over D-Bus failed: {e}")
+            return None
 
-            current_mode = self.detect_current_mode()
+    async def toggle_mode(self) -> NetworkMode:
+        """Toggle between AP and Client modes"""
+        current_mode = NetworkMode.AP
+        try:
+            current_mode = await self.detect_current_mode()
             if current_mode == NetworkMode.CLIENT:
                 success = await self.enable_ap_mode()
             else:
@@ -248,81 +514,97 @@ class ModeManagerSingleton:
                 self.logger.error(f"Failed to switch from {current_mode}")
                 return current_mode
 
-            # Allow mode to stabilize
-            await asyncio.sleep(2)
-
-            return self.detect_current_mode()
+            # Both switches record the mode they end in
+            return self.current_mode
 
         except Exception as e:
             self.logger.error(f"Mode toggle failed: {e}")
             return current_mode
 
-    def _run_command(
+    async def _run_command(
         self,
         cmd: list[str],
-        check: bool = False,
-        capture_output: bool = True,
-        text: bool = True,
-        timeout: Optional[int] = None,
+        timeout: Optional[float] = None,
+        dedupe: bool = False,
     ) -> CompletedProcess[str]:
-        """Run a shell command and return the result"""
-        try:
-            return subprocess.run(
-                cmd,
-                check=check,
-                capture_output=capture_output,
-                text=text,
-                timeout=timeout,
-            )
-        except subprocess.SubprocessError as e:
-            logger.error(f"Command failed: {' '.join(cmd)}\nError: {e}")
-            raise
+        """Run a command with the shared executor and return the result"""
+        return await self._executor.run(cmd, timeout=timeout, dedupe=dedupe)
 
-    async def scan_wifi_networks(self) -> list[Dict[str, Any]]:
-        """Scan for available WiFi networks."""
+    async def _save_wifi_status(self) -> None:
+        """Keep what client mode sees, for setup while the hotspot is up"""
         try:
-            logger.info("Scanning for WiFi networks...")
-            current_mode = self.detect_current_mode()
-
-            # If in AP mode, temporarily switch to client mode for scanning
-            temp_switch = False
-            if current_mode == NetworkMode.AP:
-                logger.info("Temporarily switching to client mode for scanning")
-                temp_switch = True
-                # Don't disconnect yet, just prepare interface
-                subprocess.run(
-                    ["sudo", "nmcli", "device", "set", "wlan0", "managed"],
-                    capture_output=True,
-                    check=False,
+            inventory = ConnectionInventory.get_instance()
+            saved = await inventory.saved_ssids()
+            networks = await self._dbus_networks(saved)
+            if networks is None:
+                result = await self._run_command(
+                    [
+                        "nmcli",
+                        "-t",
+                        "-f",
+                        ",".join(WIFI_LIST_FIELDS),
+                        "device",
+                        "wifi",
+                        "list",
+                    ],
+                    dedupe=True,
                 )
-
-            # Perform the scan
-            subprocess.run(
-                ["sudo", "nmcli", "device", "wifi", "rescan"],
-                capture_output=True,
-                check=False,
-            )
-            await asyncio.sleep(2)  # Wait for scan to complete
-
-            result = subprocess.run(
-                ["sudo", "nmcli", "device", "wifi", "list"],
-                capture_output=True,
-                text=True,
-                check=False,
+                networks = list(parse_wifi_list(result.stdout, saved))
+            current = next((network for network in networks if network.in_use), None)
+            status = WiFiStatus(
+                ssid=current.ssid if current else None,
+                signal_strength=current.signal_strength if current else None,
+                is_connected=current is not None,
+                has_internet=ConnectivityMonitor.get_instance().online,
+                available_networks=networks,
+                preconfigured_ssid=await inventory.ssid_for("preconfigured"),
             )
+            store = WiFiStatusStore.get_instance()
+            if networks:
+                store.update(status)
+            # On disk before the hotspot takes over wlan0
+            store.flush()
+        except Exception as e:
+            logger.error(f"Failed to save WiFi status: {e}")
 
-            # If we temporarily switched modes, restore AP mode
-            if temp_switch:
-                logger.info("Restoring AP mode after scan")
-                subprocess.run(
-                    ["sudo", "nmcli", "device", "set", "wlan0", "ap"],
-                    capture_output=True,
-                    check=False,
-                )
+    async def scan_wifi_networks(self) -> list[Dict[str, Any]]:
+        """Scan for available WiFi networks without taking the hotspot down.
 
-            # Parse the scan results
-            networks = self._parse_network_scan(result.stdout)
-            return networks
+        In AP mode the scan runs on a virtual interface next to the AP where
+        the driver allows it, otherwise the networks seen before the AP came
+        up are returned.
+        """
+        try:
+            logger.info("Scanning for WiFi networks...")
+            saved = await ConnectionInventory.get_instance().saved_ssids()
+
+            if await self.detect_current_mode() == NetworkMode.AP:
+                networks = await self._ap_scanner.scan(saved)
+                if networks is None:
+                    logger.info("Serving the networks seen before AP mode")
+                    snapshot = WiFiStatusStore.get_instance().status
+                    networks = snapshot.available_networks if snapshot else []
+            else:
+                networks = await self._dbus_networks(saved, rescan=True)
+                if networks is None:
+                    # nmcli returns once the rescan has finished
+                    result = await self._run_command(
+                        [
+                            "sudo",
+                            "nmcli",
+                            "-t",
+                            "-f",
+                            ",".join(WIFI_LIST_FIELDS),
+                            "device",
+                            "wifi",
+                            "list",
+                            "--rescan",
+                            "yes",
+                        ],
+                    )
+                    networks = list(parse_wifi_list(result.stdout, saved))
+
+            return [network.model_dump() for network in networks]
 
         except Exception as e:
             logger.error(f"Error scanning networks: {e}")
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import Any, NamedTuple, Optional
 
 from pydantic import BaseModel, ConfigDict
 
@@ -25,6 +25,56 @@ class RadioStation(Station):
     location: Optional[str] = None
 
 
+class StationRecord(NamedTuple):
+    """Read-only catalog entry.
+
+    Catalog storage and iteration use this tuple instead of RadioStation,
+    which costs validation time and several times the memory per entry.
+    Convert with to_model() where a pydantic model is needed.
+    """
+
+    id: int
+    name: str
+    url: str
+    country: Optional[str] = None
+    location: Optional[str] = None
+
+    @classmethod
+    def from_entry(cls, station_id: int, entry: dict) -> "StationRecord":
+        """Build a record from a stations.json entry.
+
+        Raises:
+            ValueError: If name or url is missing or a field has the wrong type
+
+        """
+        name = entry.get("name")
+        url = entry.get("url")
+        country = entry.get("country")
+        location = entry.get("location")
+        if not isinstance(name, str) or not isinstance(url, str):
+            raise ValueError("name and url must be strings")
+        if not isinstance(country, (str, type(None))) or not isinstance(
+            location,
+            (str, type(None)),
+        ):
+            raise ValueError("country and location must be strings")
+        return cls(station_id, name, url, country, location)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Same keys and order as RadioStation.model_dump()"""
+        return {
+            "name": self.name,
+            "url": self.url,
+            "slot": None,
+            "id": self.id,
+            "country": self.country,
+            "location": self.location,
+        }
+
+    def to_model(self) -> RadioStation:
+        return RadioStation.model_construct(**self.as_dict())
+
+
 class SystemStatus(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -41,6 +91,7 @@ class WiFiNetwork(BaseModel):
     security: Optional[str] = None
     in_use: bool = False
     saved: bool = False
+    last_seen: Optional[float] = None  # Unix time of the last scan that saw it
 
 
 class WiFiStatus(BaseModel):
@@ -56,3 +107,18 @@ class WiFiStatus(BaseModel):
 
 class ModeResponse(BaseModel):
     mode: NetworkMode
+
+
+class PhaseTiming(BaseModel):
+    name: str
+    seconds: float
+
+
+class ModeTransition(BaseModel):
+    """One switch between AP and client mode, timed phase by phase"""
+
+    target: NetworkMode
+    started_at: float  # Unix time
+    phases: list[PhaseTiming] = []
+    success: Optional[bool] = None
+    seconds: Optional[float] = None  # Total, set once finished
@@ -0,0 +1,232 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .metrics import WS_BYTES_SENT, WS_CONNECTIONS, WS_DROPPED, WS_MESSAGES_SENT
+
+logger = logging.getLogger(__name__)
+
+
+def compute_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the fields of current that differ from previous.
+
+    Nested dicts are compared field by field, any other value (lists included)
+    is replaced as a whole. None is a value like any other; keys that
+    disappeared are listed by removed_keys instead.
+    """
+    delta: Dict[str, Any] = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            nested = compute_delta(old, value)
+            if nested:
+                delta[key] = nested
+        elif key not in previous or old != value:
+            delta[key] = value
+    return delta
+
+
+def removed_keys(previous: Dict[str, Any], current: Dict[str, Any]) -> List[List[str]]:
+    """Paths of the keys in previous that are gone from current"""
+    removed: List[List[str]] = []
+    for key, old in previous.items():
+        if key not in current:
+            removed.append([key])
+        elif isinstance(old, dict) and isinstance(current[key], dict):
+            removed.extend([key, *path] for path in removed_keys(old, current[key]))
+    return removed
+
+
+class AdaptiveInterval:
+    """Broadcast interval that backs off while nothing changes"""
+
+    def __init__(self, minimum: float, maximum: float, factor: float = 1.5):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self._current = minimum
+
+    @property
+    def current(self) -> float:
+        return self._current
+
+    def reset(self) -> float:
+        """Go back to the fastest cadence"""
+        self._current = self.minimum
+        return self._current
+
+    def backoff(self) -> float:
+        """Slow down one step, never beyond the maximum"""
+        self._current = min(self.maximum, self._current * self.factor)
+        return self._current
+
+
+class _ClientState:
+    """Snapshots sent to one client, keyed by sequence number"""
+
+    MAX_PENDING = 8
+
+    def __init__(self) -> None:
+        self.acked_seq: Optional[int] = None
+        self.acked: Optional[Dict[str, Any]] = None
+        self.last_sent: Optional[Dict[str, Any]] = None
+        self.pending: Dict[int, Dict[str, Any]] = {}
+
+    def remember(self, seq: int, snapshot: Dict[str, Any]) -> None:
+        self.last_sent = snapshot
+        self.pending[seq] = snapshot
+        while len(self.pending) > self.MAX_PENDING:
+            del self.pending[min(self.pending)]
+
+    def acknowledge(self, seq: int) -> bool:
+        snapshot = self.pending.get(seq)
+        if snapshot is None:
+            return False
+        self.acked_seq = seq
+        self.acked = snapshot
+        self.pending = {s: snap for s, snap in self.pending.items() if s > seq}
+        return True
+
+
+class MonitorBroadcaster:
+    """Push monitor snapshots to subscribed WebSocket clients.
+
+    The sampler runs only while someone is subscribed. Every message carries a
+    sequence number and, once the client has acknowledged an earlier message,
+    only the fields that changed since that acknowledged snapshot (``base``),
+    plus the paths of keys that were dropped (``removed``). Clients that never
+    acknowledge keep receiving full snapshots, but only when something changed.
+    """
+
+    def __init__(
+        self,
+        sampler: Callable[[], Awaitable[Dict[str, Any]]],
+        min_interval: float = 2.0,
+        max_interval: float = 30.0,
+        backoff_factor: float = 1.5,
+        message_type: str = "monitor_update",
+        name: str = "monitor",
+    ):
+        self._sampler = sampler
+        self._interval = AdaptiveInterval(min_interval, max_interval, backoff_factor)
+        self._message_type = message_type
+        self._name = name
+        self._clients: Dict[Any, _ClientState] = {}
+        self._last_snapshot: Optional[Dict[str, Any]] = None
+        self._seq = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._clients)
+
+    @property
+    def interval(self) -> float:
+        return self._interval.current
+
+    def subscribe(self, connection: Any) -> None:
+        """Register a client and make sure it gets a full snapshot right away"""
+        self._clients[connection] = _ClientState()
+        WS_CONNECTIONS.set(len(self._clients), self._name)
+        self._interval.reset()
+        self._ensure_running()
+        self._wake()
+
+    def unsubscribe(self, connection: Any) -> None:
+        """Forget a client; the sampler pauses once nobody is left"""
+        self._clients.pop(connection, None)
+        WS_CONNECTIONS.set(len(self._clients), self._name)
+
+    def acknowledge(self, connection: Any, seq: int) -> None:
+        """Mark a snapshot as applied by the client, making it the next delta base"""
+        state = self._clients.get(connection)
+        if state is not None and not state.acknowledge(seq):
+            logger.debug(f"Ignoring ack for unknown monitor snapshot {seq}")
+
+    def refresh(self) -> None:
+        """Sample and publish now instead of waiting for the next interval"""
+        if self._clients:
+            self._interval.reset()
+            self._wake()
+
+    async def stop(self) -> None:
+        """Cancel the broadcast loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _ensure_running(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        logger.info("Monitor broadcast loop started")
+        assert self._wakeup is not None
+        while True:
+            if not self._clients:
+                logger.debug("No monitor subscribers, pausing broadcast loop")
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            try:
+                snapshot = await self._sampler()
+                if snapshot != self._last_snapshot:
+                    self._interval.reset()
+                else:
+                    self._interval.backoff()
+                self._last_snapshot = snapshot
+                await self._publish(snapshot)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Error in monitor broadcast: {e}")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=self._interval.current,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _publish(self, snapshot: Dict[str, Any]) -> None:
+        for connection, state in list(self._clients.items()):
+            if state.last_sent == snapshot:
+                continue
+
+            self._seq += 1
+            update: Dict[str, Any] = {"type": self._message_type, "seq": self._seq}
+            if state.acked is None:
+                update.update(base=None, data=snapshot)
+            else:
+                update.update(
+                    base=state.acked_seq,
+                    data=compute_delta(state.acked, snapshot),
+                )
+                removed = removed_keys(state.acked, snapshot)
+                if removed:
+                    update["removed"] = removed
+            message = json.dumps(update, separators=(",", ":"))
+            try:
+                await connection.send_text(message)
+                state.remember(self._seq, snapshot)
+                WS_MESSAGES_SENT.inc(self._name)
+                WS_BYTES_SENT.inc(self._name, amount=len(message))
+            except Exception as e:
+                logger.warning(f"Dropping monitor client after send error: {e}")
+                WS_DROPPED.inc(self._name)
+                self.unsubscribe(connection)
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import re
+from typing import Any, Awaitable, Callable, ClassVar, List, Optional, Sequence, Union
+
+from pydantic import BaseModel
+
+from .services.network_service import NetworkManagerUnavailable, get_networkmanager
+
+logger = logging.getLogger(__name__)
+
+MONITOR_COMMAND = ("nmcli", "monitor")
+
+# "Home: connection profile created", "wlan0: connected", ...
+_CONNECTION_RE = re.compile(
+    r"^(?P<subject>.+): connection profile (?P<action>created|changed|removed)$",
+)
+_SUBJECT_RE = re.compile(r"^(?P<subject>[^:]+): (?P<action>.+)$")
+
+
+class NetworkEvent(BaseModel):
+    kind: str  # "connection" for saved profiles, "device" or "other"
+    subject: Optional[str] = None
+    action: str
+
+
+def parse_event(line: str) -> NetworkEvent:
+    """Turn one line of nmcli monitor output into an event"""
+    line = line.strip()
+    match = _CONNECTION_RE.match(line)
+    if match:
+        return NetworkEvent(kind="connection", **match.groupdict())
+    match = _SUBJECT_RE.match(line)
+    if match:
+        return NetworkEvent(kind="device", **match.groupdict())
+    return NetworkEvent(kind="other", action=line)
+
+
+Listener = Callable[[NetworkEvent], Union[None, Awaitable[None]]]
+
+
+class NetworkEventMonitor:
+    """Follows NetworkManager events, over D-Bus or through nmcli monitor.
+
+    Listeners are called with each event, coroutine listeners are awaited.
+    D-Bus signals are used where the bus is available, a long-running
+    nmcli monitor otherwise. Either is restarted with a growing delay if it
+    ends, so events resume after NetworkManager restarts.
+    """
+
+    _instance: ClassVar[Optional["NetworkEventMonitor"]] = None
+
+    def __init__(
+        self,
+        command: Sequence[str] = MONITOR_COMMAND,
+        min_restart_delay: float = 1.0,
+        max_restart_delay: float = 60.0,
+    ):
+        self._command = list(command)
+        self._min_restart_delay = min_restart_delay
+        self._max_restart_delay = max_restart_delay
+        self._listeners: List[Listener] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get_instance(cls) -> "NetworkEventMonitor":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(self, listener: Listener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def dispatch(self, event: NetworkEvent) -> None:
+        for listener in list(self._listeners):
+            try:
+                result = listener(event)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Network event listener failed: {e}")
+
+    async def _follow_signals(self, service: Any) -> None:
+        service.subscribe(self.dispatch)
+        try:
+            await service.follow()
+        finally:
+            service.unsubscribe(self.dispatch)
+
+    async def _follow(self) -> None:
+        process = await asyncio.create_subprocess_exec(
+            *self._command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            async for raw in process.stdout:
+                line = raw.decode(errors="replace").strip()
+                if line:
+                    logger.debug("Network event: %s", line)
+                    await self.dispatch(parse_event(line))
+        finally:
+            if process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+            await process.wait()
+
+    async def _run(self) -> None:
+        delay = self._min_restart_delay
+        while True:
+            service = get_networkmanager()
+            try:
+                if service is not None:
+                    await self._follow_signals(service)
+                    logger.warning("D-Bus connection closed, reconnecting")
+                else:
+                    await self._follow()
+                    logger.warning("nmcli monitor exited, restarting")
+            except NetworkManagerUnavailable as e:
+                logger.info(f"NetworkManager not on D-Bus ({e}), using nmcli monitor")
+                continue
+            except FileNotFoundError:
+                logger.warning("nmcli not found, network events unavailable")
+                return
+            except OSError as e:
+                logger.warning(f"Can't follow network events: {e}")
+            # Anything may have changed while no events were seen
+            await self.dispatch(NetworkEvent(kind="other", action="restart"))
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_restart_delay)
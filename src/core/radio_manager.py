@@ -1,12 +1,14 @@
 import asyncio
 import logging
-import subprocess
 from typing import Any, Callable, ClassVar, Dict, Optional
 from unittest.mock import AsyncMock
 
 import httpx
 
 from config.config import settings
+from src.core.command_executor import run_command
+from src.core.connectivity_monitor import ConnectivityMonitor
+from src.core.metrics import REGISTRY
 from src.core.mode_manager import ModeManagerSingleton, NetworkMode
 from src.core.models import RadioStation, Station, SystemStatus
 from src.core.sound_manager import SoundManager, SystemEvent
@@ -22,6 +24,27 @@ press_count: Dict[int, int] = {}
 stations: Dict[int, Station] = {}
 monitor_tasks: Dict[str, asyncio.Task] = {}
 
+PLAYBACK_STARTS = REGISTRY.counter(
+    "radio_playback_starts_total",
+    "Stations started, by slot",
+    ("slot",),
+)
+PLAYBACK_STOPS = REGISTRY.counter("radio_playback_stops_total", "Playback stops")
+STREAM_START_SECONDS = REGISTRY.histogram(
+    "radio_stream_start_seconds",
+    "Time spent handing a stream URL to the player",
+)
+BUTTON_PRESSES = REGISTRY.counter(
+    "radio_button_presses_total",
+    "Station button presses, by button",
+    ("button",),
+)
+PLAYING = REGISTRY.gauge("radio_playing", "1 while a station is playing")
+VOLUME = REGISTRY.gauge("radio_volume", "Current UI volume (0-100)")
+
+# Seconds the reset script may take
+RESET_TIMEOUT = 300
+
 
 class RadioManager:
     _instance: ClassVar[Optional["RadioManager"]] = (
@@ -64,7 +87,7 @@ class RadioManager:
         try:
             # Check if we're in client mode and have network
             mode_manager = ModeManagerSingleton.get_instance()
-            current_mode = mode_manager.detect_current_mode()
+            current_mode = await mode_manager.detect_current_mode()
 
             if current_mode == NetworkMode.CLIENT:
                 # Check network connectivity
@@ -102,17 +125,21 @@ class RadioManager:
 
     async def _handle_button_press(self, button: int) -> None:
         """Handle button press events."""
-        logger.info(f"Button press handler called for button {button}")
-        logger.info(
-            f"Current state - playing: {self._status.is_playing}, station: {self._status.current_station}",
+        BUTTON_PRESSES.inc(button)
+        logger.debug(
+            "Button %s pressed - playing: %s, station: %s",
+            button,
+            self._status.is_playing,
+            self._status.current_station,
         )
 
         if button in [1, 2, 3]:
             try:
-                logger.info(f"Attempting to toggle station {button}")
                 result = await self.toggle_station(button)
                 logger.info(
-                    f"Toggle result for station {button}: {'playing' if result else 'stopped'}",
+                    "Toggled station %s: %s",
+                    button,
+                    "playing" if result else "stopped",
                 )
             except Exception as e:
                 logger.error(f"Error in button press handler: {e}")
@@ -123,9 +150,12 @@ class RadioManager:
         """Play a station and update status"""
         if slot in self._station_manager.get_all_stations():
             station = self._station_manager.get_all_stations()[slot]
-            await self._player.play_stream(station.url)
+            with STREAM_START_SECONDS.time():
+                await self._player.play_stream(station.url)
             self._status.current_station = slot
             self._status.is_playing = True
+            PLAYBACK_STARTS.inc(slot)
+            PLAYING.set(1)
             await self._broadcast_status()
 
     async def stop_playback(self) -> None:
@@ -133,6 +163,8 @@ class RadioManager:
         await self._player.stop_stream()
         self._status.is_playing = False
         self._status.current_station = None
+        PLAYBACK_STOPS.inc()
+        PLAYING.set(0)
         await self._broadcast_status()
 
     def get_status(self) -> SystemStatus:
@@ -154,6 +186,7 @@ class RadioManager:
 
             # Store the UI volume in status
             self._status.volume = ui_volume
+            VOLUME.set(ui_volume)
 
             logger.info(
                 f"Volume set successfully - UI: {ui_volume}%, System: {system_volume}%",
@@ -253,7 +286,9 @@ class RadioManager:
                 await self.stop_playback()
                 await self._broadcast_status()
                 # Initiate reboot
-                subprocess.run(["sudo", "reboot"], check=True)
+                result = await run_command(["sudo", "reboot"])
+                if result.returncode != 0:
+                    raise RuntimeError(result.stderr.strip())
         except Exception as e:
             logger.error(f"Error in triple press handler: {e}")
 
@@ -268,20 +303,26 @@ class RadioManager:
 
             # Run reset script
             logger.info("Running reset_radio.sh")
-            subprocess.run(["/home/radio/radio/install/reset_radio.sh"], check=True)
+            result = await run_command(
+                ["/home/radio/radio/install/reset_radio.sh"],
+                timeout=RESET_TIMEOUT,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"reset_radio.sh failed: {result.stderr.strip()}")
 
             # Restart radio service
             logger.info("Restarting radio service")
-            subprocess.run(["sudo", "systemctl", "restart", "radio"], check=True)
+            result = await run_command(["sudo", "systemctl", "restart", "radio"])
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip())
 
         except Exception as e:
             logger.error(f"Error handling reset sequence: {e}")
 
     async def _check_network(self) -> bool:
-        """Check network connectivity using WiFiManager"""
+        """Check network connectivity using the shared connectivity monitor"""
         try:
-            status = self._wifi_manager.get_current_status()
-            return status.has_internet
+            return (await ConnectivityMonitor.get_instance().ensure()).online
         except Exception as e:
             logger.error(f"Network check failed: {e}")
             return False
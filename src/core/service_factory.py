@@ -64,14 +64,9 @@ class ServiceFactory:
         else:
             logger.info(f"Using real {service_type} service")
             if service_type == "network":
-                from src.mocks.network_mocks import MockNetworkManagerService
-
-                class NetworkManager(MockNetworkManagerService):
-                    def __init__(self):
-                        super().__init__()
-                        self.logger = logging.getLogger(__name__)
+                from src.core.services.network_service import get_network_service
 
-                return NetworkManager()
+                return get_network_service()
             elif service_type == "gpio":
                 from src.hardware.gpio_controller import GPIOController
 
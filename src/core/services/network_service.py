@@ -1,10 +1,32 @@
 import logging
 import os
-from typing import Any
+from typing import Any, Optional
+
+from config.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class NetworkManagerUnavailable(Exception):
+    """NetworkManager can't be reached over D-Bus, nmcli has to do"""
+
+
+def get_networkmanager() -> Optional[Any]:
+    """The NetworkManager D-Bus service, or None to use nmcli instead.
+
+    None with mock services, without dbus-next, when disabled in settings
+    and for NETWORK_DBUS_RETRY seconds after the bus couldn't be reached.
+    """
+    if not settings.NETWORK_DBUS_ENABLED or os.getenv("MOCK_SERVICES") == "true":
+        return None
+    try:
+        from .networkmanager import NetworkManagerService
+    except ImportError:
+        return None
+    service = NetworkManagerService.get_instance()
+    return service if service.available else None
+
+
 def get_network_service() -> Any:
     """Factory function to get the appropriate network service"""
     if os.getenv("MOCK_SERVICES") == "true":
@@ -13,7 +35,15 @@ def get_network_service() -> Any:
 
         return MockNetworkManagerService()
 
-    # Use NetworkManager directly when not in mock mode
+    # Talk to NetworkManager over D-Bus when dbus-next is installed
+    try:
+        from .networkmanager import NetworkManagerService
+    except ImportError as e:
+        logger.warning(f"NetworkManager D-Bus backend unavailable ({e})")
+    else:
+        logger.info("Using NetworkManager D-Bus service")
+        return NetworkManagerService.get_instance()
+
     logger.info("Using real NetworkManager service")
     from src.mocks.network_mocks import (  # Use mock for now as base class
         MockNetworkManagerService,
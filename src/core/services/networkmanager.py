@@ -0,0 +1,655 @@
+import asyncio
+import logging
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Container,
+    Dict,
+    List,
+    Optional,
+    Union,
+)
+
+from dbus_next import BusType, Variant
+from dbus_next.aio import MessageBus, ProxyInterface
+from dbus_next.constants import ErrorType
+from dbus_next.errors import AuthError, DBusError, InvalidAddressError
+
+from config.config import settings
+from src.utils.nmcli_parser import DeviceState
+
+from ..connection_inventory import SavedConnection
+from ..models import WiFiNetwork
+from ..network_events import NetworkEvent
+from .network_service import NetworkManagerUnavailable
+
+logger = logging.getLogger(__name__)
+
+NM_BUS = "org.freedesktop.NetworkManager"
+NM_PATH = "/org/freedesktop/NetworkManager"
+SETTINGS_PATH = "/org/freedesktop/NetworkManager/Settings"
+
+NM_IFACE = NM_BUS
+DEVICE_IFACE = f"{NM_BUS}.Device"
+WIRELESS_IFACE = f"{NM_BUS}.Device.Wireless"
+ACCESS_POINT_IFACE = f"{NM_BUS}.AccessPoint"
+SETTINGS_IFACE = f"{NM_BUS}.Settings"
+CONNECTION_IFACE = f"{NM_BUS}.Settings.Connection"
+ACTIVE_IFACE = f"{NM_BUS}.Connection.Active"
+PROPERTIES_IFACE = "org.freedesktop.DBus.Properties"
+
+NO_OBJECT = "/"
+HOTSPOT_NAME = "Hotspot"  # Same profile name as nmcli device wifi hotspot
+
+# Device states and types, named the way nmcli prints them
+DEVICE_STATES = {
+    0: "unknown",
+    10: "unmanaged",
+    20: "unavailable",
+    30: "disconnected",
+    40: "connecting (prepare)",
+    50: "connecting (configuring)",
+    60: "connecting (need authentication)",
+    70: "connecting (getting IP configuration)",
+    80: "connecting (checking IP connectivity)",
+    90: "connecting (starting secondary connections)",
+    100: "connected",
+    110: "deactivating",
+    120: "connection failed",
+}
+DEVICE_TYPES = {1: "ethernet", 2: "wifi", 14: "generic", 32: "loopback"}
+CONNECTIVITY_STATES = {0: "unknown", 1: "none", 2: "portal", 3: "limited", 4: "full"}
+
+WIFI_MODE_AP = 3
+
+# Active connection states
+ACTIVE_STATE_ACTIVATED = 2
+ACTIVE_STATE_DEACTIVATED = 4
+
+ACTIVATION_TIMEOUT = 30.0  # Seconds for a connection to come up, like nmcli's
+SCAN_TIMEOUT = 10.0  # Seconds to wait for a requested scan to finish
+POLL_INTERVAL = 0.25  # Seconds between state reads while waiting
+
+# Access point capability and security flags
+AP_FLAGS_PRIVACY = 0x1
+AP_SEC_KEY_MGMT_PSK = 0x100
+AP_SEC_KEY_MGMT_8021X = 0x200
+AP_SEC_KEY_MGMT_SAE = 0x400
+
+Listener = Callable[[NetworkEvent], Union[None, Awaitable[None]]]
+ConnectionSettings = Dict[str, Dict[str, Variant]]
+
+
+def decode_ssid(raw: bytes) -> str:
+    return bytes(raw).decode("utf-8", errors="replace")
+
+
+def ap_security(flags: int, wpa_flags: int, rsn_flags: int) -> Optional[str]:
+    """Describe access point security like nmcli's SECURITY column"""
+    parts = []
+    if flags & AP_FLAGS_PRIVACY and not wpa_flags and not rsn_flags:
+        parts.append("WEP")
+    if wpa_flags:
+        parts.append("WPA1")
+    if rsn_flags & (AP_SEC_KEY_MGMT_PSK | AP_SEC_KEY_MGMT_8021X):
+        parts.append("WPA2")
+    if rsn_flags & AP_SEC_KEY_MGMT_SAE:
+        parts.append("WPA3")
+    if (wpa_flags | rsn_flags) & AP_SEC_KEY_MGMT_8021X:
+        parts.append("802.1X")
+    return " ".join(parts) or None
+
+
+def wifi_settings(
+    ssid: str,
+    password: Optional[str] = None,
+    name: Optional[str] = None,
+) -> ConnectionSettings:
+    """Settings for a new WiFi client profile"""
+    connection: ConnectionSettings = {
+        "connection": {
+            "id": Variant("s", name or ssid),
+            "type": Variant("s", "802-11-wireless"),
+        },
+        "802-11-wireless": {
+            "ssid": Variant("ay", ssid.encode()),
+            "mode": Variant("s", "infrastructure"),
+        },
+    }
+    if password:
+        connection["802-11-wireless-security"] = {
+            "key-mgmt": Variant("s", "wpa-psk"),
+            "psk": Variant("s", password),
+        }
+    return connection
+
+
+def client_settings(
+    ssid: str,
+    password: str,
+    priority: int,
+) -> ConnectionSettings:
+    """Settings for a saved profile that connects on its own when in range"""
+    connection = wifi_settings(ssid, password)
+    connection["connection"].update(
+        {
+            "autoconnect": Variant("b", True),
+            "autoconnect-priority": Variant("i", priority),
+        },
+    )
+    return connection
+
+
+def hotspot_settings(ssid: str, password: Optional[str] = None) -> ConnectionSettings:
+    """Settings for an access point sharing this device's connection"""
+    connection = wifi_settings(ssid, password, name=HOTSPOT_NAME)
+    connection["connection"]["autoconnect"] = Variant("b", False)
+    connection["802-11-wireless"].update(
+        {
+            "mode": Variant("s", "ap"),
+            "band": Variant("s", settings.AP_BAND),
+            "channel": Variant("u", settings.AP_CHANNEL),
+        },
+    )
+    connection["ipv4"] = {"method": Variant("s", "shared")}
+    return connection
+
+
+def saved_connection(values: Dict[str, Dict[str, Variant]]) -> SavedConnection:
+    """Turn GetSettings output into the inventory's SavedConnection"""
+    connection = values.get("connection", {})
+    wireless = values.get("802-11-wireless", {})
+    ssid = wireless.get("ssid")
+    return SavedConnection(
+        name=connection["id"].value,
+        uuid=connection["uuid"].value,
+        type=connection["type"].value,
+        ssid=decode_ssid(ssid.value) if ssid is not None else None,
+    )
+
+
+class NetworkManagerService:
+    """NetworkManager over D-Bus, without nmcli processes or sudo.
+
+    The bus connection (system bus, or ``bus_address`` for a test bus) is
+    opened on first use and kept. Proxies reuse one introspection per
+    interface. Device, saved connection and connectivity signals reach
+    subscribers as NetworkEvents, like those of ``nmcli monitor``.
+
+    If the bus or NetworkManager on it can't be reached, calls raise
+    NetworkManagerUnavailable and ``available`` is False for
+    NETWORK_DBUS_RETRY seconds, so callers use nmcli meanwhile.
+    """
+
+    _instance: ClassVar[Optional["NetworkManagerService"]] = None
+
+    def __init__(self, interface: str = "wlan0", bus_address: Optional[str] = None):
+        self._interface = interface
+        self._bus_address = bus_address
+        self._bus: Optional[MessageBus] = None
+        self._lock = asyncio.Lock()
+        self._introspection: Dict[str, Any] = {}
+        self._device_path: Optional[str] = None
+        self._listeners: List[Listener] = []
+        self._retry_at = 0.0
+
+    @classmethod
+    def get_instance(cls) -> "NetworkManagerService":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def available(self) -> bool:
+        """False while a recently failed connection attempt is not retried"""
+        return time.monotonic() >= self._retry_at
+
+    def subscribe(self, listener: Listener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def close(self) -> None:
+        if self._bus is not None:
+            self._bus.disconnect()
+            self._bus = None
+
+    async def _connect(self) -> MessageBus:
+        async with self._lock:
+            if self._bus is None or not self._bus.connected:
+                self._introspection.clear()
+                self._device_path = None
+                try:
+                    self._bus = await self._open()
+                except (OSError, AuthError, InvalidAddressError, DBusError) as e:
+                    self._retry_at = time.monotonic() + settings.NETWORK_DBUS_RETRY
+                    raise NetworkManagerUnavailable(str(e)) from e
+            return self._bus
+
+    async def _open(self) -> MessageBus:
+        if self._bus_address:
+            bus = MessageBus(bus_address=self._bus_address)
+        else:
+            bus = MessageBus(bus_type=BusType.SYSTEM)
+        await bus.connect()
+        try:
+            await self._watch(bus)
+        except DBusError as e:
+            if e.type == ErrorType.SERVICE_UNKNOWN.value:
+                # The bus is up but NetworkManager isn't on it
+                bus.disconnect()
+                raise
+            logger.warning(f"Not following NetworkManager signals: {e}")
+        return bus
+
+    async def follow(self) -> None:
+        """Keep the bus open for signals, returns once it has closed"""
+        bus = await self._connect()
+        try:
+            await bus.wait_for_disconnect()
+        except Exception as e:
+            logger.warning(f"D-Bus connection lost: {e}")
+
+    async def _proxy(self, bus: MessageBus, path: str, name: str) -> ProxyInterface:
+        introspection = self._introspection.get(name)
+        if introspection is None:
+            introspection = await bus.introspect(NM_BUS, path)
+            self._introspection[name] = introspection
+        return bus.get_proxy_object(NM_BUS, path, introspection).get_interface(name)
+
+    async def _get_interface(self, path: str, name: str) -> ProxyInterface:
+        return await self._proxy(await self._connect(), path, name)
+
+    async def _properties(self, path: str, name: str) -> Dict[str, Any]:
+        """All properties of one interface in a single call"""
+        properties = await self._get_interface(path, PROPERTIES_IFACE)
+        values = await properties.call_get_all(name)
+        return {key: variant.value for key, variant in values.items()}
+
+    async def _device(self) -> str:
+        if self._device_path is None:
+            manager = await self._get_interface(NM_PATH, NM_IFACE)
+            self._device_path = await manager.call_get_device_by_ip_iface(
+                self._interface,
+            )
+        return self._device_path
+
+    async def _watch(self, bus: MessageBus) -> None:
+        manager = await self._proxy(bus, NM_PATH, PROPERTIES_IFACE)
+        manager.on_properties_changed(self._on_manager_changed)
+
+        stored = await self._proxy(bus, SETTINGS_PATH, SETTINGS_IFACE)
+        stored.on_new_connection(
+            lambda path: self._emit("connection", path, "created"),
+        )
+        stored.on_connection_removed(
+            lambda path: self._emit("connection", path, "removed"),
+        )
+
+        root = await self._proxy(bus, NM_PATH, NM_IFACE)
+        self._device_path = await root.call_get_device_by_ip_iface(self._interface)
+        device = await self._proxy(bus, self._device_path, DEVICE_IFACE)
+        device.on_state_changed(
+            lambda new, old, reason: self._emit(
+                "device",
+                self._interface,
+                DEVICE_STATES.get(new, "unknown"),
+            ),
+        )
+
+    def _on_manager_changed(
+        self,
+        interface: str,
+        changed: Dict[str, Variant],
+        invalidated: List[str],
+    ) -> None:
+        if interface == NM_IFACE and "Connectivity" in changed:
+            state = CONNECTIVITY_STATES.get(changed["Connectivity"].value, "unknown")
+            self._emit("other", None, f"Connectivity is now '{state}'")
+
+    def _emit(self, kind: str, subject: Optional[str], action: str) -> None:
+        event = NetworkEvent(kind=kind, subject=subject, action=action)
+        asyncio.ensure_future(self.dispatch(event))
+
+    async def dispatch(self, event: NetworkEvent) -> None:
+        for listener in list(self._listeners):
+            try:
+                result = listener(event)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Network event listener failed: {e}")
+
+    async def connectivity(self) -> str:
+        """NetworkManager's last connectivity result (full, limited, ...)"""
+        manager = await self._properties(NM_PATH, NM_IFACE)
+        return CONNECTIVITY_STATES.get(manager.get("Connectivity", 0), "unknown")
+
+    async def check_connectivity(self) -> str:
+        """Have NetworkManager check connectivity now and return the result"""
+        manager = await self._get_interface(NM_PATH, NM_IFACE)
+        return CONNECTIVITY_STATES.get(
+            await manager.call_check_connectivity(), "unknown"
+        )
+
+    async def get_device_state(self) -> DeviceState:
+        device = await self._properties(await self._device(), DEVICE_IFACE)
+        state = device.get("State")
+        connection = None
+        active = device.get("ActiveConnection", NO_OBJECT)
+        if active != NO_OBJECT:
+            connection = (await self._properties(active, ACTIVE_IFACE)).get("Id")
+        return DeviceState(
+            device=device.get("Interface"),
+            type=DEVICE_TYPES.get(device.get("DeviceType")),
+            state=state,
+            state_text=DEVICE_STATES.get(state),
+            connection=connection,
+        )
+
+    async def request_scan(self) -> None:
+        wireless = await self._get_interface(await self._device(), WIRELESS_IFACE)
+        await wireless.call_request_scan({})
+
+    async def scan(self, saved: Container[str] = frozenset()) -> List[WiFiNetwork]:
+        """Rescan and return the networks once the scan has finished"""
+        wireless = await self._get_interface(await self._device(), WIRELESS_IFACE)
+        last_scan = await wireless.get_last_scan()
+        try:
+            await wireless.call_request_scan({})
+        except DBusError as e:
+            # E.g. right after another scan, whose results are fresh anyway
+            logger.debug(f"Scan not started: {e}")
+        else:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + SCAN_TIMEOUT
+            while await wireless.get_last_scan() == last_scan:
+                if loop.time() >= deadline:
+                    logger.warning("Scan didn't finish in time")
+                    break
+                await asyncio.sleep(POLL_INTERVAL)
+        return await self.get_access_points(saved)
+
+    async def get_access_points(
+        self,
+        saved: Container[str] = frozenset(),
+    ) -> List[WiFiNetwork]:
+        """Networks the device currently sees, hidden ones left out"""
+        path = await self._device()
+        wireless = await self._get_interface(path, WIRELESS_IFACE)
+        access_points = await wireless.call_get_all_access_points()
+        active = await wireless.get_active_access_point()
+        # Access points can disappear between the listing and the read
+        results = await asyncio.gather(
+            *(self._properties(ap, ACCESS_POINT_IFACE) for ap in access_points),
+            return_exceptions=True,
+        )
+
+        networks = []
+        for ap, properties in zip(access_points, results):
+            if isinstance(properties, Exception):
+                logger.debug(f"Skipping access point {ap}: {properties}")
+                continue
+            ssid = decode_ssid(properties.get("Ssid", b""))
+            if not ssid:  # Hidden networks
+                continue
+            networks.append(
+                WiFiNetwork(
+                    ssid=ssid,
+                    signal_strength=properties.get("Strength", 0),
+                    security=ap_security(
+                        properties.get("Flags", 0),
+                        properties.get("WpaFlags", 0),
+                        properties.get("RsnFlags", 0),
+                    ),
+                    in_use=ap == active,
+                    saved=ssid in saved,
+                ),
+            )
+        return networks
+
+    async def list_connections(self) -> List[SavedConnection]:
+        """Saved connection profiles with their SSIDs"""
+        stored = await self._get_interface(SETTINGS_PATH, SETTINGS_IFACE)
+        paths = await stored.call_list_connections()
+        results = await asyncio.gather(
+            *(self._connection_settings(path) for path in paths),
+            return_exceptions=True,
+        )
+
+        connections = []
+        for path, values in zip(paths, results):
+            if isinstance(values, Exception):
+                logger.debug(f"Skipping connection {path}: {values}")
+                continue
+            connections.append(saved_connection(values))
+        return connections
+
+    async def _connection_settings(self, path: str) -> Dict[str, Dict[str, Variant]]:
+        connection = await self._get_interface(path, CONNECTION_IFACE)
+        return await connection.call_get_settings()
+
+    async def _wait_activated(self, active: str, timeout: float) -> bool:
+        """Wait for an activation to finish, False if it failed or timed out"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            try:
+                state = (await self._properties(active, ACTIVE_IFACE)).get("State")
+            except DBusError:
+                # NetworkManager drops the active connection once it has failed
+                return False
+            if state == ACTIVE_STATE_ACTIVATED:
+                return True
+            if state == ACTIVE_STATE_DEACTIVATED or loop.time() >= deadline:
+                return False
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def activate(self, uuid: str, timeout: float = ACTIVATION_TIMEOUT) -> bool:
+        """Bring up a saved connection on the device and wait until it's up"""
+        try:
+            stored = await self._get_interface(SETTINGS_PATH, SETTINGS_IFACE)
+            connection = await stored.call_get_connection_by_uuid(uuid)
+            manager = await self._get_interface(NM_PATH, NM_IFACE)
+            active = await manager.call_activate_connection(
+                connection,
+                await self._device(),
+                NO_OBJECT,
+            )
+            return await self._wait_activated(active, timeout)
+        except DBusError as e:
+            logger.error(f"Failed to activate connection {uuid}: {e}")
+            return False
+
+    async def connect_device(self) -> bool:
+        """Let NetworkManager pick a connection for the device, without waiting"""
+        try:
+            manager = await self._get_interface(NM_PATH, NM_IFACE)
+            await manager.call_activate_connection(
+                NO_OBJECT,
+                await self._device(),
+                NO_OBJECT,
+            )
+            return True
+        except DBusError as e:
+            logger.error(f"Failed to connect {self._interface}: {e}")
+            return False
+
+    async def prepare_device(self) -> None:
+        """Have the device managed and the WiFi radio switched on"""
+        device = await self._get_interface(await self._device(), DEVICE_IFACE)
+        manager = await self._get_interface(NM_PATH, NM_IFACE)
+        await asyncio.gather(
+            device.set_managed(True),
+            manager.set_wireless_enabled(True),
+        )
+
+    async def delete_connection(self, uuid: str) -> bool:
+        try:
+            stored = await self._get_interface(SETTINGS_PATH, SETTINGS_IFACE)
+            path = await stored.call_get_connection_by_uuid(uuid)
+            connection = await self._get_interface(path, CONNECTION_IFACE)
+            await connection.call_delete()
+            return True
+        except DBusError as e:
+            logger.error(f"Failed to delete connection {uuid}: {e}")
+            return False
+
+    async def delete_connections(self, name: str) -> bool:
+        """Delete every saved profile called name, False if there was none"""
+        try:
+            connections = await self.list_connections()
+        except DBusError as e:
+            logger.error(f"Failed to list connections: {e}")
+            return False
+        deleted = False
+        for connection in connections:
+            if connection.name == name:
+                deleted = await self.delete_connection(connection.uuid) or deleted
+        return deleted
+
+    async def add_connection(
+        self,
+        ssid: str,
+        password: str,
+        priority: int = 0,
+    ) -> bool:
+        """Save a profile for a network without connecting, replacing older ones"""
+        await self.delete_connections(ssid)
+        try:
+            stored = await self._get_interface(SETTINGS_PATH, SETTINGS_IFACE)
+            await stored.call_add_connection(client_settings(ssid, password, priority))
+            return True
+        except DBusError as e:
+            logger.error(f"Failed to add connection {ssid}: {e}")
+            return False
+
+    async def update_connection(
+        self,
+        name: str,
+        password: str,
+        priority: int = 0,
+    ) -> Optional[bool]:
+        """Set a saved profile's password and priority, None if it doesn't exist"""
+        try:
+            saved = [c for c in await self.list_connections() if c.name == name]
+            if not saved:
+                return None
+            stored = await self._get_interface(SETTINGS_PATH, SETTINGS_IFACE)
+            path = await stored.call_get_connection_by_uuid(saved[0].uuid)
+            connection = await self._get_interface(path, CONNECTION_IFACE)
+            values = await connection.call_get_settings()
+            values["connection"].update(
+                {
+                    "autoconnect": Variant("b", True),
+                    "autoconnect-priority": Variant("i", priority),
+                },
+            )
+            values.setdefault("802-11-wireless-security", {}).update(
+                {
+                    "key-mgmt": Variant("s", "wpa-psk"),
+                    "psk": Variant("s", password),
+                },
+            )
+            await connection.call_update(values)
+            return True
+        except DBusError as e:
+            logger.error(f"Failed to update connection {name}: {e}")
+            return False
+
+    async def _add_and_activate(
+        self,
+        connection: ConnectionSettings,
+        timeout: float = ACTIVATION_TIMEOUT,
+    ) -> bool:
+        try:
+            manager = await self._get_interface(NM_PATH, NM_IFACE)
+            _, active = await manager.call_add_and_activate_connection(
+                connection,
+                await self._device(),
+                NO_OBJECT,
+            )
+            return await self._wait_activated(active, timeout)
+        except DBusError as e:
+            logger.error(f"Failed to add connection: {e}")
+            return False
+
+    async def connect_to_wifi(self, ssid: str, password: Optional[str] = None) -> bool:
+        """Connect to a network, reusing its saved profile unless a password is given"""
+        try:
+            saved = [c for c in await self.list_connections() if c.ssid == ssid]
+        except DBusError as e:
+            logger.error(f"Failed to list connections: {e}")
+            return False
+
+        if saved and password is None:
+            return await self.activate(saved[0].uuid)
+        # A new password replaces the saved profile
+        for connection in saved:
+            await self.delete_connection(connection.uuid)
+        return await self._add_and_activate(wifi_settings(ssid, password))
+
+    async def disconnect_wifi(self) -> bool:
+        try:
+            device = await self._get_interface(await self._device(), DEVICE_IFACE)
+            await device.call_disconnect()
+            return True
+        except DBusError as e:
+            logger.error(f"Failed to disconnect {self._interface}: {e}")
+            return False
+
+    async def start_ap(self, ssid: str, password: Optional[str] = None) -> bool:
+        # Replace the profile of an earlier hotspot, as nmcli does
+        await self.delete_connections(HOTSPOT_NAME)
+        return await self._add_and_activate(hotspot_settings(ssid, password))
+
+    async def stop_ap(self) -> bool:
+        try:
+            path = await self._device()
+            wireless = await self._properties(path, WIRELESS_IFACE)
+            active = (await self._properties(path, DEVICE_IFACE)).get(
+                "ActiveConnection",
+                NO_OBJECT,
+            )
+            if wireless.get("Mode") != WIFI_MODE_AP or active == NO_OBJECT:
+                return True
+            manager = await self._get_interface(NM_PATH, NM_IFACE)
+            await manager.call_deactivate_connection(active)
+            return True
+        except DBusError as e:
+            logger.error(f"Failed to stop access point: {e}")
+            return False
+
+    async def ap_active(self) -> bool:
+        """Whether the device is up as an access point"""
+        state = await self.get_device_state()
+        wireless = await self._properties(await self._device(), WIRELESS_IFACE)
+        return state.connected and wireless.get("Mode") == WIFI_MODE_AP
+
+    async def get_wifi_status(self) -> dict:
+        """Same shape as the mock service's status"""
+        state = await self.get_device_state()
+        wireless = await self._properties(await self._device(), WIRELESS_IFACE)
+        ap_active = state.connected and wireless.get("Mode") == WIFI_MODE_AP
+
+        ssid, signal = None, None
+        active_ap = wireless.get("ActiveAccessPoint", NO_OBJECT)
+        if active_ap != NO_OBJECT:
+            ap = await self._properties(active_ap, ACCESS_POINT_IFACE)
+            ssid, signal = decode_ssid(ap.get("Ssid", b"")), ap.get("Strength")
+
+        connected = state.connected and not ap_active
+        return {
+            "connected": connected,
+            "current_ssid": ssid if connected else None,
+            "ap_active": ap_active,
+            "ap_ssid": (ssid or state.connection) if ap_active else None,
+            "signal_strength": signal if connected else None,
+            "has_internet": await self.connectivity() == "full",
+        }
@@ -0,0 +1,265 @@
+import hashlib
+import io
+import logging
+import mmap
+import struct
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from src.core.models import StationRecord
+from src.utils.atomic_write import atomic_open
+from src.utils.station_importer import iter_json_entries
+
+logger = logging.getLogger(__name__)
+
+# File layout (little endian):
+#   header      magic, format version, station count, content digest and the
+#               offsets of the three sections below
+#   records     one fixed-width record per station in id order: the id and an
+#               (offset, length) pair per text field into the string table
+#   name index  record numbers sorted by UTF-8 station name
+#   strings     UTF-8 strings, countries and locations stored once
+MAGIC = b"RSCB"
+FORMAT_VERSION = 1
+
+TEXT_FIELDS = ("name", "url", "country", "location")
+_SHARED = ("country", "location")
+
+# magic, version, reserved, count, digest, records, name index, strings
+_HEADER = struct.Struct("<4sHHI8sIII")
+# id, then offset and length for each text field
+_RECORD = struct.Struct("<I" + "II" * len(TEXT_FIELDS))
+_INDEX = struct.Struct("<I")
+_ID = struct.Struct("<I")
+
+# Offset marking a field without value
+_NONE = 0xFFFFFFFF
+
+
+class CatalogFormatError(Exception):
+    """Raised when a binary catalog file is not valid"""
+
+
+class _HashingReader(io.RawIOBase):
+    """Pass reads through while hashing the bytes"""
+
+    def __init__(self, raw, digest):
+        self._raw = raw
+        self._digest = digest
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._raw.readinto(buffer)
+        if count:
+            self._digest.update(memoryview(buffer)[:count])
+        return count
+
+
+def compile_catalog(
+    source: Union[str, Path],
+    target: Union[str, Path],
+) -> int:
+    """Compile a stations.json list into a binary catalog, returns the count.
+
+    Ids are the 1-based position in the source, like the JSON catalog.
+    Invalid entries are skipped. The source is streamed, so memory is
+    bounded by the compiled output. The target is replaced atomically.
+    """
+    strings = bytearray()
+    string_offsets: Dict[str, Tuple[int, int]] = {}
+
+    def add_string(value: Optional[str], shared: bool) -> Tuple[int, int]:
+        if value is None:
+            return _NONE, 0
+        # Only countries and locations repeat, names and urls are unique
+        if shared and value in string_offsets:
+            return string_offsets[value]
+        encoded = value.encode("utf-8")
+        offset = (len(strings), len(encoded))
+        strings.extend(encoded)
+        if shared:
+            string_offsets[value] = offset
+        return offset
+
+    records = bytearray()
+    names: List[Tuple[bytes, int]] = []
+    digest = hashlib.blake2b(digest_size=8)
+    with open(source, "rb") as raw:
+        text = io.TextIOWrapper(
+            io.BufferedReader(_HashingReader(raw, digest)),
+            encoding="utf-8",
+        )
+        for index, entry in enumerate(iter_json_entries(text), start=1):
+            try:
+                station = StationRecord.from_entry(index, entry)
+            except (AttributeError, ValueError) as e:
+                logger.warning(f"Skipping invalid station #{index}: {e}")
+                continue
+
+            fields: List[int] = []
+            for field in TEXT_FIELDS:
+                fields.extend(add_string(getattr(station, field), field in _SHARED))
+            names.append((station.name.encode("utf-8"), len(names)))
+            records.extend(_RECORD.pack(index, *fields))
+
+    count = len(names)
+    names.sort()
+    name_index = b"".join(_INDEX.pack(record) for _, record in names)
+
+    records_offset = _HEADER.size
+    index_offset = records_offset + len(records)
+    strings_offset = index_offset + len(name_index)
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        count,
+        digest.digest(),
+        records_offset,
+        index_offset,
+        strings_offset,
+    )
+
+    with atomic_open(target, "wb") as f:
+        f.write(header)
+        f.write(records)
+        f.write(name_index)
+        f.write(strings)
+
+    logger.info(f"Compiled {count} stations from {source} into {target}")
+    return count
+
+
+class BinaryCatalog(Mapping):
+    """Read-only id -> StationRecord mapping over a memory-mapped catalog.
+
+    Ids and names are found by binary search in the mapped file and a
+    station is only decoded when it is accessed, so startup time and
+    resident memory don't grow with the catalog.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                # Empty file
+                raise CatalogFormatError(f"{self.path}: {e}") from e
+
+        if len(self._data) < _HEADER.size:
+            raise CatalogFormatError(f"{self.path}: truncated header")
+        (
+            magic,
+            version,
+            _,
+            self._count,
+            digest,
+            self._records,
+            self._index,
+            self._strings,
+        ) = _HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise CatalogFormatError(f"{self.path}: not a version 1 station catalog")
+        if self._strings > len(self._data) or (
+            self._index - self._records != self._count * _RECORD.size
+        ):
+            raise CatalogFormatError(f"{self.path}: inconsistent section offsets")
+
+        self.digest = digest.hex()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _id_at(self, record: int) -> int:
+        return _ID.unpack_from(self._data, self._records + record * _RECORD.size)[0]
+
+    def _find(self, station_id: int) -> Optional[int]:
+        """Record number of an id, by binary search over the sorted ids"""
+        # Ids are positions in the source, usually without gaps
+        guess = station_id - 1
+        if 0 <= guess < self._count and self._id_at(guess) == station_id:
+            return guess
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._id_at(middle) < station_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._id_at(low) == station_id:
+            return low
+        return None
+
+    def _text(self, offset: int, length: int) -> Optional[str]:
+        if offset == _NONE:
+            return None
+        start = self._strings + offset
+        return self._data[start : start + length].decode("utf-8")
+
+    def _station(self, record: int) -> StationRecord:
+        values = _RECORD.unpack_from(self._data, self._records + record * _RECORD.size)
+        return StationRecord(
+            values[0],
+            *(
+                self._text(values[1 + 2 * i], values[2 + 2 * i])
+                for i in range(len(TEXT_FIELDS))
+            ),
+        )
+
+    def __getitem__(self, station_id: int) -> StationRecord:
+        record = self._find(station_id)
+        if record is None:
+            raise KeyError(station_id)
+        return self._station(record)
+
+    def __contains__(self, station_id: object) -> bool:
+        return isinstance(station_id, int) and self._find(station_id) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        for record in range(self._count):
+            yield self._id_at(record)
+
+    def by_name(self, name: str) -> Optional[StationRecord]:
+        """Find a station by exact name with a binary search of the name index"""
+        target = name.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._name_at(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        # Several stations can share a name; like the JSON catalog, the last wins
+        found = None
+        while low < self._count and self._name_at(low) == target:
+            found = _INDEX.unpack_from(self._data, self._index + low * _INDEX.size)[0]
+            low += 1
+        return None if found is None else self._station(found)
+
+    def _name_at(self, position: int) -> bytes:
+        record = _INDEX.unpack_from(self._data, self._index + position * _INDEX.size)[0]
+        offset, length = _RECORD.unpack_from(
+            self._data,
+            self._records + record * _RECORD.size,
+        )[1:3]
+        start = self._strings + offset
+        return self._data[start : start + length]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """python -m src.core.station_binary [source.json] [target.bin]"""
+    args = sys.argv[1:] if argv is None else argv
+    source = Path(args[0]) if args else Path("config/stations.json")
+    target = Path(args[1]) if len(args) > 1 else source.with_suffix(".bin")
+    logging.basicConfig(level=logging.INFO)
+    count = compile_catalog(source, target)
+    print(f"Wrote {count} stations to {target}")
+
+
+if __name__ == "__main__":
+    main()
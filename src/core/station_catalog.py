@@ -0,0 +1,251 @@
+import bisect
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from src.core.models import RadioStation, StationRecord
+from src.core.station_binary import BinaryCatalog, CatalogFormatError
+
+logger = logging.getLogger(__name__)
+
+FileStamp = Tuple[int, int, int]
+PageKey = Tuple[Optional[int], int, Optional[Tuple[str, ...]]]
+
+CATALOG_FILE = Path("config/stations.json")
+
+STATION_FIELDS = tuple(RadioStation.model_fields)
+
+# Encoded list pages kept per catalog version
+PAGE_CACHE_SIZE = 256
+
+
+def encode_json(content) -> bytes:
+    """Encode content the way FastAPI's JSONResponse would"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def serialize_stations(stations) -> bytes:
+    return encode_json([station.as_dict() for station in stations])
+
+
+class StationCatalog:
+    """In-memory index of all available stations.
+
+    The catalog file is parsed once and only reloaded when its mtime or size
+    changes (checked at most every check_interval seconds). Stations get
+    their 1-based position as id, lookups by id or name are dict hits and
+    the full list response is serialized once per reload. Pages of the
+    list are encoded on first request and cached until the next reload.
+
+    When a compiled binary catalog (stations.bin next to stations.json) is
+    at least as new as the JSON file, it is memory-mapped instead, and
+    stations are only decoded when accessed.
+    """
+
+    _instance: Optional["StationCatalog"] = None
+
+    def __init__(
+        self,
+        path: Union[str, Path] = CATALOG_FILE,
+        check_interval: float = 1.0,
+        binary_path: Optional[Union[str, Path]] = None,
+    ):
+        self.path = Path(path)
+        self.binary_path = (
+            Path(binary_path) if binary_path else self.path.with_suffix(".bin")
+        )
+        self._check_interval = check_interval
+        self._checked_at: Optional[float] = None
+        self._stamp: Optional[Tuple[Optional[FileStamp], Optional[FileStamp]]] = None
+        self._lock = threading.Lock()
+        self._stations: Mapping[int, StationRecord] = {}
+        self._ids: Optional[List[int]] = None
+        self._pages: "OrderedDict[PageKey, bytes]" = OrderedDict()
+        self._by_name: Optional[Dict[str, StationRecord]] = None
+        self._json: Optional[bytes] = None
+        self._version: Optional[str] = None
+
+    @classmethod
+    def get_instance(cls) -> "StationCatalog":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[FileStamp]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the catalog if the file changed, returns True if reloaded"""
+        now = time.monotonic()
+        if (
+            not force
+            and self._checked_at is not None
+            and now - self._checked_at < self._check_interval
+        ):
+            return False
+
+        with self._lock:
+            self._checked_at = now
+            json_stamp = self._stat(self.path)
+            binary_stamp = self._stat(self.binary_path)
+            stamp = (json_stamp, binary_stamp)
+            if stamp == self._stamp and not force:
+                return False
+            self._stamp = stamp
+
+            if binary_stamp and (
+                json_stamp is None or binary_stamp[0] >= json_stamp[0]
+            ):
+                try:
+                    catalog = BinaryCatalog(self.binary_path)
+                except (OSError, CatalogFormatError) as e:
+                    logger.error(f"Error loading {self.binary_path}: {e!s}")
+                else:
+                    self._replace(catalog, version=catalog.digest)
+                    logger.info(
+                        f"Mapped {len(catalog)} stations from {self.binary_path}",
+                    )
+                    return True
+
+            if json_stamp is None:
+                logger.error(f"Station catalog {self.path} not found")
+                self._replace({})
+                return False
+
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    entries = json.load(f)
+            except (OSError, ValueError) as e:
+                # Keep serving the previous catalog until the file is fixed
+                logger.error(f"Error loading stations from {self.path}: {e!s}")
+                return False
+
+            stations: Dict[int, StationRecord] = {}
+            for index, entry in enumerate(entries, start=1):
+                try:
+                    stations[index] = StationRecord.from_entry(index, entry)
+                except (AttributeError, ValueError) as e:
+                    logger.warning(f"Skipping invalid station #{index}: {e}")
+
+            self._replace(stations)
+            logger.info(f"Loaded {len(stations)} stations from {self.path}")
+            return True
+
+    def _replace(
+        self,
+        stations: Mapping[int, StationRecord],
+        version: Optional[str] = None,
+    ) -> None:
+        self._stations = stations
+        self._pages = OrderedDict()
+        # Built on first use, a mapped catalog may never need them
+        self._ids = None
+        self._by_name = None
+        self._json = None
+        self._version = version
+
+    @staticmethod
+    def _digest(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=8).hexdigest()
+
+    @property
+    def version(self) -> str:
+        """Content hash of the catalog, changes whenever a station changes"""
+        self.refresh()
+        if self._version is None:
+            self._version = self._digest(self.json_bytes())
+        return self._version
+
+    def all(self) -> Mapping[int, StationRecord]:
+        """All stations by id. Shared with the catalog, don't modify."""
+        self.refresh()
+        return self._stations
+
+    def get(self, station_id: int) -> Optional[StationRecord]:
+        self.refresh()
+        return self._stations.get(station_id)
+
+    def by_name(self, name: str) -> Optional[StationRecord]:
+        self.refresh()
+        stations = self._stations
+        if isinstance(stations, BinaryCatalog):
+            return stations.by_name(name)
+        if self._by_name is None:
+            self._by_name = {station.name: station for station in stations.values()}
+        return self._by_name.get(name)
+
+    def json_bytes(self) -> bytes:
+        """The serialized list of all stations"""
+        self.refresh()
+        if self._json is None:
+            self._json = serialize_stations(self._stations.values())
+        return self._json
+
+    def page(
+        self,
+        cursor: Optional[int] = None,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+    ) -> bytes:
+        """Encoded page of stations in id order, after the cursor id.
+
+        The body is {"stations": [...], "next_cursor": id or null}, with each
+        station limited to fields when given.
+
+        Raises:
+            ValueError: If fields contains an unknown field name
+
+        """
+        self.refresh()
+        include = tuple(fields) if fields else None
+        if include:
+            unknown = set(include) - set(STATION_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        key = (cursor, limit, include)
+        cached = self._pages.get(key)
+        if cached is not None:
+            self._pages.move_to_end(key)
+            return cached
+
+        if self._ids is None:
+            self._ids = list(self._stations)
+        start = 0 if cursor is None else bisect.bisect_right(self._ids, cursor)
+        ids = self._ids[start : start + limit]
+        more = start + limit < len(self._ids)
+        projected = [f for f in STATION_FIELDS if include is None or f in include]
+        stations = []
+        for station_id in ids:
+            station = self._stations[station_id].as_dict()
+            stations.append({field: station[field] for field in projected})
+        body = encode_json(
+            {
+                "stations": stations,
+                "next_cursor": ids[-1] if ids and more else None,
+            },
+        )
+
+        self._pages[key] = body
+        if len(self._pages) > PAGE_CACHE_SIZE:
+            self._pages.popitem(last=False)
+        return body
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._stations)
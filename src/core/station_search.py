@@ -0,0 +1,405 @@
+import asyncio
+import bisect
+import heapq
+import itertools
+import re
+import unicodedata
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from src.core.models import StationRecord
+from src.core.station_catalog import StationCatalog
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Facet values returned per field
+FACET_LIMIT = 20
+
+# Below this many matches sorting them beats walking the full name order
+SMALL_MATCH_SET = 2000
+
+# Shorter terms match whole tokens only, as a prefix they'd expand to most
+# of the index
+MIN_PREFIX_LENGTH = 2
+
+# Match sets and facets kept for repeated queries and further pages
+MATCH_CACHE_SIZE = 32
+
+SortKey = Tuple[str, int]
+Document = Tuple[str, Optional[str], Optional[str]]
+MatchKey = Tuple[Tuple[str, ...], Optional[str], Optional[str]]
+Facets = Dict[str, Dict[str, int]]
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents so "Zürich" matches "zurich" """
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return _TOKEN_RE.findall(normalize(text))
+
+
+class StationSearchIndex:
+    """Inverted index over station name, country and location tokens.
+
+    Postings are sets of station ids; a sorted token list gives prefix
+    matching with bisect. Syncing with a catalog only re-indexes the
+    entries whose text changed, the token list and name order are sorted
+    once per sync. Results are ordered by name, and the id of the last
+    result is the cursor for the next page.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._tokens: List[str] = []
+        self._tokens_changed = False
+        # Only the indexed text is kept, results come from the synced catalog
+        self._documents: Dict[int, Document] = {}
+        self._source: Mapping[int, StationRecord] = {}
+        self._sort_keys: Dict[int, SortKey] = {}
+        self._countries: Dict[str, Set[int]] = {}
+        self._locations: Dict[str, Set[int]] = {}
+        self._country_of: Dict[int, str] = {}
+        self._location_of: Dict[int, str] = {}
+        self._country_counts: Counter = Counter()
+        self._location_counts: Counter = Counter()
+        # Location counts per normalized country, the facets of a country
+        self._country_locations: Dict[str, Counter] = {}
+        # All sort keys in name order, rebuilt lazily after changes
+        self._order: Optional[List[SortKey]] = None
+        self._match_cache: "OrderedDict[MatchKey, Tuple[Set[int], Facets]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _add(self, station_id: int, document: Document) -> None:
+        name, country, location = document
+        self._documents[station_id] = document
+        self._sort_keys[station_id] = (normalize(name), station_id)
+        self._order = None
+
+        for token in self._document_tokens(document):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                self._tokens_changed = True
+            postings.add(station_id)
+
+        if country:
+            self._countries.setdefault(normalize(country), set()).add(station_id)
+            self._country_of[station_id] = country
+            self._country_counts[country] += 1
+        if location:
+            self._locations.setdefault(normalize(location), set()).add(station_id)
+            self._location_of[station_id] = location
+            self._location_counts[location] += 1
+            if country:
+                locations = self._country_locations.setdefault(
+                    normalize(country),
+                    Counter(),
+                )
+                locations[location] += 1
+
+    def _remove(self, station_id: int) -> None:
+        document = self._documents.pop(station_id)
+        _, country, location = document
+        del self._sort_keys[station_id]
+        self._order = None
+
+        for token in self._document_tokens(document):
+            postings = self._postings[token]
+            postings.discard(station_id)
+            if not postings:
+                del self._postings[token]
+                self._tokens_changed = True
+
+        if country:
+            self._discard(self._countries, normalize(country), station_id)
+            self._decrement(self._country_counts, country)
+            del self._country_of[station_id]
+        if location:
+            self._discard(self._locations, normalize(location), station_id)
+            self._decrement(self._location_counts, location)
+            del self._location_of[station_id]
+            if country:
+                key = normalize(country)
+                self._decrement(self._country_locations[key], location)
+                if not self._country_locations[key]:
+                    del self._country_locations[key]
+
+    @staticmethod
+    def _document_tokens(document: Document) -> Set[str]:
+        tokens: Set[str] = set()
+        for text in document:
+            tokens.update(tokenize(text))
+        return tokens
+
+    @staticmethod
+    def _discard(facet: Dict[str, Set[int]], value: str, station_id: int) -> None:
+        ids = facet[value]
+        ids.discard(station_id)
+        if not ids:
+            del facet[value]
+
+    @staticmethod
+    def _decrement(counts: Counter, value: str) -> None:
+        counts[value] -= 1
+        if counts[value] <= 0:
+            del counts[value]
+
+    def sync(self, stations: Mapping[int, StationRecord]) -> Tuple[int, int]:
+        """Bring the index in line with a catalog, returns (updated, removed)"""
+        removed = [i for i in self._documents if i not in stations]
+        for station_id in removed:
+            self._remove(station_id)
+
+        updated = 0
+        for station_id, station in stations.items():
+            document = (station.name, station.country, station.location)
+            current = self._documents.get(station_id)
+            if current != document:
+                if current is not None:
+                    self._remove(station_id)
+                self._add(station_id, document)
+                updated += 1
+
+        # Sorted in bulk, keeping the list sorted per new token is quadratic
+        if self._tokens_changed:
+            self._tokens = sorted(self._postings)
+            self._tokens_changed = False
+        if updated or removed:
+            self._match_cache.clear()
+            self._sorted_keys()
+        self._source = stations
+        return updated, len(removed)
+
+    def _sorted_keys(self) -> List[SortKey]:
+        if self._order is None:
+            self._order = sorted(self._sort_keys.values())
+        return self._order
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        """Ids with a token starting with prefix, don't modify the result"""
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return self._postings.get(prefix, set())
+        tokens = self._tokens
+        start = bisect.bisect_left(tokens, prefix)
+        end = start
+        while end < len(tokens) and tokens[end].startswith(prefix):
+            end += 1
+        if end - start == 1:
+            return self._postings[tokens[start]]
+        matches: Set[int] = set()
+        for token in itertools.islice(tokens, start, end):
+            matches |= self._postings[token]
+        return matches
+
+    def _matches(
+        self,
+        terms: Iterable[str],
+        country: Optional[str],
+        location: Optional[str],
+        restrict: Optional[Set[int]] = None,
+    ) -> Optional[Set[int]]:
+        """Ids matching all filters, None meaning every station.
+
+        The result may be an index set, don't modify it.
+        """
+        candidates: List[Set[int]] = []
+        if restrict is not None:
+            candidates.append(restrict)
+        if country is not None:
+            candidates.append(self._countries.get(country, set()))
+        if location is not None:
+            candidates.append(self._locations.get(location, set()))
+        # Each query term must prefix-match a token of name, country or location
+        for term in terms:
+            candidates.append(self._prefix_matches(term))
+
+        if not candidates:
+            return None
+        candidates.sort(key=len)
+        if len(candidates) == 1:
+            return candidates[0]
+        result = candidates[0] & candidates[1]
+        for other in candidates[2:]:
+            if not result:
+                break
+            result &= other
+        return result
+
+    def _facets(
+        self,
+        matches: Optional[Set[int]],
+        country: Optional[str] = None,
+    ) -> Facets:
+        """Facet counts of the matches, country set if they're all its stations"""
+        if matches is None:
+            countries, locations = self._country_counts, self._location_counts
+        elif country is not None:
+            countries = Counter()
+            if matches:
+                countries[self._country_of[next(iter(matches))]] = len(matches)
+            locations = self._country_locations.get(country, Counter())
+        elif len(matches) > len(self._documents) // 2:
+            # Cheaper to take the few stations that don't match off the totals
+            rest = self._documents.keys() - matches
+            countries = self._country_counts - Counter(
+                map(self._country_of.get, rest),
+            )
+            locations = self._location_counts - Counter(
+                map(self._location_of.get, rest),
+            )
+        else:
+            countries = Counter(map(self._country_of.get, matches))
+            locations = Counter(map(self._location_of.get, matches))
+            countries.pop(None, None)
+            locations.pop(None, None)
+        return {
+            "country": dict(countries.most_common(FACET_LIMIT)),
+            "location": dict(locations.most_common(FACET_LIMIT)),
+        }
+
+    def search(
+        self,
+        query: str = "",
+        country: Optional[str] = None,
+        location: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[int] = None,
+        restrict: Optional[Set[int]] = None,
+    ) -> Dict[str, Any]:
+        """Find stations, ordered by name.
+
+        restrict limits results to the given ids, e.g. reachable stations.
+
+        Raises:
+            ValueError: If the cursor doesn't refer to a known station
+
+        """
+        after: Optional[SortKey] = None
+        if cursor is not None:
+            after = self._sort_keys.get(cursor)
+            if after is None:
+                raise ValueError(f"Invalid cursor: {cursor}")
+
+        matches, facets = self._lookup(query, country, location, restrict)
+        if matches is not None and len(matches) <= SMALL_MATCH_SET:
+            keys: Iterable[SortKey] = (self._sort_keys[i] for i in matches)
+            if after is not None:
+                keys = (key for key in keys if key > after)
+            page = heapq.nsmallest(limit + 1, keys)
+        else:
+            # Many matches: walk the name order until the page is full
+            order = self._sorted_keys()
+            start = 0 if after is None else bisect.bisect_right(order, after)
+            if matches is None:
+                page = order[start : start + limit + 1]
+            else:
+                page = []
+                for key in itertools.islice(order, start, None):
+                    if key[1] in matches:
+                        page.append(key)
+                        if len(page) > limit:
+                            break
+
+        results = [self._source[station_id] for _, station_id in page[:limit]]
+        next_cursor = page[limit - 1][1] if len(page) > limit else None
+        return {
+            "results": results,
+            "total": len(self._documents) if matches is None else len(matches),
+            "facets": facets,
+            "next_cursor": next_cursor,
+        }
+
+    def _lookup(
+        self,
+        query: str,
+        country: Optional[str],
+        location: Optional[str],
+        restrict: Optional[Set[int]],
+    ) -> Tuple[Optional[Set[int]], Facets]:
+        """Matches and facets, cached unless restricted to given ids"""
+        terms = tuple(sorted(set(tokenize(query)), key=len, reverse=True))
+        if country is not None:
+            country = normalize(country)
+        if location is not None:
+            location = normalize(location)
+        if restrict is not None:
+            matches = self._matches(terms, country, location, restrict)
+            return matches, self._facets(matches)
+
+        key = (terms, country, location)
+        cached = self._match_cache.get(key)
+        if cached is not None:
+            self._match_cache.move_to_end(key)
+            return cached
+        matches = self._matches(terms, country, location)
+        only_country = not terms and location is None
+        facets = self._facets(matches, country if only_country else None)
+        self._match_cache[key] = (matches, facets)
+        if len(self._match_cache) > MATCH_CACHE_SIZE:
+            self._match_cache.popitem(last=False)
+        return matches, facets
+
+
+class StationSearch:
+    """Search index kept in step with the station catalog.
+
+    The index is built in a worker thread, at start-up and whenever the
+    catalog reloads, and swapped in when done. Searches meanwhile use the
+    previous index; only the very first ones wait for a build.
+    """
+
+    _instance: Optional["StationSearch"] = None
+
+    def __init__(self, catalog: Optional[StationCatalog] = None):
+        self.catalog = catalog or StationCatalog.get_instance()
+        self.index: Optional[StationSearchIndex] = None
+        # One worker, so builds finish in the order they were started
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="station-search",
+        )
+        self._build: Optional[Future] = None
+        self._build_stations: Optional[Mapping[int, StationRecord]] = None
+
+    @classmethod
+    def get_instance(cls) -> "StationSearch":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def refresh(self) -> Future:
+        """Start building the index if the catalog reloaded since the last build"""
+        stations = self.catalog.all()
+        # The catalog swaps in a new dict on every reload
+        if self._build is None or stations is not self._build_stations:
+            self._build_stations = stations
+            self._build = self._executor.submit(self._build_index, stations)
+        return self._build
+
+    def _build_index(
+        self,
+        stations: Mapping[int, StationRecord],
+    ) -> StationSearchIndex:
+        index = StationSearchIndex()
+        index.sync(stations)
+        self.index = index
+        return index
+
+    async def search(self, *args, **kwargs) -> Dict[str, Any]:
+        build = self.refresh()
+        index = self.index
+        if index is None:
+            index = await asyncio.wrap_future(build)
+        return index.search(*args, **kwargs)
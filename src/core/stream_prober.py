@@ -0,0 +1,317 @@
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple, Union
+
+import httpx
+from pydantic import BaseModel
+
+from config.config import settings
+from src.core.models import StationRecord
+from src.core.station_catalog import StationCatalog
+from src.utils.atomic_write import write_json
+
+logger = logging.getLogger(__name__)
+
+HEALTH_FILE = Path("data/station_health.json")
+
+# Enough to tell a stream that sends audio from one that only answers
+PROBE_BYTES = 4096
+
+CODECS = {
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/aac": "aac",
+    "audio/aacp": "aac",
+    "audio/x-aac": "aac",
+    "audio/ogg": "ogg",
+    "application/ogg": "ogg",
+    "audio/opus": "opus",
+    "audio/flac": "flac",
+    "audio/x-flac": "flac",
+    "application/vnd.apple.mpegurl": "hls",
+    "application/x-mpegurl": "hls",
+    "audio/x-mpegurl": "m3u",
+    "audio/x-scpls": "pls",
+}
+
+
+class StreamHealth(BaseModel):
+    ok: bool
+    checked_at: float
+    status: Optional[int] = None
+    latency_ms: Optional[float] = None
+    content_type: Optional[str] = None
+    codec: Optional[str] = None
+    bitrate: Optional[int] = None
+    error: Optional[str] = None
+
+
+def parse_bitrate(headers: Mapping[str, str]) -> Optional[int]:
+    """Bitrate in kbit/s from Icecast/Shoutcast headers"""
+    value = headers.get("icy-br")
+    if not value:
+        # e.g. "ice-samplerate=44100;ice-bitrate=128;ice-channels=2"
+        for part in headers.get("ice-audio-info", "").split(";"):
+            key, _, raw = part.partition("=")
+            if key.strip().lower() in ("ice-bitrate", "bitrate"):
+                value = raw
+                break
+    try:
+        return int(value.split(",")[0].strip()) if value else None
+    except ValueError:
+        return None
+
+
+async def probe_stream(
+    client: httpx.AsyncClient,
+    url: str,
+    max_bytes: int = PROBE_BYTES,
+) -> StreamHealth:
+    """Open a stream, read its first bytes and describe what came back.
+
+    Many stream servers don't answer HEAD, so this uses GET and stops after
+    max_bytes. Latency is the time until those bytes arrived.
+    """
+    start = time.monotonic()
+    try:
+        async with client.stream("GET", url) as response:
+            received = 0
+            if response.status_code < 400:
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    if received >= max_bytes:
+                        break
+            latency = (time.monotonic() - start) * 1000
+            content_type = response.headers.get("content-type", "")
+            content_type = content_type.split(";")[0].strip().lower() or None
+            ok = response.status_code < 400 and received > 0
+            error = None
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code}"
+            elif not received:
+                error = "No data"
+            return StreamHealth(
+                ok=ok,
+                checked_at=time.time(),
+                status=response.status_code,
+                latency_ms=round(latency, 1),
+                content_type=content_type,
+                codec=CODECS.get(content_type or ""),
+                bitrate=parse_bitrate(response.headers),
+                error=error,
+            )
+    except httpx.HTTPError as e:
+        return StreamHealth(
+            ok=False,
+            checked_at=time.time(),
+            error=f"{type(e).__name__}: {e}" if str(e) else type(e).__name__,
+        )
+
+
+class StationHealthIndex:
+    """Probe results by stream URL, persisted to a side file.
+
+    Keyed by URL so results survive catalog reloads that renumber ids.
+    Id sets of reachable and unreachable stations are kept for the current
+    catalog to filter searches.
+    """
+
+    def __init__(self, path: Union[str, Path] = HEALTH_FILE):
+        self.path = Path(path)
+        self._by_url: Dict[str, StreamHealth] = {}
+        self._stations: Optional[Mapping[int, StationRecord]] = None
+        self._ok_ids: Set[int] = set()
+        self._failed_ids: Set[int] = set()
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+    def load(self) -> None:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self._by_url = {url: StreamHealth(**value) for url, value in data.items()}
+            self._stations = None
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(f"Error loading station health from {self.path}: {e}")
+
+    def save(self) -> None:
+        """Write the index atomically if it changed"""
+        if not self._dirty:
+            return
+        try:
+            write_json(
+                self.path,
+                {url: health.model_dump() for url, health in self._by_url.items()},
+            )
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Error saving station health to {self.path}: {e}")
+
+    def get(self, url: str) -> Optional[StreamHealth]:
+        return self._by_url.get(url)
+
+    def record(self, station_id: int, url: str, health: StreamHealth) -> None:
+        self._by_url[url] = health
+        self._dirty = True
+        self._ok_ids.discard(station_id)
+        self._failed_ids.discard(station_id)
+        (self._ok_ids if health.ok else self._failed_ids).add(station_id)
+
+    def ids(self, reachable: bool, stations: Mapping[int, StationRecord]) -> Set[int]:
+        """Ids of stations last found reachable (or unreachable)"""
+        if stations is not self._stations:
+            self._ok_ids, self._failed_ids = set(), set()
+            for station_id, station in stations.items():
+                health = self._by_url.get(station.url)
+                if health is not None:
+                    (self._ok_ids if health.ok else self._failed_ids).add(station_id)
+            self._stations = stations
+        return self._ok_ids if reachable else self._failed_ids
+
+
+class StreamProber:
+    """Checks catalog stream URLs in the background.
+
+    A few workers take due stations (never probed, or probed longer than
+    recheck seconds ago) from a small queue. Before each probe a worker
+    waits while audio is playing, so probing never competes with the
+    stream for bandwidth. Results are saved after every save_every probes
+    and at the end of each round.
+    """
+
+    _instance: Optional["StreamProber"] = None
+
+    def __init__(
+        self,
+        catalog: Optional[StationCatalog] = None,
+        health: Optional[StationHealthIndex] = None,
+        is_playing: Callable[[], bool] = lambda: False,
+        concurrency: int = settings.STREAM_PROBE_CONCURRENCY,
+        timeout: float = settings.STREAM_PROBE_TIMEOUT,
+        recheck: float = settings.STREAM_PROBE_RECHECK,
+        spacing: float = 0.5,
+        idle_poll: float = 5.0,
+        start_delay: float = 60.0,
+        save_every: int = 50,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.catalog = catalog or StationCatalog.get_instance()
+        if health is None:
+            health = StationHealthIndex()
+            health.load()
+        self.health = health
+        self.is_playing = is_playing
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._recheck = recheck
+        self._spacing = spacing
+        self._idle_poll = idle_poll
+        self._start_delay = start_delay
+        self._save_every = save_every
+        self._transport = transport
+        self._task: Optional[asyncio.Task] = None
+        self._since_save = 0
+
+    @classmethod
+    def get_instance(cls) -> "StreamProber":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.health.save()
+
+    def due(self) -> List[Tuple[int, str]]:
+        """Stations to probe, never checked first, then the oldest results"""
+        now = time.time()
+        due = []
+        for station_id, station in self.catalog.all().items():
+            health = self.health.get(station.url)
+            checked_at = 0.0 if health is None else health.checked_at
+            if now - checked_at >= self._recheck:
+                due.append((checked_at, station_id, station.url))
+        due.sort()
+        return [(station_id, url) for _, station_id, url in due]
+
+    async def _wait_until_idle(self) -> None:
+        while self.is_playing():
+            await asyncio.sleep(self._idle_poll)
+
+    async def _worker(self, client: httpx.AsyncClient, queue: asyncio.Queue) -> None:
+        while True:
+            station_id, url = await queue.get()
+            try:
+                await self._wait_until_idle()
+                health = await asyncio.wait_for(
+                    probe_stream(client, url),
+                    timeout=self._timeout * 2,
+                )
+            except asyncio.TimeoutError:
+                health = StreamHealth(ok=False, checked_at=time.time(), error="Timeout")
+            except Exception as e:
+                logger.warning(f"Probe of {url} failed: {e}")
+                health = StreamHealth(ok=False, checked_at=time.time(), error=str(e))
+            finally:
+                queue.task_done()
+
+            self.health.record(station_id, url, health)
+            self._since_save += 1
+            if self._since_save >= self._save_every:
+                self.health.save()
+                self._since_save = 0
+            await asyncio.sleep(self._spacing)
+
+    async def run_round(self, client: httpx.AsyncClient) -> int:
+        """Probe every due station once, returns the number probed"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._concurrency * 2)
+        workers = [
+            asyncio.create_task(self._worker(client, queue))
+            for _ in range(self._concurrency)
+        ]
+        due = self.due()
+        try:
+            for item in due:
+                await queue.put(item)
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.health.save()
+        return len(due)
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=self._timeout,
+            follow_redirects=True,
+            headers={"Icy-MetaData": "0", "User-Agent": "radio-stream-prober"},
+            transport=self._transport,
+        )
+
+    async def _run(self) -> None:
+        await asyncio.sleep(self._start_delay)
+        async with self._client() as client:
+            while True:
+                probed = await self.run_round(client)
+                if probed:
+                    logger.info(f"Probed {probed} station streams")
+                # Look for newly due stations now and then
+                await asyncio.sleep(min(self._recheck, 3600))
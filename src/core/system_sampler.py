@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import ClassVar, Dict, Optional
+
+import psutil
+
+from .metrics import REGISTRY
+from .metrics_store import MetricsStore
+
+logger = logging.getLogger(__name__)
+
+
+class SystemSampler:
+    """Samples CPU, temperature, disk and memory once per interval into a
+    MetricsStore. It is the only caller of psutil.cpu_percent so the measured
+    windows are not shortened by other readers.
+    """
+
+    _instance: ClassVar[Optional["SystemSampler"]] = None
+
+    METRICS = ("cpu", "temperature", "disk", "memory")
+    THERMAL_ZONE = Path("/sys/class/thermal/thermal_zone0/temp")
+
+    def __init__(self, interval: float = 1.0):
+        self.store = MetricsStore(self.METRICS)
+        self._interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get_instance(cls) -> "SystemSampler":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _read_temperature(self) -> Optional[float]:
+        try:
+            return float(self.THERMAL_ZONE.read_text()) / 1000.0
+        except Exception:
+            return None
+
+    def sample(self) -> Dict[str, float]:
+        """Take one sample of every metric and record it"""
+        now = time.time()
+        readings = {
+            "cpu": psutil.cpu_percent(),
+            "disk": psutil.disk_usage("/").percent,
+            "memory": psutil.virtual_memory().percent,
+        }
+        temperature = self._read_temperature()
+        if temperature is not None:
+            readings["temperature"] = temperature
+
+        for metric, value in readings.items():
+            self.store.record(metric, value, now)
+        return readings
+
+    def latest(self) -> Dict[str, float]:
+        """Last recorded value of every metric that has been sampled"""
+        readings = {}
+        for metric in self.METRICS:
+            value = self.store.latest(metric)
+            if value is not None:
+                readings[metric] = value
+        return readings
+
+    def start(self) -> None:
+        """Start sampling in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background sampling task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        logger.info(f"System sampler started ({self._interval}s interval)")
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Error sampling system metrics: {e}")
+            await asyncio.sleep(self._interval)
+
+
+def _latest(metric: str):
+    return lambda: SystemSampler.get_instance().store.latest(metric)
+
+
+REGISTRY.gauge(
+    "radio_system_cpu_percent", "CPU usage in percent", function=_latest("cpu")
+)
+REGISTRY.gauge(
+    "radio_system_temperature_celsius",
+    "SoC temperature",
+    function=_latest("temperature"),
+)
+REGISTRY.gauge(
+    "radio_system_disk_used_percent",
+    "Root filesystem usage in percent",
+    function=_latest("disk"),
+)
+REGISTRY.gauge(
+    "radio_system_memory_used_percent",
+    "Memory usage in percent",
+    function=_latest("memory"),
+)
@@ -1,17 +1,26 @@
 import subprocess
 from subprocess import CompletedProcess
-from typing import Optional
+from typing import Any, Collection, Optional
 
 from src.utils.logger import setup_logger
+from src.utils.nmcli_parser import parse_wifi_list
 
+from .command_executor import CommandExecutor
+from .connection_inventory import ConnectionInventory, SavedConnection
+from .connectivity_monitor import ConnectivityMonitor
 from .models import WiFiNetwork, WiFiStatus
-from .services.network_service import get_network_service
+from .services.network_service import get_network_service, get_networkmanager
+from .wifi_status_store import WiFiStatusStore
 
 logger = setup_logger()
 
 
 class WiFiManager:
-    """Manages WiFi connections using NetworkManager"""
+    """Manages WiFi connections using NetworkManager.
+
+    NetworkManager is used over D-Bus where available, with nmcli commands
+    as the fallback.
+    """
 
     def __init__(self, skip_verify: bool = False):
         """Initialize WiFi manager
@@ -24,140 +33,80 @@ class WiFiManager:
         self.network_service = get_network_service()
         self._interface = "wlan0"
         self._skip_verify = skip_verify
+        self._executor = CommandExecutor.get_instance()
+        self._inventory = ConnectionInventory.get_instance()
+        self._connectivity = ConnectivityMonitor.get_instance()
+        self._status_store = WiFiStatusStore.get_instance()
 
-    def _verify_networkmanager(self) -> None:
+    async def _verify_networkmanager(self) -> None:
         """Verify NetworkManager is running"""
         if self._skip_verify:
             return
 
         try:
-            result = self._run_command(["systemctl", "is-active", "NetworkManager"])
+            result = await self._run_command(
+                ["systemctl", "is-active", "NetworkManager"]
+            )
             if result.returncode != 0:
                 raise RuntimeError("NetworkManager service is not active")
         except Exception as e:
             self.logger.error("NetworkManager verification failed: %s", str(e))
             raise RuntimeError("NetworkManager is not running") from e
 
-    def get_current_status(self) -> WiFiStatus:
+    async def get_current_status(self) -> WiFiStatus:
         """Get current WiFi status"""
         try:
-            # Get list of saved connections with basic info first
-            saved_result = self._run_command(
-                [
-                    "sudo",
-                    "nmcli",
-                    "-t",
-                    "-f",
-                    "NAME,TYPE,FILENAME",
-                    "connection",
-                    "show",
-                ],
-                capture_output=True,
-                text=True,
-            )
+            saved_networks = await self._inventory.saved_ssids()
 
             self.logger.debug("\n=== Start Debug Output ===")
-            self.logger.debug("1. Getting saved connections:")
-            self.logger.debug(f"Command output: {saved_result.stdout}")
-
-            # Track saved networks and their configuration files
-            saved_networks = set()
-            if saved_result.returncode == 0:
-                for line in saved_result.stdout.strip().split("\n"):
-                    parts = line.split(":")
-                    # Check for both 'wifi' and '802-11-wireless' in type field
-                    if len(parts) >= 2 and (
-                        "wifi" in parts[1].lower()
-                        or "802-11-wireless" in parts[1].lower()
-                    ):
-                        conn_name = parts[0].strip()
-                        saved_networks.add(conn_name)
-
-                        # If it's a preconfigured connection, get the SSID from the config file
-                        if conn_name == "preconfigured" and len(parts) >= 3:
-                            try:
-                                config_file = parts[2].strip()
-                                config_result = self._run_command(
-                                    ["sudo", "cat", config_file],
-                                    capture_output=True,
-                                    text=True,
-                                )
-                                if config_result.returncode == 0:
-                                    for config_line in config_result.stdout.split("\n"):
-                                        if "ssid=" in config_line.lower():
-                                            ssid = config_line.split("=")[1].strip()
-                                            saved_networks.add(ssid)
-                                            self.logger.debug(
-                                                f"Added preconfigured SSID: {ssid}",
-                                            )
-                            except Exception as e:
-                                self.logger.error(
-                                    f"Error reading preconfigured network: {e}",
-                                )
-
-                        self.logger.debug(f"Added saved connection: {conn_name}")
-
-            self.logger.debug(f"\n2. Final saved_networks set: {saved_networks}")
+            self.logger.debug(f"1. Saved networks: {saved_networks}")
 
             # Get current networks
-            result = self._run_command(
-                [
-                    "sudo",
-                    "nmcli",
-                    "-t",
-                    "-f",
-                    "SSID,SIGNAL,SECURITY,IN-USE",
-                    "device",
-                    "wifi",
-                    "list",
-                ],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
+            seen = await self._dbus_networks()
+            if seen is None:
+                result = await self._run_command(
+                    [
+                        "sudo",
+                        "nmcli",
+                        "-t",
+                        "-f",
+                        "SSID,SIGNAL,SECURITY,IN-USE",
+                        "device",
+                        "wifi",
+                        "list",
+                    ],
+                    capture_output=True,
+                    dedupe=True,
+                    text=True,
+                    timeout=5,
+                )
 
-            if result.returncode != 0:
-                self.logger.error(f"Failed to get WiFi status: {result.stderr}")
-                return WiFiStatus()
+                if result.returncode != 0:
+                    self.logger.error(f"Failed to get WiFi status: {result.stderr}")
+                    return WiFiStatus()
 
-            self.logger.debug("\n3. Getting available networks:")
-            self.logger.debug(f"Command output: {result.stdout}")
+                self.logger.debug("\n2. Getting available networks:")
+                self.logger.debug(f"Command output: {result.stdout}")
+                seen = list(parse_wifi_list(result.stdout))
 
             networks = []
-            for line in result.stdout.strip().split("\n"):
-                if not line:
-                    continue
-                try:
-                    ssid, signal, security, in_use = line.split(":")
-                    if ssid:  # Skip empty SSIDs
-                        is_saved = (
-                            ssid in saved_networks
-                            or ssid.replace(" ", "") in saved_networks
-                            or in_use
-                            == "*"  # Always mark currently connected network as saved
-                        )
-
-                        self.logger.debug(f"\nProcessing network: {ssid}")
-                        self.logger.debug(
-                            f"  - In saved_networks: {ssid in saved_networks}",
-                        )
-                        self.logger.debug(
-                            f"  - Without spaces: {ssid.replace(' ', '') in saved_networks}",
-                        )
-                        self.logger.debug(f"  - In use: {in_use == '*'}")
-                        self.logger.debug(f"  - Final saved status: {is_saved}")
-
-                        networks.append(
-                            WiFiNetwork(
-                                ssid=ssid,
-                                signal_strength=int(signal),
-                                security=security if security != "" else None,
-                                in_use=(in_use == "*"),
-                                saved=is_saved,
-                            ),
-                        )
-                except Exception as e:
-                    self.logger.error(f"Error parsing network: {line} - {e}")
+            for network in seen:
+                ssid = network.ssid
+                # Always mark currently connected network as saved
+                network.saved = (
+                    ssid in saved_networks
+                    or ssid.replace(" ", "") in saved_networks
+                    or network.in_use
+                )
+
+                self.logger.debug(f"\nProcessing network: {ssid}")
+                self.logger.debug(f"  - In saved_networks: {ssid in saved_networks}")
+                self.logger.debug(
+                    f"  - Without spaces: {ssid.replace(' ', '') in saved_networks}",
+                )
+                self.logger.debug(f"  - In use: {network.in_use}")
+                self.logger.debug(f"  - Final saved status: {network.saved}")
+                networks.append(network)
 
             self.logger.debug("\n=== End Debug Output ===")
 
@@ -173,53 +122,12 @@ class WiFiManager:
                 None,
             )
 
-            # Check internet connectivity
+            # Last known connectivity, kept fresh by the connectivity monitor
             has_internet = False
             if current_network:
-                internet_check = self._run_command(
-                    ["sudo", "nmcli", "networking", "connectivity", "check"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-                has_internet = (
-                    internet_check.returncode == 0
-                    and internet_check.stdout.strip() == "full"
-                )
+                has_internet = (await self._connectivity.ensure()).online
 
-            # Create a mapping of SSIDs to connection names
-            ssid_to_conn_name = {}
-            if saved_result.returncode == 0:
-                for line in saved_result.stdout.strip().split("\n"):
-                    parts = line.split(":")
-                    if len(parts) >= 2 and (
-                        "wifi" in parts[1].lower()
-                        or "802-11-wireless" in parts[1].lower()
-                    ):
-                        conn_name = parts[0].strip()
-                        ssid_to_conn_name[conn_name] = conn_name
-                        if conn_name == "preconfigured" and len(parts) >= 3:
-                            try:
-                                config_file = parts[2].strip()
-                                config_result = self._run_command(
-                                    ["sudo", "cat", config_file],
-                                    capture_output=True,
-                                    text=True,
-                                )
-                                if config_result.returncode == 0:
-                                    for config_line in config_result.stdout.split("\n"):
-                                        if "ssid=" in config_line.lower():
-                                            ssid = config_line.split("=")[1].strip()
-                                            ssid_to_conn_name[ssid] = conn_name
-                                            self.logger.debug(
-                                                f"Mapped SSID {ssid} to connection name {conn_name}",
-                                            )
-                            except Exception as e:
-                                self.logger.error(
-                                    f"Error reading preconfigured network: {e}",
-                                )
-
-            return WiFiStatus(
+            status = WiFiStatus(
                 ssid=current_network.ssid if current_network else None,
                 signal_strength=(
                     current_network.signal_strength if current_network else None
@@ -227,16 +135,54 @@ class WiFiManager:
                 is_connected=bool(current_network),
                 has_internet=has_internet,
                 available_networks=aggregated_networks,
+                preconfigured_ssid=await self.get_preconfigured_ssid(),
             )
+            return self._with_snapshot(status)
 
         except Exception as e:
             self.logger.error(f"Error getting WiFi status: {e!s}", exc_info=True)
             return WiFiStatus()
 
+    def _with_snapshot(self, status: WiFiStatus) -> WiFiStatus:
+        """Persist a status with networks, or fill an empty one from the snapshot.
+
+        wlan0 sees no networks while it serves the access point, so the last
+        networks seen from client mode are listed instead.
+        """
+        if status.available_networks:
+            self._status_store.update(status)
+            return status
+
+        snapshot = self._status_store.status
+        if snapshot is None or status.is_connected:
+            return status
+        status.available_networks = [
+            network.model_copy(update={"in_use": False})
+            for network in snapshot.available_networks
+        ]
+        return status
+
+    async def _dbus_networks(
+        self,
+        saved: Collection[str] = frozenset(),
+    ) -> Optional[list[WiFiNetwork]]:
+        """Networks seen, read over D-Bus, None to use nmcli instead"""
+        service = get_networkmanager()
+        if service is None:
+            return None
+        try:
+            return await service.get_access_points(saved)
+        except Exception as e:
+            self.logger.warning(f"Reading networks over D-Bus failed: {e}")
+            return None
+
     async def _scan_networks(self) -> list[WiFiNetwork]:
         """Scan for available networks"""
         try:
-            result = self._run_command(
+            networks = await self._dbus_networks(await self._inventory.saved_ssids())
+            if networks is not None:
+                return networks
+            result = await self._run_command(
                 [
                     "sudo",
                     "nmcli",
@@ -254,15 +200,15 @@ class WiFiManager:
             if result.returncode != 0:
                 self.logger.error(f"Network scan failed: {result.stderr}")
                 return []
-            return self._parse_network_list(result.stdout)
+            return await self._parse_network_list(result.stdout)
         except Exception as e:
             self.logger.error(f"Error scanning networks: {e}")
             return []
 
-    def _get_current_connection(self) -> Optional[WiFiNetwork]:
+    async def _get_current_connection(self) -> Optional[WiFiNetwork]:
         """Get current WiFi connection details"""
         try:
-            output = self._run_command(["iwconfig", self._interface])
+            output = await self._run_command(["iwconfig", self._interface])
             if output and isinstance(output.stdout, str) and "ESSID:" in output.stdout:
                 ssid = output.stdout.split('ESSID:"')[1].split('"')[0]
                 if ssid:
@@ -282,99 +228,93 @@ class WiFiManager:
             self.logger.error(f"Error getting current connection: {e}")
             return None
 
-    def _check_internet_connection(self) -> bool:
+    async def _check_internet_connection(self) -> bool:
         """Check if there's internet connectivity"""
         try:
-            # Try ping instead of nmcli connectivity check
-            result = self._run_command(["ping", "-c", "1", "-W", "2", "8.8.8.8"])
-            return result.returncode == 0
+            return (await self._connectivity.ensure()).online
         except Exception as e:
             logger.warning(f"Internet check failed: {e}")
             return False
 
-    def _run_command(self, command: list[str], **kwargs) -> subprocess.CompletedProcess:
-        """Run a shell command and return the result"""
-        default_kwargs = {"capture_output": True, "text": True, "timeout": 5}
-        kwargs = {**default_kwargs, **kwargs}
-        try:
-            return subprocess.run(command, **kwargs)
-        except subprocess.TimeoutExpired:
-            self.logger.error(f"Command timed out: {' '.join(command)}")
-            return subprocess.CompletedProcess(
-                args=command,
-                returncode=1,
-                stdout="",
-                stderr="Command timed out",
-            )
-        except Exception as e:
-            self.logger.error(f"Command failed: {' '.join(command)} - {e}")
-            return subprocess.CompletedProcess(
-                args=command,
-                returncode=1,
-                stdout="",
-                stderr=str(e),
-            )
+    async def _run_command(
+        self,
+        command: list[str],
+        timeout: float = 5,
+        dedupe: bool = False,
+        **kwargs,
+    ) -> subprocess.CompletedProcess:
+        """Run a command with the shared executor and return the result
+
+        Output is always captured as text, capture_output and text are
+        accepted for compatibility with subprocess.run.
+        """
+        return await self._executor.run(command, timeout=timeout, dedupe=dedupe)
 
     async def connect_to_network(
         self,
         ssid: str,
         password: Optional[str] = None,
+        rescan: bool = True,
     ) -> bool:
-        """Connect to a WiFi network"""
+        """Connect to a WiFi network
+
+        Args:
+            rescan (bool): Rescan and check the network is in range first
+
+        """
         try:
             self.logger.debug(
                 f"Received connection request for SSID: {ssid} with password: {'(none)' if password is None else '****'}",
             )
 
-            # Force a rescan to ensure network list is up to date
-            await self._rescan_networks()
+            if rescan:
+                # Force a rescan to ensure network list is up to date
+                await self._rescan_networks()
 
             # Check if network is saved
-            saved_result = self._run_command(
-                ["sudo", "nmcli", "-t", "-f", "NAME,TYPE", "connection", "show"],
-                capture_output=True,
-                text=True,
-            )
-
-            is_saved = False
-            if saved_result.returncode == 0:
-                for line in saved_result.stdout.strip().split("\n"):
-                    parts = line.split(":")
-                    if len(parts) >= 2 and parts[0].strip() == ssid:
-                        is_saved = True
-                        break
-
-            # Verify network exists
-            scan_result = self._run_command(
-                [
-                    "sudo",
-                    "nmcli",
-                    "-t",
-                    "-f",
-                    "SSID,SIGNAL,SECURITY,IN-USE",
-                    "device",
-                    "wifi",
-                    "list",
-                ],
-                capture_output=True,
-                text=True,
+            saved = next(
+                (
+                    connection
+                    for connection in await self._inventory.connections()
+                    if connection.name == ssid
+                ),
+                None,
             )
+            is_saved = saved is not None
+
+            # Verify network exists, unless the caller saw it in a recent scan
+            if rescan:
+                networks = await self._dbus_networks()
+                if networks is None:
+                    scan_result = await self._run_command(
+                        [
+                            "sudo",
+                            "nmcli",
+                            "-t",
+                            "-f",
+                            "SSID,SIGNAL,SECURITY,IN-USE",
+                            "device",
+                            "wifi",
+                            "list",
+                        ],
+                        capture_output=True,
+                        text=True,
+                    )
+                    if scan_result.returncode == 0:
+                        networks = list(parse_wifi_list(scan_result.stdout))
 
-            network_exists = False
-            if scan_result.returncode == 0:
-                for line in scan_result.stdout.strip().split("\n"):
-                    if line.startswith(f"{ssid}:"):
-                        network_exists = True
-                        break
+                if not any(network.ssid == ssid for network in networks or []):
+                    self.logger.error(f"Network {ssid} not found in scan results")
+                    return False
 
-            if not network_exists:
-                self.logger.error(f"Network {ssid} not found in scan results")
-                return False
+            service = get_networkmanager()
+            if service is not None:
+                return await self._connect_dbus(service, ssid, password, saved)
 
             # Connect to network
             if is_saved:
                 self.logger.debug(f"Using saved connection for {ssid}")
-                connect_result = self._run_command(
+                connect_result = await self._run_command(
                     ["sudo", "nmcli", "connection", "up", ssid],
                     capture_output=True,
                     text=True,
@@ -390,7 +330,7 @@ class WiFiManager:
 
                 self.logger.debug(f"Creating new connection for {ssid}")
                 # Check the return value instead of ignoring it
-                connect_result = self._run_command(
+                connect_result = await self._run_command(
                     [
                         "sudo",
                         "nmcli",
@@ -402,6 +342,8 @@ class WiFiManager:
                         password,
                     ],
                 )
+                # nmcli saves a profile for the new network
+                self._inventory.invalidate()
                 if connect_result.returncode != 0:
                     self.logger.error(
                         f"Failed to create connection: {connect_result.stderr}",
@@ -409,7 +351,7 @@ class WiFiManager:
                     return False
 
             # Verify connection was successful
-            verify_result = self._run_command(
+            verify_result = await self._run_command(
                 [
                     "sudo",
                     "nmcli",
@@ -431,7 +373,7 @@ class WiFiManager:
             self.logger.debug(f"Connection verification result: {success}")
 
             if not success and not is_saved:
-                self._remove_connection(ssid)
+                await self._remove_connection(ssid)
 
             return success
 
@@ -439,15 +381,77 @@ class WiFiManager:
             self.logger.error(f"Error connecting to network: {e!s}", exc_info=True)
             return False
 
-    def _remove_connection(self, ssid: str) -> bool:
+    async def _connect_dbus(
+        self,
+        service: Any,
+        ssid: str,
+        password: Optional[str],
+        saved: Optional[SavedConnection],
+    ) -> bool:
+        """Connect over D-Bus, returns once NetworkManager has the connection up"""
+        if saved is not None:
+            self.logger.debug(f"Using saved connection for {ssid}")
+            return await service.activate(saved.uuid)
+        if not password:
+            self.logger.error("Password required for unsaved network")
+            return False
+
+        self.logger.debug(f"Creating new connection for {ssid}")
+        success = await service.connect_to_wifi(ssid, password)
+        # NetworkManager saves a profile for the new network
+        self._inventory.invalidate()
+        self.logger.debug(f"Connection result: {success}")
+        if not success:
+            await self._remove_connection(ssid)
+        return success
+
+    async def activate_connection(self, name: str) -> bool:
+        """Bring up a saved connection by name, True once wlan0 is connected"""
+        service = get_networkmanager()
+        if service is not None:
+            for connection in await self._inventory.connections():
+                if connection.name == name:
+                    return await service.activate(connection.uuid)
+            self.logger.error(f"No saved connection named {name}")
+            return False
+
+        result = await self._run_command(
+            ["sudo", "nmcli", "connection", "up", name],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        if result.returncode != 0:
+            self.logger.error(f"Failed to connect to {name}: {result.stderr}")
+            return False
+
+        verify_result = await self._run_command(
+            ["sudo", "nmcli", "-t", "-f", "GENERAL.STATE", "device", "show", "wlan0"],
+            capture_output=True,
+            text=True,
+        )
+        return (
+            verify_result.returncode == 0 and "100 (connected)" in verify_result.stdout
+        )
+
+    async def _remove_connection(self, ssid: str) -> bool:
         """Remove a saved connection"""
         try:
             self.logger.debug(f"Removing connection: {ssid}")
-            result = self._run_command(
+            service = get_networkmanager()
+            if service is not None:
+                success = await service.delete_connections(ssid)
+                self._inventory.invalidate()
+                if not success:
+                    self.logger.error(f"Failed to remove connection {ssid}")
+                return success
+
+            result = await self._run_command(
                 ["sudo", "nmcli", "connection", "delete", ssid],
                 capture_output=True,
                 text=True,
             )
+            self._inventory.invalidate()
             success = result.returncode == 0
             if not success:
                 self.logger.error(f"Failed to remove connection: {result.stderr}")
@@ -456,48 +460,27 @@ class WiFiManager:
             self.logger.error(f"Error removing connection: {e}")
             return False
 
-    def _parse_network_list(
+    async def _parse_network_list(
         self,
         output: str,
         saved_networks: Optional[set] = None,
     ) -> list[WiFiNetwork]:
         """Parse nmcli output into WiFiNetwork objects"""
-        networks = []
-
         if saved_networks is None:
-            # Get saved networks if not provided
-            saved_result = self._run_command(
-                ["sudo", "nmcli", "-t", "-f", "NAME", "connection", "show"],
-                capture_output=True,
-                text=True,
-            )
-            saved_networks = set()
-            if saved_result.returncode == 0:
-                saved_networks = set(saved_result.stdout.strip().split("\n"))
-
-        for line in output.strip().split("\n"):
-            if not line:
-                continue
-            try:
-                ssid, signal, security, in_use = line.split(":")
-                if ssid:  # Skip empty SSIDs
-                    networks.append(
-                        WiFiNetwork(
-                            ssid=ssid,
-                            signal_strength=int(signal),
-                            security=security if security != "" else None,
-                            in_use=(in_use == "*"),
-                            saved=(ssid in saved_networks),
-                        ),
-                    )
-            except Exception as e:
-                self.logger.error(f"Error parsing network: {line} - {e}")
-        return networks
+            saved_networks = await self._inventory.saved_ssids()
+        return list(parse_wifi_list(output, saved=saved_networks))
 
     async def _rescan_networks(self) -> None:
         """Force a rescan of available networks"""
         try:
-            result = self._run_command(
+            service = get_networkmanager()
+            if service is not None:
+                try:
+                    await service.request_scan()
+                    return
+                except Exception as e:
+                    self.logger.warning(f"Rescan over D-Bus failed: {e}")
+            result = await self._run_command(
                 ["sudo", "nmcli", "device", "wifi", "rescan"],
                 capture_output=True,
                 text=True,
@@ -526,37 +509,26 @@ class WiFiManager:
 
         return list(aggregated.values())
 
-    def get_preconfigured_ssid(self) -> Optional[str]:
+    async def get_preconfigured_ssid(self) -> Optional[str]:
         """Get the SSID for the preconfigured connection"""
         try:
-            config_file = (
-                "/etc/NetworkManager/system-connections/preconfigured.nmconnection"
-            )
-            config_result = self._run_command(
-                ["sudo", "cat", config_file],
-                capture_output=True,
-                text=True,
-            )
-
-            if config_result.returncode == 0:
-                for line in config_result.stdout.split("\n"):
-                    if "ssid=" in line.lower():
-                        ssid = line.split("=")[1].strip()
-                        self.logger.debug(f"Preconfigured SSID: {ssid}")
-                        return ssid
+            ssid = await self._inventory.ssid_for("preconfigured")
+            if ssid:
+                self.logger.debug(f"Preconfigured SSID: {ssid}")
+                return ssid
         except Exception as e:
             self.logger.error(f"Error reading preconfigured network: {e}")
         return None
 
-    def _create_new_connection(self, ssid: str, password: str) -> bool:
+    async def _create_new_connection(self, ssid: str, password: str) -> bool:
         try:
-            if self._connection_exists(ssid):
+            if await self._connection_exists(ssid):
                 self.logger.debug(f"Connection already exists for {ssid}")
                 return True
 
             self.logger.debug(f"Creating new connection for {ssid}")
             # Remove the result assignment completely
-            self._run_command(
+            await self._run_command(
                 [
                     "sudo",
                     "nmcli",
@@ -573,13 +545,13 @@ class WiFiManager:
             self.logger.error(f"Failed to create connection: {e}")
             return False
 
-    def _connect_to_saved(self, ssid: str) -> bool:
+    async def _connect_to_saved(self, ssid: str) -> bool:
         try:
-            is_saved = self._connection_exists(ssid)
+            is_saved = await self._connection_exists(ssid)
             if is_saved:
                 self.logger.debug(f"Using saved connection for {ssid}")
                 # Use the command result to determine success
-                cmd_result = self._run_command(
+                cmd_result = await self._run_command(
                     ["sudo", "nmcli", "connection", "up", ssid],
                     capture_output=True,
                 )
@@ -597,10 +569,10 @@ class WiFiManager:
             return expected in str(process.stdout)
         return False
 
-    def _verify_interface_state(self) -> bool:
+    async def _verify_interface_state(self) -> bool:
         """Verify wlan0 is in correct state"""
         try:
-            result = self._run_command(
+            result = await self._run_command(
                 ["nmcli", "device", "status"], capture_output=True, text=True
             )
             if "wlan0" not in result.stdout:
@@ -0,0 +1,213 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .metrics import WS_BYTES_SENT, WS_DROPPED, WS_MESSAGES_SENT
+from .models import WiFiNetwork, WiFiStatus
+
+logger = logging.getLogger(__name__)
+
+FORGET_AFTER = 60.0  # seconds a network missing from scans is still listed
+
+
+class WiFiScanCache:
+    """WiFi status served from the last scan, refreshed behind the caller.
+
+    Results younger than ``ttl`` are returned as they are. Older results are
+    still returned right away while a new scan runs in the background, unless
+    they are older than ``max_stale``. Concurrent callers share one scan.
+
+    While clients are subscribed, a background loop rescans every
+    ``refresh_interval`` seconds and pushes changed results to them.
+    """
+
+    def __init__(
+        self,
+        scanner: Callable[[], Awaitable[WiFiStatus]],
+        ttl: float = 15.0,
+        max_stale: float = 300.0,
+        refresh_interval: float = 10.0,
+        forget_after: float = FORGET_AFTER,
+        message_type: str = "wifi_update",
+        name: str = "wifi",
+    ):
+        self._scanner = scanner
+        self._ttl = ttl
+        self._max_stale = max_stale
+        self._refresh_interval = refresh_interval
+        self._forget_after = forget_after
+        self._message_type = message_type
+        self._name = name
+        self._status: Optional[WiFiStatus] = None
+        self._scanned_at = 0.0
+        self._generation = 0
+        # ssid -> (last time seen, network as it was seen then)
+        self._seen: Dict[str, Tuple[float, WiFiNetwork]] = {}
+        self._scan: Optional[asyncio.Task] = None
+        # client -> last status sent to it, without timestamps
+        self._clients: Dict[Any, Optional[Dict[str, Any]]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        if self._status is None:
+            return None
+        return time.monotonic() - self._scanned_at
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._clients)
+
+    async def get(self) -> WiFiStatus:
+        """Cached status, waiting for a scan only when there is none usable"""
+        age = self.age
+        if age is None or age > self._max_stale:
+            return await self.refresh()
+        if age > self._ttl:
+            self._start_scan()
+        return self._status
+
+    async def refresh(self) -> WiFiStatus:
+        """Scan now, joining a scan that is already running"""
+        return await asyncio.shield(self._start_scan())
+
+    def seed(self, status: Optional[WiFiStatus]) -> None:
+        """Serve a status from elsewhere until the first scan replaces it.
+
+        A seeded status counts as stale, so the first get() returns it and
+        starts a scan in the background.
+        """
+        if status is None or self._status is not None:
+            return
+        self._status = status
+        self._scanned_at = time.monotonic() - self._ttl
+
+    def invalidate(self) -> None:
+        """Make the next get() wait for a fresh scan"""
+        self._generation += 1
+        self._status = None
+        self._scan = None
+
+    def _start_scan(self) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        if self._scan is None or self._scan.done() or self._scan.get_loop() is not loop:
+            self._scan = loop.create_task(self._do_scan())
+            self._scan.add_done_callback(self._scan_done)
+        return self._scan
+
+    @staticmethod
+    def _scan_done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"WiFi scan failed: {task.exception()}")
+
+    async def _do_scan(self) -> WiFiStatus:
+        generation = self._generation
+        status = await self._scanner()
+        if generation != self._generation:
+            # Started before an invalidate(), don't cache what it saw
+            return status
+        self._status = self._with_last_seen(status, time.time())
+        self._scanned_at = time.monotonic()
+        return self._status
+
+    def _with_last_seen(self, status: WiFiStatus, now: float) -> WiFiStatus:
+        networks = []
+        earlier = []
+        for network in status.available_networks:
+            if network.last_seen is not None:
+                # Not from this scan (e.g. a snapshot), keep when it was seen
+                earlier.append(network)
+                continue
+            network = network.model_copy(update={"last_seen": now})
+            self._seen[network.ssid] = (now, network)
+            networks.append(network)
+
+        # Keep briefly missing networks listed instead of flickering
+        for ssid, (seen_at, network) in list(self._seen.items()):
+            if seen_at == now:
+                continue
+            if now - seen_at > self._forget_after:
+                del self._seen[ssid]
+            else:
+                networks.append(network.model_copy(update={"in_use": False}))
+
+        listed = {network.ssid for network in networks}
+        networks.extend(network for network in earlier if network.ssid not in listed)
+        networks.sort(key=lambda n: n.signal_strength, reverse=True)
+        return status.model_copy(update={"available_networks": networks})
+
+    def seen(self, ssid: str) -> bool:
+        """Whether a recent scan found the network, snapshots don't count"""
+        seen = self._seen.get(ssid)
+        return seen is not None and time.time() - seen[0] <= self._forget_after
+
+    def subscribe(self, connection: Any) -> None:
+        """Push scan results to a client, rescanning while anyone listens"""
+        self._clients[connection] = None
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+    def unsubscribe(self, connection: Any) -> None:
+        self._clients.pop(connection, None)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            if not self._clients:
+                logger.debug("No WiFi subscribers, pausing scan refresh")
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            try:
+                # New subscribers get the cached result first, then a fresh one
+                if self._status is not None:
+                    await self._publish(self._status)
+                await self._publish(await self.refresh())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error refreshing WiFi scan: {e}")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=self._refresh_interval,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _publish(self, status: WiFiStatus) -> None:
+        # A rescan that only moved the timestamps isn't worth a message
+        content = status.model_dump(
+            exclude={"available_networks": {"__all__": {"last_seen"}}},
+        )
+        message = json.dumps({"type": self._message_type, "data": status.model_dump()})
+        for connection, last_sent in list(self._clients.items()):
+            if last_sent == content:
+                continue
+            try:
+                await connection.send_text(message)
+                self._clients[connection] = content
+                WS_MESSAGES_SENT.inc(self._name)
+                WS_BYTES_SENT.inc(self._name, amount=len(message))
+            except Exception as e:
+                logger.warning(f"Dropping WiFi subscriber after send error: {e}")
+                WS_DROPPED.inc(self._name)
+                self.unsubscribe(connection)
@@ -0,0 +1,133 @@
+import atexit
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from src.core.models import WiFiStatus
+from src.utils.atomic_write import WriteBehind, write_json
+
+logger = logging.getLogger(__name__)
+
+WIFI_STATUS_FILE = Path("data/last_wifi_status.json")
+
+# Changes within this many seconds are written together
+WRITE_DELAY = 5.0
+
+# Signal strength changes smaller than this don't count as a change
+SIGNAL_STEP = 10
+
+
+def status_entry(status: WiFiStatus) -> Dict[str, Any]:
+    """The status as stored in the snapshot file, defaults left out"""
+    return status.model_dump(
+        exclude_defaults=True,
+        exclude={"available_networks": {"__all__": {"last_seen"}}},
+    )
+
+
+def _signature(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """The entry with signal strengths bucketed, so scan jitter isn't a change"""
+    signature = dict(entry)
+    if "signal_strength" in signature:
+        signature["signal_strength"] //= SIGNAL_STEP
+    signature["available_networks"] = [
+        {**network, "signal_strength": network["signal_strength"] // SIGNAL_STEP}
+        for network in entry.get("available_networks", [])
+    ]
+    return signature
+
+
+class WiFiStatusStore:
+    """The last WiFi status with networks, kept in memory and on disk.
+
+    The snapshot lets the status be served at boot and in AP mode before a
+    scan has run. Updates that change nothing but timestamps and small signal
+    swings are ignored; real changes are written behind, WRITE_DELAY seconds
+    after the first one, and replace the file atomically.
+    """
+
+    _instance: Optional["WiFiStatusStore"] = None
+
+    def __init__(
+        self,
+        path: Union[str, Path] = WIFI_STATUS_FILE,
+        write_delay: float = WRITE_DELAY,
+    ):
+        self.path = Path(path)
+        self._entry: Optional[Dict[str, Any]] = None
+        self._saved_at: Optional[float] = None
+        self._load()
+        self._dirty = False
+        self._writer = WriteBehind(self.flush, write_delay)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "WiFiStatusStore":
+        if cls._instance is None:
+            cls._instance = cls()
+            atexit.register(cls._instance.flush)
+        return cls._instance
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            saved_at = data.pop("saved_at", None)
+            # Validate before taking it
+            WiFiStatus(**data)
+            self._entry, self._saved_at = data, saved_at
+            logger.info(f"Loaded WiFi status snapshot from {self.path}")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(f"Error loading WiFi status from {self.path}: {e}")
+
+    @property
+    def saved_at(self) -> Optional[float]:
+        """Unix time the snapshot was taken"""
+        return self._saved_at
+
+    @property
+    def status(self) -> Optional[WiFiStatus]:
+        """The snapshot, networks marked as last seen when it was taken"""
+        if self._entry is None:
+            return None
+        status = WiFiStatus(**self._entry)
+        for network in status.available_networks:
+            network.last_seen = self._saved_at
+        return status
+
+    def update(self, status: WiFiStatus) -> bool:
+        """Take a new status, returns whether it differed from the snapshot"""
+        entry = status_entry(status)
+        if self._entry is not None and _signature(entry) == _signature(self._entry):
+            return False
+        self._entry = entry
+        self._saved_at = time.time()
+        self._changed()
+        return True
+
+    def _changed(self) -> None:
+        self._dirty = True
+        self._writer.schedule()
+
+    def flush(self) -> None:
+        """Write a pending snapshot now"""
+        self._writer.cancel()
+        with self._lock:
+            if not self._dirty or self._entry is None:
+                return
+            self._dirty = False
+            data = {"saved_at": self._saved_at, **self._entry}
+            try:
+                self._write(data)
+            except OSError as e:
+                # Try again with the next change or flush
+                self._dirty = True
+                logger.error(f"Error saving WiFi status to {self.path}: {e}")
+
+    def _write(self, data: dict) -> None:
+        write_json(self.path, data, separators=(",", ":"))
@@ -67,7 +67,7 @@ class MockNetworkManagerService:
             "has_internet": bool(self._connected_ssid),
         }
 
-    def _run_command(
+    async def _run_command(
         self, command: list[str], **kwargs
     ) -> subprocess.CompletedProcess[str]:
         """Mock command execution with proper return type"""
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Callable, Iterator, Optional, Union
+
+
+def fsync_dir(path: Union[str, Path]) -> None:
+    """Make a rename in the directory durable"""
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(
+    path: Union[str, Path],
+    mode: str = "w",
+    **kwargs: Any,
+) -> Iterator[IO]:
+    """Open a temporary file that replaces path once the block succeeds.
+
+    The data and the rename are both synced, so after a crash or power loss
+    path holds either the old or the new content. If the block raises, the
+    temporary file is removed and path is left alone.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    fsync_dir(path.parent)
+
+
+def write_json(path: Union[str, Path], data: Any, **kwargs: Any) -> None:
+    """Replace path atomically with data as JSON, kwargs go to json.dump"""
+    with atomic_open(path) as f:
+        json.dump(data, f, **kwargs)
+
+
+class WriteBehind:
+    """Coalesces changes into one call of flush, delay seconds after the first.
+
+    Changes made outside a running event loop are flushed right away.
+    """
+
+    def __init__(self, flush: Callable[[], None], delay: float):
+        self._flush = flush
+        self.delay = delay
+        self._pending: Optional[asyncio.TimerHandle] = None
+        self._pending_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def schedule(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush()
+            return
+        # A write scheduled on another (possibly closed) loop may never run
+        if self._pending is None or self._pending_loop is not loop:
+            if self._pending is not None:
+                self._pending.cancel()
+            self._pending = loop.call_later(self.delay, self._flush)
+            self._pending_loop = loop
+
+    def cancel(self) -> None:
+        """Drop the scheduled flush, called by flush itself"""
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
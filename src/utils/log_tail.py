@@ -0,0 +1,201 @@
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+LinesCallback = Callable[[List[str]], Awaitable[None]]
+
+# inotify flags from <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+
+def tail_lines(
+    path: Union[str, Path],
+    count: int,
+    block_size: int = 4096,
+) -> List[str]:
+    """Return the last count lines of a file without reading all of it.
+
+    Reads fixed-size blocks backwards from EOF until enough newlines are
+    found, so the cost depends on the requested lines, not the file size.
+    """
+    if count <= 0:
+        return []
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b""
+            # One extra newline: the file usually ends with one
+            while position > 0 and data.count(b"\n") <= count:
+                step = min(block_size, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+    except FileNotFoundError:
+        return []
+
+    lines = data.decode("utf-8", errors="replace").splitlines(keepends=True)
+    return lines[-count:]
+
+
+def _inotify_watch(directory: Path) -> Optional[int]:
+    """Watch a directory with inotify, returning the fd or None if unavailable"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = _IN_MODIFY | _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO
+        if libc.inotify_add_watch(fd, str(directory).encode(), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+class LogFollower:
+    """Follow appends to a log file and hand new lines to subscribers.
+
+    Uses inotify on the log directory when available and falls back to
+    polling. Rotation and truncation are detected by inode and size, after
+    which the new file is read from the start. The follow task only runs
+    while there are subscribers.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        poll_interval: float = 1.0,
+        batch_delay: float = 0.25,
+        use_inotify: bool = True,
+    ):
+        self.path = Path(path)
+        self._poll_interval = poll_interval
+        self._batch_delay = batch_delay
+        self._use_inotify = use_inotify
+        self._subscribers: List[LinesCallback] = []
+        self._task: Optional[asyncio.Task] = None
+        self._file = None
+        self._inode: Optional[int] = None
+        self._partial = b""
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, callback: LinesCallback) -> None:
+        """Receive new lines as they are appended"""
+        self._subscribers.append(callback)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def unsubscribe(self, callback: LinesCallback) -> None:
+        """Stop receiving lines; following stops with the last subscriber"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def stop(self) -> None:
+        """Drop all subscribers and wait for the follow task to end"""
+        self._subscribers.clear()
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _open(self, from_start: bool) -> None:
+        self._close()
+        try:
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        if not from_start:
+            self._file.seek(0, os.SEEK_END)
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._inode = None
+        self._partial = b""
+
+    def read_new_lines(self) -> List[str]:
+        """Return complete lines appended since the last read"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._close()
+            return []
+
+        if self._file is None:
+            self._open(from_start=True)
+        elif stat.st_ino != self._inode or stat.st_size < self._file.tell():
+            # Rotated or truncated
+            self._open(from_start=True)
+        if self._file is None:
+            return []
+
+        data = self._partial + self._file.read()
+        *complete, self._partial = data.split(b"\n")
+        return [line.decode("utf-8", errors="replace") for line in complete]
+
+    async def _dispatch(self, lines: List[str]) -> None:
+        for callback in list(self._subscribers):
+            try:
+                await callback(lines)
+            except Exception as e:
+                logger.warning(f"Dropping log subscriber after error: {e}")
+                self._subscribers.remove(callback)
+
+    async def _run(self) -> None:
+        self._open(from_start=False)
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        fd = _inotify_watch(self.path.parent) if self._use_inotify else None
+        if fd is not None:
+            loop.add_reader(fd, changed.set)
+        else:
+            logger.info(f"inotify unavailable, polling {self.path}")
+
+        try:
+            while self._subscribers:
+                if fd is not None:
+                    await changed.wait()
+                    changed.clear()
+                    try:
+                        while os.read(fd, 4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    # Let a burst of writes land before reading
+                    await asyncio.sleep(self._batch_delay)
+                else:
+                    await asyncio.sleep(self._poll_interval)
+
+                lines = self.read_new_lines()
+                if lines:
+                    await self._dispatch(lines)
+        finally:
+            if fd is not None:
+                loop.remove_reader(fd)
+                os.close(fd)
+            self._close()
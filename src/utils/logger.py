@@ -1,17 +1,39 @@
+import atexit
 import logging
 import logging.handlers
+import queue
+import sys
+import threading
+import time
+from array import array
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.metrics import REGISTRY
+
+LOG_DROPPED = REGISTRY.counter(
+    "radio_log_records_dropped_total",
+    "Log records dropped before reaching a handler",
+    ("reason",),
+    # Incremented from whichever thread logs
+    threadsafe=True,
+)
+
+# Bounded so a stalled disk can't grow memory without limit
+LOG_QUEUE_SIZE = 10_000
 
 
 def setup_logger():
+    # Configure logger, once: every handler set up here has its own thread
+    logger = logging.getLogger("radio")
+    if any(isinstance(h, BoundedQueueHandler) for h in logger.handlers):
+        return logger
+    logger.setLevel(logging.DEBUG)
+
     # Create logs directory if it doesn't exist
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
 
-    # Configure logger
-    logger = logging.getLogger("radio")
-    logger.setLevel(logging.DEBUG)
-
     # Create rotating file handler (10 MB per file, keep 5 backup files)
     handler = logging.handlers.RotatingFileHandler(
         filename="logs/radio.log",
@@ -26,11 +48,234 @@ def setup_logger():
     )
     handler.setFormatter(formatter)
 
-    # Add handler to logger
-    logger.addHandler(handler)
+    # Add handler to logger, writing from a background thread
+    logger.addHandler(queued_handler(handler))
 
     return logger
 
 
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Put records on a bounded queue without ever blocking the caller.
+
+    Unlike the stock QueueHandler, records are not formatted here: message
+    interpolation and traceback rendering happen in the listener thread.
+    When the queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, maxsize: int = LOG_QUEUE_SIZE):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_DROPPED.inc("queue_full")
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per logger name for records below WARNING.
+
+    Lets a burst through, then at most rate records per second from each
+    logger, so a chatty hot path can't flood the queue. Warnings and errors
+    always pass.
+    """
+
+    def __init__(self, rate: float = 20.0, burst: int = 50):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.suppressed = 0
+        # logger name -> [tokens, last update]
+        self._buckets: Dict[str, List[float]] = {}
+        # filter() runs on every thread that logs
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            return self._take_token(record)
+
+    def _take_token(self, record: logging.LogRecord) -> bool:
+        now = record.created
+        bucket = self._buckets.get(record.name)
+        if bucket is None:
+            bucket = self._buckets[record.name] = [float(self.burst), now]
+        elapsed = max(0.0, now - bucket[1])
+        tokens = min(float(self.burst), bucket[0] + elapsed * self.rate)
+        bucket[1] = now
+
+        if tokens < 1.0:
+            bucket[0] = tokens
+            self.suppressed += 1
+            LOG_DROPPED.inc("rate_limited")
+            return False
+        bucket[0] = tokens - 1.0
+        return True
+
+
+def _stop_listener(listener: logging.handlers.QueueListener) -> None:
+    try:
+        listener.stop()
+    except queue.Full:
+        pass
+
+
+def queued_handler(
+    *handlers: logging.Handler,
+    maxsize: int = LOG_QUEUE_SIZE,
+    rate_limit: bool = True,
+) -> BoundedQueueHandler:
+    """Return a queue handler whose records are written by handlers in a thread"""
+    queue_handler = BoundedQueueHandler(maxsize)
+    if rate_limit:
+        queue_handler.addFilter(RateLimitFilter())
+
+    listener = logging.handlers.QueueListener(
+        queue_handler.queue,
+        *handlers,
+        respect_handler_level=True,
+    )
+    listener.start()
+    # Flush what is still queued on interpreter exit
+    atexit.register(_stop_listener, listener)
+    return queue_handler
+
+
+class RingBufferHandler(logging.Handler):
+    """Keep the last records in memory for the monitor dashboard.
+
+    Records are stored in preallocated parallel arrays indexed by sequence
+    number modulo capacity, so memory stays fixed and old records are
+    overwritten in place. Sequence numbers double as pagination cursors.
+    """
+
+    def __init__(self, capacity: int = 2000, level: int = logging.INFO):
+        super().__init__(level)
+        self.capacity = capacity
+        self._timestamps = array("d", [0.0]) * capacity
+        self._levels = array("B", [0]) * capacity
+        self._loggers: List[str] = [""] * capacity
+        self._messages: List[str] = [""] * capacity
+        self._exc_texts: List[Optional[str]] = [None] * capacity
+        self._next_seq = 0
+        self._exc_formatter = logging.Formatter()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+            exc_text = record.exc_text
+            if record.exc_info and not exc_text:
+                exc_text = self._exc_formatter.formatException(record.exc_info)
+
+            index = self._next_seq % self.capacity
+            self._timestamps[index] = record.created
+            self._levels[index] = min(record.levelno, 255)
+            self._loggers[index] = sys.intern(record.name)
+            self._messages[index] = message
+            self._exc_texts[index] = exc_text
+            self._next_seq += 1
+        except Exception:
+            self.handleError(record)
+
+    def _record(self, seq: int) -> Dict[str, Any]:
+        index = seq % self.capacity
+        return {
+            "seq": seq,
+            "timestamp": self._timestamps[index],
+            "level": logging.getLevelName(self._levels[index]),
+            "logger": self._loggers[index],
+            "message": self._messages[index],
+            "exc_info": self._exc_texts[index],
+        }
+
+    def query(
+        self,
+        min_level: int = logging.NOTSET,
+        logger_name: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        before: Optional[int] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return matching records newest first, and the cursor for the next page.
+
+        Args:
+            min_level: Lowest level to include
+            logger_name: Only this logger and its children
+            since: Oldest timestamp to include
+            until: Newest timestamp to include
+            before: Cursor from a previous page, only older records are returned
+            limit: Maximum number of records
+
+        """
+        with self.lock:  # type: ignore[union-attr]
+            oldest = max(0, self._next_seq - self.capacity)
+            seq = self._next_seq - 1
+            if before is not None:
+                seq = min(seq, before - 1)
+
+            records: List[Dict[str, Any]] = []
+            while seq >= oldest and len(records) < limit:
+                index = seq % self.capacity
+                timestamp = self._timestamps[index]
+                if since is not None and timestamp < since:
+                    seq = oldest - 1
+                    break
+                name = self._loggers[index]
+                if (
+                    self._levels[index] >= min_level
+                    and (until is None or timestamp <= until)
+                    and (
+                        logger_name is None
+                        or name == logger_name
+                        or name.startswith(logger_name + ".")
+                    )
+                ):
+                    records.append(self._record(seq))
+                seq -= 1
+
+        next_cursor = records[-1]["seq"] if seq >= oldest and records else None
+        return records, next_cursor
+
+    def recent_lines(self, count: int) -> List[str]:
+        """Last records formatted like the log file, oldest first"""
+        records, _ = self.query(limit=count)
+        lines = []
+        for record in reversed(records):
+            created = record["timestamp"]
+            asctime = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created))
+            msecs = int((created - int(created)) * 1000)
+            lines.append(
+                f"{asctime},{msecs:03d} - {record['logger']} - {record['level']} - {record['message']}\n",
+            )
+        return lines
+
+
+# In-memory log buffer shared by the whole application
+ring_buffer = RingBufferHandler()
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """Configure the root logger like basicConfig, but write from a thread.
+
+    Console output and the in-memory ring buffer sit behind a bounded queue,
+    so the event loop never waits on the terminal or disk (idempotent).
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, BoundedQueueHandler) for h in root.handlers):
+        return
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    root.setLevel(level)
+    root.addHandler(queued_handler(console, ring_buffer))
+
+
 # Create logger instance
 logger = setup_logger()
@@ -0,0 +1,167 @@
+import logging
+import re
+from typing import Container, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from pydantic import BaseModel
+
+from src.core.models import WiFiNetwork
+
+logger = logging.getLogger(__name__)
+
+WIFI_LIST_FIELDS = ("SSID", "SIGNAL", "SECURITY", "IN-USE")
+
+# An escaped character or a field separator
+_SPECIAL = re.compile(r"\\(.)|:", re.DOTALL)
+
+Output = Union[str, Iterable[str]]
+
+
+class DeviceState(BaseModel):
+    """GENERAL.* fields of nmcli -t device show"""
+
+    device: Optional[str] = None
+    type: Optional[str] = None
+    state: Optional[int] = None
+    state_text: Optional[str] = None
+    connection: Optional[str] = None
+
+    @property
+    def connected(self) -> bool:
+        return self.state == 100
+
+
+def iter_lines(output: Output) -> Iterator[str]:
+    """Yield the lines of command output one at a time.
+
+    Accepts the whole stdout as a string, scanned in place without copying
+    it or building a list, or anything yielding lines (an open pipe, a
+    generator).
+    """
+    if isinstance(output, str):
+        start, size = 0, len(output)
+        while start < size:
+            end = output.find("\n", start)
+            if end == -1:
+                end = size
+            yield output[start:end].rstrip("\r")
+            start = end + 1
+    else:
+        for line in output:
+            yield line.rstrip("\r\n")
+
+
+def split_fields(line: str, limit: int = -1) -> List[str]:
+    """Split a terse line on unescaped colons, resolving \\: and \\\\.
+
+    With a limit, at most limit splits are made and the rest of the line is
+    kept (unescaped) in the last field.
+    """
+    if "\\" not in line:
+        # Nothing escaped, the common case
+        return line.split(":", limit)
+
+    fields: List[str] = []
+    current: List[str] = []
+    position = 0
+    for match in _SPECIAL.finditer(line):
+        current.append(line[position : match.start()])
+        if match.group(1) is not None:
+            current.append(match.group(1))
+        elif len(fields) == limit:
+            current.append(":")
+        else:
+            fields.append("".join(current))
+            current = []
+        position = match.end()
+    # A trailing backslash escapes nothing and is kept
+    current.append(line[position:])
+    fields.append("".join(current))
+    return fields
+
+
+def iter_values(output: Output, width: int) -> Iterator[List[str]]:
+    """Field values of each tabular terse line with exactly width fields"""
+    for line in iter_lines(output):
+        if not line:
+            continue
+        values = split_fields(line)
+        if len(values) != width:
+            logger.debug(f"Skipping nmcli line with {len(values)} fields: {line!r}")
+            continue
+        yield values
+
+
+def iter_rows(output: Output, fields: Sequence[str]) -> Iterator[Dict[str, str]]:
+    """Parse tabular terse output (nmcli -t -f A,B,... list) into dicts"""
+    for values in iter_values(output, len(fields)):
+        yield dict(zip(fields, values))
+
+
+def iter_sections(output: Output) -> Iterator[Dict[str, str]]:
+    """Parse multiline terse output (nmcli -t ... show) into one dict per object.
+
+    Objects are separated by blank lines or, when nmcli prints several
+    objects back to back, by a key that repeats.
+    """
+    section: Dict[str, str] = {}
+    for line in iter_lines(output):
+        if not line:
+            if section:
+                yield section
+                section = {}
+            continue
+        key, *rest = split_fields(line, limit=1)
+        if not rest:
+            continue
+        if key in section:
+            yield section
+            section = {}
+        section[key] = rest[0]
+    if section:
+        yield section
+
+
+def parse_wifi_list(
+    output: Output,
+    saved: Container[str] = frozenset(),
+    fields: Sequence[str] = WIFI_LIST_FIELDS,
+) -> Iterator[WiFiNetwork]:
+    """Yield networks from nmcli -t -f SSID,SIGNAL,SECURITY,IN-USE device wifi list"""
+    ssid_at, signal_at, security_at, in_use_at = (
+        fields.index(name) for name in WIFI_LIST_FIELDS
+    )
+    for values in iter_values(output, len(fields)):
+        ssid = values[ssid_at]
+        if not ssid:  # Hidden networks
+            continue
+        try:
+            signal = int(values[signal_at] or 0)
+        except ValueError:
+            logger.debug(f"Skipping {ssid!r} with signal {values[signal_at]!r}")
+            continue
+        yield WiFiNetwork(
+            ssid=ssid,
+            signal_strength=signal,
+            security=values[security_at] or None,
+            in_use=values[in_use_at] == "*",
+            saved=ssid in saved,
+        )
+
+
+def parse_device_show(output: Output) -> DeviceState:
+    """Read the first device from nmcli -t device show"""
+    section = next(iter_sections(output), {})
+    state, state_text = None, None
+    raw_state = section.get("GENERAL.STATE", "")
+    code, _, text = raw_state.partition(" ")
+    if code.isdigit():
+        state, state_text = int(code), text.strip("()") or None
+
+    connection = section.get("GENERAL.CONNECTION") or None
+    return DeviceState(
+        device=section.get("GENERAL.DEVICE") or None,
+        type=section.get("GENERAL.TYPE") or None,
+        state=state,
+        state_text=state_text,
+        connection=None if connection == "--" else connection,
+    )
@@ -0,0 +1,342 @@
+import argparse
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from src.core.models import StationRecord
+from src.utils.atomic_write import atomic_open
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+# A single entry larger than this means the input isn't a station list
+MAX_ENTRY_SIZE = 1024 * 1024
+
+# Source field names, first present wins (radio-browser dumps use url_resolved/state)
+FIELD_ALIASES = {
+    "name": ("name", "title"),
+    "url": ("url_resolved", "url", "stream_url", "stream"),
+    "country": ("country",),
+    "location": ("location", "state", "city"),
+}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class ImportStats(BaseModel):
+    existing: int = 0  # catalog entries kept as they were when appending
+    read: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    bytes_read: int = 0
+    bytes_total: int = 0
+
+
+class StationImportError(Exception):
+    """Raised when an import source can't be parsed"""
+
+
+def iter_json_entries(
+    stream: TextIO,
+    chunk_size: int = CHUNK_SIZE,
+    max_entry_size: int = MAX_ENTRY_SIZE,
+) -> Iterator[Any]:
+    """Yield the values of a JSON array or JSON lines without loading it all.
+
+    Reads chunks and decodes one value at a time with raw_decode, so memory
+    is bounded by the largest single entry.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    while True:
+        # Skip separators between entries
+        while position < len(buffer) and buffer[position] in " \t\r\n,[]":
+            position += 1
+
+        if position >= len(buffer):
+            if eof:
+                return
+            buffer, position = stream.read(chunk_size), 0
+            eof = not buffer
+            continue
+
+        try:
+            entry, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            if eof:
+                raise StationImportError(
+                    f"Invalid JSON near offset {e.pos}: {e.msg}"
+                ) from e
+            if len(buffer) - position > max_entry_size:
+                raise StationImportError(
+                    f"Entry larger than {max_entry_size} bytes"
+                ) from e
+            # Incomplete entry, keep the tail and read more
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+
+        yield entry
+        position = end
+
+
+def iter_csv_entries(stream: TextIO) -> Iterator[dict]:
+    """Yield rows of a CSV file with a header line"""
+    yield from csv.DictReader(stream)
+
+
+def _pick(raw: dict, field: str) -> Optional[str]:
+    for key in FIELD_ALIASES[field]:
+        value = raw.get(key)
+        if isinstance(value, str):
+            value = _WHITESPACE_RE.sub(" ", value).strip()
+            if value:
+                return value
+    return None
+
+
+def normalize_entry(raw: Any) -> Optional[dict]:
+    """Map a directory entry to a catalog entry, None if it isn't usable"""
+    if not isinstance(raw, dict):
+        return None
+    name = _pick(raw, "name")
+    url = _pick(raw, "url")
+    if not name or not url or not url.lower().startswith(("http://", "https://")):
+        return None
+    entry = {"name": name, "url": url}
+    for field in ("country", "location"):
+        value = _pick(raw, field)
+        if value:
+            entry[field] = value
+    return entry
+
+
+def _digest(text: str) -> int:
+    """64-bit key, much smaller in a set than the string itself"""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+class StationImporter:
+    """Normalizes, validates and dedupes entries from one or more sources.
+
+    Entries are dropped when their URL or their name and country were seen
+    before. Only 64-bit digests are remembered, so memory stays around
+    100 bytes per imported station whatever the entry size.
+    """
+
+    def __init__(self, stats: Optional[ImportStats] = None):
+        self.stats = stats or ImportStats()
+        self._urls: Set[int] = set()
+        self._names: Set[int] = set()
+
+    @staticmethod
+    def _keys(entry: dict) -> Tuple[int, int]:
+        url_key = _digest(entry["url"].rstrip("/").lower())
+        name_key = _digest(f"{entry['name'].casefold()}\0{entry.get('country', '')}")
+        return url_key, name_key
+
+    def accept(self, raw: Any) -> Optional[dict]:
+        self.stats.read += 1
+        entry = normalize_entry(raw)
+        if entry is None:
+            self.stats.invalid += 1
+            return None
+        try:
+            StationRecord.from_entry(self.stats.imported + 1, entry)
+        except ValueError:
+            self.stats.invalid += 1
+            return None
+
+        url_key, name_key = self._keys(entry)
+        if url_key in self._urls or name_key in self._names:
+            self.stats.duplicates += 1
+            return None
+        self._urls.add(url_key)
+        self._names.add(name_key)
+        self.stats.imported += 1
+        return entry
+
+    def keep(self, raw: Any) -> Any:
+        """Take an existing catalog entry as it is, so later ones dedupe against it"""
+        self.stats.existing += 1
+        entry = normalize_entry(raw)
+        if entry is not None:
+            url_key, name_key = self._keys(entry)
+            self._urls.add(url_key)
+            self._names.add(name_key)
+        return raw
+
+    def iter_existing(self, path: Union[str, Path]) -> Iterator[Any]:
+        """Yield the entries of a catalog unchanged and in order.
+
+        Their positions are the station ids that assignments and health data
+        refer to, so nothing is merged, dropped or rewritten.
+        """
+        with open(path, "rb") as raw:
+            text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+            for raw_entry in iter_json_entries(text):
+                self.stats.bytes_read = raw.tell()
+                yield self.keep(raw_entry)
+
+    def iter_source(self, path: Union[str, Path]) -> Iterator[dict]:
+        """Yield accepted entries of a .json, .jsonl/.ndjson or .csv file"""
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix not in (".json", ".jsonl", ".ndjson", ".csv"):
+            raise StationImportError(f"Unsupported file type: {path}")
+
+        with open(path, "rb") as raw:
+            text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+            entries: Iterable[Any] = (
+                iter_csv_entries(text) if suffix == ".csv" else iter_json_entries(text)
+            )
+            for raw_entry in entries:
+                self.stats.bytes_read = raw.tell()
+                entry = self.accept(raw_entry)
+                if entry is not None:
+                    yield entry
+
+
+def import_stations(
+    sources: List[Union[str, Path]],
+    output: Union[str, Path],
+    append: bool = False,
+    progress: Optional[Callable[[ImportStats], None]] = None,
+    progress_interval: float = 1.0,
+) -> ImportStats:
+    """Stream sources into a catalog file, replacing it atomically.
+
+    With append the current catalog is copied first, entry for entry, so
+    existing ids stay valid. New entries are deduped against it.
+    """
+    output = Path(output)
+    paths = [Path(p) for p in sources]
+    existing = append and output.exists()
+    if existing:
+        paths.insert(0, output)
+
+    importer = StationImporter()
+    importer.stats.bytes_total = sum(os.path.getsize(p) for p in paths)
+    done_bytes = 0
+    last_report = time.monotonic()
+
+    with atomic_open(output, "w", encoding="utf-8") as f:
+        f.write("[")
+        first = True
+        for index, path in enumerate(paths):
+            entries = (
+                importer.iter_existing(path)
+                if existing and index == 0
+                else importer.iter_source(path)
+            )
+            for entry in entries:
+                f.write("\n  " if first else ",\n  ")
+                f.write(json.dumps(entry, ensure_ascii=False))
+                first = False
+
+                now = time.monotonic()
+                if progress and now - last_report >= progress_interval:
+                    stats = importer.stats.model_copy()
+                    stats.bytes_read += done_bytes
+                    progress(stats)
+                    last_report = now
+            done_bytes += os.path.getsize(path)
+        f.write("\n]\n")
+
+    importer.stats.bytes_read = done_bytes
+    if progress:
+        progress(importer.stats)
+    logger.info(f"Imported {importer.stats.imported} stations into {output}")
+    return importer.stats
+
+
+def _print_progress(stats: ImportStats) -> None:
+    percent = 100 * stats.bytes_read / stats.bytes_total if stats.bytes_total else 100
+    print(
+        f"\r{percent:5.1f}%  read {stats.read}  imported {stats.imported}"
+        f"  duplicates {stats.duplicates}  invalid {stats.invalid}",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """python -m src.utils.station_importer dump.json [more.csv ...]"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.station_importer",
+        description="Import station directory dumps (JSON, JSON lines, CSV) into the catalog",
+    )
+    parser.add_argument("sources", nargs="+", type=Path, help="files to import")
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=Path("config/stations.json"),
+        help="catalog to write (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="keep the current catalog entries and add new ones",
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="also compile the binary catalog next to the output",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = import_stations(
+            args.sources,
+            args.output,
+            append=args.append,
+            progress=None if args.quiet else _print_progress,
+        )
+    except (OSError, StationImportError) as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    if args.compile:
+        from src.core.station_binary import compile_catalog
+
+        compile_catalog(args.output, args.output.with_suffix(".bin"))
+
+    print(
+        f"Imported {stats.imported} of {stats.read} entries into {args.output}"
+        f" ({stats.duplicates} duplicates, {stats.invalid} invalid)",
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
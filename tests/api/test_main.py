@@ -9,6 +9,7 @@ from fastapi.testclient import TestClient
 from config.config import settings
 from src.api.main import app
 from src.api.models.requests import AssignStationRequest
+from src.core.assignment_store import AssignmentStore
 from src.core.models import RadioStation
 
 # Create test client
@@ -31,11 +32,8 @@ def setup_test_environment(monkeypatch):
     with open(test_stations_file, "w") as f:
         f.write("{}")
 
-    # Patch the STATIONS_FILE path in StationManager
-    with patch(
-        "src.core.station_manager.StationManager.STATIONS_FILE",
-        test_stations_file,
-    ):
+    # Write assignments to the test file
+    with patch.object(AssignmentStore.get_instance(), "path", test_stations_file):
         yield test_stations_file
 
     # Cleanup after test
@@ -140,3 +138,26 @@ async def test_toggle_station():
     assert response.status_code == 200
     assert "status" in response.json()
     assert "slot" in response.json()
+
+
+def test_assigned_stations_etag(tmp_path, monkeypatch):
+    """Assigned stations carry an ETag and revalidate with 304"""
+    store = AssignmentStore(tmp_path / "assigned_stations.json")
+    store.set(1, RadioStation(name="Test", url="http://test"))
+    monkeypatch.setattr("src.api.routes.stations.assignment_store", store)
+    url = f"{settings.API_V1_STR}/stations/assigned"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json()["1"]["name"] == "Test"
+    assert response.headers["cache-control"] == "no-cache"
+    etag = response.headers["etag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    store.set(1, RadioStation(name="Other", url="http://other"))
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
@@ -4,6 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from src.api.main import app
+from src.api.routes.wifi import scan_cache
 from src.core.models import WiFiNetwork, WiFiStatus
 
 client = TestClient(app)
@@ -21,6 +22,14 @@ mock_status = WiFiStatus(
 )
 
 
+@pytest.fixture(autouse=True)
+def empty_scan_cache():
+    """Each test starts without cached scan results"""
+    scan_cache.invalidate()
+    yield
+    scan_cache.invalidate()
+
+
 @patch("src.core.wifi_manager.WiFiManager.get_current_status")
 def test_get_wifi_status(mock_get_status):
     mock_get_status.return_value = mock_status
@@ -47,6 +56,21 @@ def test_scan_networks(mock_get_status):
     assert "available_networks" in data
 
 
+@patch("src.core.wifi_manager.WiFiManager.get_current_status")
+def test_status_served_from_cache(mock_get_status):
+    """Repeated status requests share one scan until asked to refresh"""
+    mock_get_status.return_value = mock_status
+
+    first = client.get("/api/v1/wifi/status").json()
+    second = client.get("/api/v1/wifi/status").json()
+    assert mock_get_status.call_count == 1
+    assert first == second
+    assert all(net["last_seen"] for net in first["available_networks"])
+
+    client.get("/api/v1/wifi/status", params={"refresh": True})
+    assert mock_get_status.call_count == 2
+
+
 @pytest.mark.asyncio
 @patch("src.core.wifi_manager.WiFiManager.connect_to_network")
 async def test_connect_to_network(mock_connect):
@@ -60,7 +84,27 @@ async def test_connect_to_network(mock_connect):
 
     assert response.status_code == 200
     assert response.json() == {"status": "success"}
-    mock_connect.assert_called_once_with("TestNetwork", "TestPassword")
+    mock_connect.assert_called_once_with("TestNetwork", "TestPassword", rescan=True)
+
+
+@patch("src.core.wifi_manager.WiFiManager.get_current_status")
+@patch("src.core.wifi_manager.WiFiManager.connect_to_network")
+def test_connect_skips_rescan_for_scanned_network(mock_connect, mock_get_status):
+    """A network from the cached scan is connected to without rescanning"""
+    mock_get_status.return_value = mock_status
+    mock_connect.return_value = True
+    client.get("/api/v1/wifi/status")
+
+    response = client.post(
+        "/api/v1/wifi/connect",
+        json={"ssid": "Network1", "password": "TestPassword"},
+    )
+
+    assert response.status_code == 200
+    mock_connect.assert_called_once_with("Network1", "TestPassword", rescan=False)
+    # The connection changed, so the next status scans again
+    client.get("/api/v1/wifi/status")
+    assert mock_get_status.call_count == 2
 
 
 @pytest.mark.asyncio
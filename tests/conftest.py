@@ -15,11 +15,19 @@ if project_root not in sys.path:
 if os.getenv("CI") or os.getenv("MOCK_MPV"):
     sys.modules["mpv"] = MagicMock()
 
+from config.config import settings  # noqa: E402
+
 # Now we can import local modules
 try:
+    from src.core.connection_inventory import ConnectionInventory  # noqa: E402
+    from src.core.connectivity_monitor import ConnectivityMonitor  # noqa: E402
     from src.core.wifi_manager import WiFiManager  # noqa: E402
+    from src.core.wifi_status_store import WiFiStatusStore  # noqa: E402
 except ImportError:
+    from radio.src.core.connection_inventory import ConnectionInventory  # noqa: E402
+    from radio.src.core.connectivity_monitor import ConnectivityMonitor  # noqa: E402
     from radio.src.core.wifi_manager import WiFiManager  # noqa: E402
+    from radio.src.core.wifi_status_store import WiFiStatusStore  # noqa: E402
 
 # Create module level mocks
 mock_mpv_instance: Optional[MagicMock] = None
@@ -69,6 +77,12 @@ def mock_hardware(monkeypatch) -> Optional[Dict[str, MagicMock]]:
     return None
 
 
+@pytest.fixture(autouse=True)
+def nmcli_only(monkeypatch) -> None:
+    """Tests answer nmcli commands, the host's NetworkManager is never asked"""
+    monkeypatch.setattr(settings, "NETWORK_DBUS_ENABLED", False)
+
+
 # Add cleanup
 @pytest.fixture(autouse=True)
 def cleanup() -> None:
@@ -163,9 +177,18 @@ def mock_logger(monkeypatch) -> MagicMock:
 
 
 @pytest.fixture
-def wifi_manager(mock_logger) -> WiFiManager:
+def wifi_manager(mock_logger, tmp_path) -> WiFiManager:
     """Create a WiFiManager instance for testing."""
-    return WiFiManager(skip_verify=True)
+    manager = WiFiManager(skip_verify=True)
+    manager._status_store = WiFiStatusStore(tmp_path / "last_wifi_status.json")
+    # Fresh inventory per test, reading through the (mocked) _run_command
+    manager._inventory = ConnectionInventory(
+        run=lambda command, **kwargs: manager._run_command(command, **kwargs),
+    )
+    manager._connectivity = ConnectivityMonitor(
+        run=lambda command, **kwargs: manager._run_command(command, **kwargs),
+    )
+    return manager
 
 
 def pytest_configure(config: Any) -> None:
@@ -0,0 +1,122 @@
+from subprocess import CompletedProcess
+
+import pytest
+
+from src.core.ap_scanner import APScanner, parse_iw_scan, supports_managed_with_ap
+
+# Raspberry Pi (brcmfmac) iw list, trimmed
+IW_LIST = """Wiphy phy0
+\tmax # scan SSIDs: 10
+\tvalid interface combinations:
+\t\t * #{ managed } <= 1, #{ P2P-device } <= 1, #{ P2P-client, P2P-GO } <= 1,
+\t\t   total <= 3, #channels <= 2
+\t\t * #{ managed } <= 1, #{ AP } <= 1, #{ P2P-client } <= 1, #{ P2P-device } <= 1,
+\t\t   total <= 4, #channels <= 1
+\tDevice supports scan flush.
+"""
+IW_LIST_SINGLE = """Wiphy phy0
+\tvalid interface combinations:
+\t\t * #{ managed, AP } <= 1,
+\t\t   total <= 1, #channels <= 1
+\tSupported commands:
+\t\t * new_interface
+\t\t * #{ managed } <= 1, #{ AP } <= 1, total <= 2
+"""
+
+IW_SCAN = """BSS 00:11:22:33:44:55(on scan0)
+\tfreq: 2412
+\tsignal: -45.00 dBm
+\tSSID: Home
+\tcapability: ESS Privacy ShortSlotTime (0x0411)
+\tRSN:\t * Version: 1
+\t\t * Authentication suites: PSK SAE
+BSS 00:11:22:33:44:66(on scan0)
+\tsignal: -80.00 dBm
+\tSSID: Home
+\tcapability: ESS Privacy (0x0011)
+\tRSN:\t * Version: 1
+\t\t * Authentication suites: PSK
+BSS 66:55:44:33:22:11(on scan0)
+\tsignal: -70.00 dBm
+\tSSID: \\x20Caf\\xc3\\xa9\\x20
+\tcapability: ESS (0x0001)
+BSS 66:55:44:33:22:22(on scan0)
+\tsignal: -60.00 dBm
+\tSSID:
+\tcapability: ESS Privacy (0x0011)
+\tWPA:\t * Version: 1
+\t\t * Authentication suites: PSK
+"""
+
+
+def result(stdout: str = "", returncode: int = 0, stderr: str = "") -> CompletedProcess:
+    return CompletedProcess(
+        args=[],
+        returncode=returncode,
+        stdout=stdout,
+        stderr=stderr,
+    )
+
+
+def test_supports_managed_with_ap():
+    """Combinations allowing a managed interface next to an AP are found"""
+    assert supports_managed_with_ap(IW_LIST)
+    # The one-interface combination does not allow it, and the lines after
+    # the section are not read as combinations
+    assert not supports_managed_with_ap(IW_LIST_SINGLE)
+    assert not supports_managed_with_ap("")
+
+
+def test_parse_iw_scan():
+    """Strongest BSS per SSID, escaped SSIDs decoded, hidden ones dropped"""
+    networks = parse_iw_scan(IW_SCAN, saved={"Home"})
+    assert [(n.ssid, n.signal_strength, n.security, n.saved) for n in networks] == [
+        ("Home", 100, "WPA2 WPA3", True),
+        (" Café ", 60, None, False),
+    ]
+
+
+class FakeRun:
+    def __init__(self, iw_list: str = IW_LIST, add: CompletedProcess = result()):
+        self.iw_list = iw_list
+        self.add = add
+        self.commands = []
+
+    async def __call__(self, cmd, timeout=None, dedupe=False):
+        self.commands.append(cmd)
+        if cmd == ["iw", "list"]:
+            return result(self.iw_list)
+        if "add" in cmd:
+            return self.add
+        if cmd[-1] == "scan":
+            return result(IW_SCAN)
+        return result()
+
+
+@pytest.mark.asyncio
+async def test_scan_uses_virtual_interface():
+    """wlan0 is left alone and the virtual interface is removed afterwards"""
+    run = FakeRun()
+    scanner = APScanner(run=run, scan_interface="scan0")
+
+    networks = await scanner.scan()
+    assert [n.ssid for n in networks] == ["Home", " Café "]
+    assert run.commands[0] == ["iw", "list"]
+    assert run.commands[-1] == ["sudo", "iw", "dev", "scan0", "del"]
+    assert not any("wlan0" in cmd and "set" in cmd for cmd in run.commands)
+
+    # Driver support is only asked about once
+    await scanner.scan()
+    assert run.commands.count(["iw", "list"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_scan_unavailable():
+    """Unsupported drivers and failures give None instead of networks"""
+    run = FakeRun(iw_list=IW_LIST_SINGLE)
+    assert await APScanner(run=run).scan() is None
+    assert run.commands == [["iw", "list"]]
+
+    run = FakeRun(add=result(returncode=1, stderr="Operation not supported"))
+    assert await APScanner(run=run, scan_interface="scan0").scan() is None
+    assert run.commands[-1] == ["sudo", "iw", "dev", "scan0", "del"]
@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+import pytest
+
+from src.core.assignment_store import AssignmentStore
+from src.core.models import RadioStation
+
+
+def station(name):
+    return RadioStation(name=name, url=f"http://{name.lower()}")
+
+
+def test_writes_atomically_outside_loop(tmp_path):
+    """Without an event loop every change is written right away"""
+    path = tmp_path / "assigned_stations.json"
+    store = AssignmentStore(path)
+    store.set(2, station("B"))
+    store.set(1, station("A"))
+
+    assert json.loads(path.read_text()) == {
+        "1": {
+            "name": "A",
+            "url": "http://a",
+            "slot": 1,
+            "country": None,
+            "location": None,
+        },
+        "2": {
+            "name": "B",
+            "url": "http://b",
+            "slot": 2,
+            "country": None,
+            "location": None,
+        },
+    }
+    # No temporary file left behind
+    assert [p.name for p in tmp_path.iterdir()] == ["assigned_stations.json"]
+    assert AssignmentStore(path).get(1).name == "A"
+
+
+@pytest.mark.asyncio
+async def test_changes_coalesce_in_loop(tmp_path):
+    """Changes made in the event loop are written once after the delay"""
+    path = tmp_path / "assigned_stations.json"
+    store = AssignmentStore(path, write_delay=0.05)
+    writes = []
+    write = store._write
+    store._write = lambda data: (writes.append(data), write(data))
+
+    version = store.version
+    store.set(1, station("A"))
+    store.set(1, station("B"))
+    store.remove(2)
+    # Reads are served from memory before anything is written
+    assert store.get(1).name == "B"
+    assert store.version != version
+    assert not path.exists()
+
+    await asyncio.sleep(0.1)
+    assert len(writes) == 1
+    assert json.loads(path.read_text())["1"]["name"] == "B"
+
+
+def test_flush_retries_after_error(tmp_path):
+    """A failed write keeps the changes pending"""
+    blocker = tmp_path / "data"
+    blocker.write_text("not a directory")
+    store = AssignmentStore(blocker / "assigned_stations.json")
+    store.set(1, station("A"))
+
+    blocker.unlink()
+    store.flush()
+    assert json.loads(store.path.read_text())["1"]["name"] == "A"
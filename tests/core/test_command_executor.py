@@ -0,0 +1,99 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from src.core.command_executor import CommandExecutor, command_program
+
+PYTHON = sys.executable
+
+
+def test_command_program_ignores_sudo():
+    """Metrics are labelled with the program, not sudo"""
+    assert command_program(["sudo", "/usr/bin/nmcli", "device"]) == "nmcli"
+    assert command_program(["systemctl", "is-active", "dbus"]) == "systemctl"
+    assert command_program([]) == "unknown"
+
+
+@pytest.mark.asyncio
+async def test_results_and_failures():
+    """Output, exit codes and start failures come back as results"""
+    executor = CommandExecutor()
+
+    result = await executor.run([PYTHON, "-c", "print('hello')"])
+    assert (result.returncode, result.stdout) == (0, "hello\n")
+
+    result = await executor.run(
+        [PYTHON, "-c", "import sys; sys.stderr.write('bad'); sys.exit(3)"],
+    )
+    assert (result.returncode, result.stderr) == (3, "bad")
+
+    result = await executor.run(["/nonexistent/program"])
+    assert result.returncode == 1 and result.stderr
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_command():
+    """A command running past its timeout is killed"""
+    executor = CommandExecutor()
+    start = time.monotonic()
+    result = await executor.run([PYTHON, "-c", "import time; time.sleep(10)"], 0.2)
+    assert result.stderr == "Command timed out"
+    assert time.monotonic() - start < 5
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit():
+    """No more than max_concurrent commands run at the same time"""
+    executor = CommandExecutor(max_concurrent=2)
+    sleep = [PYTHON, "-c", "import time; time.sleep(0.3)"]
+    start = time.monotonic()
+    await asyncio.gather(*(executor.run(sleep) for _ in range(4)))
+    # Two batches of two
+    assert time.monotonic() - start >= 0.6
+
+
+@pytest.mark.asyncio
+async def test_dedupe_shares_running_command(tmp_path):
+    """Identical read-only commands in flight run once"""
+    executor = CommandExecutor()
+    counter = tmp_path / "runs"
+    command = [
+        PYTHON,
+        "-c",
+        f"import time; open({str(counter)!r}, 'a').write('x'); time.sleep(0.2)",
+    ]
+
+    results = await asyncio.gather(
+        *(executor.run(command, dedupe=True) for _ in range(3)),
+    )
+    assert all(r.returncode == 0 for r in results)
+    assert counter.read_text() == "x"
+
+    # Finished runs aren't reused
+    await executor.run(command, dedupe=True)
+    assert counter.read_text() == "xx"
+
+
+@pytest.mark.asyncio
+async def test_cancel_kills_command(tmp_path):
+    """Cancelling the caller stops the command"""
+    executor = CommandExecutor()
+    marker = tmp_path / "finished"
+    task = asyncio.create_task(
+        executor.run(
+            [
+                PYTHON,
+                "-c",
+                f"import time; time.sleep(0.5); open({str(marker)!r}, 'w')",
+            ],
+        ),
+    )
+    await asyncio.sleep(0.2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    await asyncio.sleep(0.6)
+    assert not marker.exists()
@@ -0,0 +1,112 @@
+from subprocess import CompletedProcess
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.core.connection_inventory import (
+    ConnectionInventory,
+    parse_connection_list,
+    parse_ssids,
+)
+from src.core.network_events import NetworkEvent, parse_event
+
+LIST_OUTPUT = (
+    "Home\\:Office:aaaa:802-11-wireless\n"
+    "preconfigured:bbbb:802-11-wireless\n"
+    "Wired connection 1:cccc:802-3-ethernet\n"
+)
+SHOW_OUTPUT = (
+    "connection.uuid:aaaa\n"
+    "802-11-wireless.ssid:HomeNet\n"
+    "\n"
+    "connection.uuid:bbbb\n"
+    "802-11-wireless.ssid:Salt:5GHz\n"
+)
+
+
+def result(stdout: str, returncode: int = 0) -> CompletedProcess:
+    return CompletedProcess(args=[], returncode=returncode, stdout=stdout, stderr="")
+
+
+def make_inventory(**kwargs) -> ConnectionInventory:
+    run = AsyncMock(side_effect=[result(LIST_OUTPUT), result(SHOW_OUTPUT)] * 2)
+    return ConnectionInventory(run=run, **kwargs)
+
+
+def test_parsers():
+    """Names are unescaped and SSIDs are matched by UUID"""
+    connections = parse_connection_list(LIST_OUTPUT)
+    assert [c.name for c in connections] == [
+        "Home:Office",
+        "preconfigured",
+        "Wired connection 1",
+    ]
+    assert [c.wireless for c in connections] == [True, True, False]
+    assert parse_ssids(SHOW_OUTPUT) == {"aaaa": "HomeNet", "bbbb": "Salt:5GHz"}
+
+
+def test_parse_event():
+    """Profile changes are told apart from device changes"""
+    event = parse_event("Home: connection profile removed")
+    assert (event.kind, event.subject, event.action) == (
+        "connection",
+        "Home",
+        "removed",
+    )
+    assert parse_event("wlan0: disconnected").kind == "device"
+    assert parse_event("Connectivity is now 'full'").kind == "other"
+
+
+@pytest.mark.asyncio
+async def test_two_commands_for_all_profiles():
+    """Every profile is read with one list and one batched show"""
+    inventory = make_inventory()
+
+    assert await inventory.saved_ssids() == {
+        "Home:Office",
+        "HomeNet",
+        "preconfigured",
+        "Salt:5GHz",
+    }
+    assert await inventory.ssid_for("preconfigured") == "Salt:5GHz"
+
+    assert inventory._run.await_count == 2
+    show = inventory._run.await_args_list[1].args[0]
+    # Only wireless profiles are asked for an SSID
+    assert show[-2:] == ["aaaa", "bbbb"]
+
+
+@pytest.mark.asyncio
+async def test_cached_until_profile_event():
+    """The cache survives device events but not profile changes"""
+    inventory = make_inventory()
+    await inventory.connections()
+
+    inventory.on_event(NetworkEvent(kind="device", subject="wlan0", action="up"))
+    await inventory.connections()
+    assert inventory._run.await_count == 2
+
+    inventory.on_event(parse_event("Home: connection profile created"))
+    await inventory.connections()
+    assert inventory._run.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_expires_after_ttl():
+    """Without events the inventory is reloaded once the TTL runs out"""
+    inventory = make_inventory(ttl=0)
+    await inventory.connections()
+    await inventory.connections()
+    assert inventory._run.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_list_is_not_cached():
+    """A failing nmcli gives an empty inventory and is retried next time"""
+    run = AsyncMock(
+        side_effect=[result("", returncode=10), result(LIST_OUTPUT), result("")],
+    )
+    inventory = ConnectionInventory(run=run)
+
+    assert await inventory.connections() == []
+    assert len(await inventory.connections()) == 3
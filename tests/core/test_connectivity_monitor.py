@@ -0,0 +1,81 @@
+import asyncio
+from subprocess import CompletedProcess
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.core.connectivity_monitor import ConnectivityMonitor
+from src.core.network_events import parse_event
+
+
+def result(stdout: str, returncode: int = 0) -> CompletedProcess:
+    return CompletedProcess(args=[], returncode=returncode, stdout=stdout, stderr="")
+
+
+@pytest.mark.asyncio
+async def test_ensure_checks_once():
+    """The first read checks, later reads use the recorded state"""
+    run = AsyncMock(return_value=result("full\n"))
+    monitor = ConnectivityMonitor(run=run)
+    assert monitor.status.checked_at is None and not monitor.online
+
+    assert (await monitor.ensure()).online
+    assert (await monitor.ensure()).state == "full"
+    assert monitor.online
+    run.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_check_is_unknown():
+    """Errors and unexpected output are recorded as unknown, never online"""
+    run = AsyncMock(side_effect=[result("", returncode=8), result("garbage")])
+    monitor = ConnectivityMonitor(run=run)
+
+    assert (await monitor.check()).state == "unknown"
+    assert (await monitor.check()).state == "unknown"
+    assert not monitor.online
+
+
+@pytest.mark.asyncio
+async def test_listeners_hear_changes_only():
+    """Listeners are called when the state changes, not on every check"""
+    run = AsyncMock(
+        side_effect=[result("full"), result("full"), result("limited")],
+    )
+    monitor = ConnectivityMonitor(run=run)
+    seen = []
+    monitor.subscribe(lambda status: seen.append(status.state))
+
+    for _ in range(3):
+        await monitor.check()
+    assert seen == ["full", "limited"]
+    assert monitor.status.changed_at == monitor.status.checked_at
+
+
+@pytest.mark.asyncio
+async def test_network_manager_reports_are_taken_without_checking():
+    """nmcli monitor's connectivity lines update the state directly"""
+    run = AsyncMock()
+    monitor = ConnectivityMonitor(run=run)
+
+    await monitor.on_event(parse_event("Connectivity is now 'portal'"))
+    assert monitor.status.state == "portal"
+    run.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_device_event_triggers_check():
+    """A device change wakes the loop for a check after the settle delay"""
+    run = AsyncMock(side_effect=[result("none"), result("full")])
+    monitor = ConnectivityMonitor(run=run, interval=60, settle=0)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.01)
+        assert monitor.status.state == "none"
+
+        await monitor.on_event(parse_event("wlan0: connected"))
+        await asyncio.sleep(0.01)
+        assert monitor.online
+        assert run.await_count == 2
+    finally:
+        await monitor.stop()
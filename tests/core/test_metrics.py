@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from src.core.metrics import Registry
+
+
+@pytest.fixture
+def registry():
+    """Fresh registry so tests don't see application metrics"""
+    return Registry()
+
+
+def test_counter_render(registry):
+    """Counters render HELP/TYPE headers and one line per label set"""
+    counter = registry.counter("test_runs_total", "Runs", ("program",))
+    counter.inc("nmcli")
+    counter.inc("nmcli", amount=2)
+    counter.inc('we"ird')
+
+    text = registry.render().decode()
+    assert "# HELP test_runs_total Runs\n" in text
+    assert "# TYPE test_runs_total counter\n" in text
+    assert 'test_runs_total{program="nmcli"} 3\n' in text
+    assert 'test_runs_total{program="we\\"ird"} 1\n' in text
+
+
+def test_threadsafe_counter(registry):
+    """Increments from several threads are all counted"""
+    counter = registry.counter(
+        "test_drops_total", "Drops", ("reason",), threadsafe=True
+    )
+
+    def work():
+        for _ in range(1000):
+            counter.inc("queue_full")
+            registry.render()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value("queue_full") == 4000
+    assert 'test_drops_total{reason="queue_full"} 4000\n' in registry.render().decode()
+
+
+def test_counter_label_mismatch(registry):
+    """Wrong number of label values is rejected"""
+    counter = registry.counter("test_total", "Test", ("a",))
+    with pytest.raises(ValueError):
+        counter.inc()
+
+
+def test_histogram_cumulative_buckets(registry):
+    """Histogram buckets are cumulative and end with +Inf, _sum and _count"""
+    histogram = registry.histogram("test_seconds", "Durations", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    text = registry.render().decode()
+    assert 'test_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'test_seconds_bucket{le="1"} 2\n' in text
+    assert 'test_seconds_bucket{le="+Inf"} 3\n' in text
+    assert "test_seconds_sum 5.55\n" in text
+    assert "test_seconds_count 3\n" in text
+    assert histogram.count() == 3
+
+
+def test_render_is_cached_until_update(registry):
+    """Unchanged families reuse their rendered text"""
+    gauge = registry.gauge("test_volume", "Volume")
+    gauge.set(50)
+    first = registry.render()
+    assert registry.render() == first
+    assert gauge._dirty is False
+
+    gauge.set(60)
+    assert b"test_volume 60\n" in registry.render()
+
+
+def test_function_gauge(registry):
+    """Function gauges are read at scrape time and skipped when None"""
+    readings = {"cpu": None}
+    registry.gauge("test_cpu", "CPU", function=lambda: readings["cpu"])
+
+    assert b"\ntest_cpu " not in registry.render()
+    readings["cpu"] = 12.5
+    assert b"test_cpu 12.5\n" in registry.render()
+
+
+def test_registry_returns_existing_metric(registry):
+    """Registering a name twice returns the same metric, unless kinds differ"""
+    first = registry.counter("test_total", "Test")
+    assert registry.counter("test_total", "Test") is first
+    with pytest.raises(ValueError):
+        registry.gauge("test_total", "Test")
@@ -0,0 +1,60 @@
+import pytest
+
+from src.core.metrics_store import MetricsStore, parse_range
+
+
+def test_parse_range():
+    """Ranges accept plain seconds and s/m/h/d suffixes"""
+    assert parse_range("90") == 90
+    assert parse_range("10m") == 600
+    assert parse_range("24h") == 86400
+    assert parse_range("7d") == 604800
+    with pytest.raises(ValueError):
+        parse_range("soon")
+    with pytest.raises(ValueError):
+        parse_range("0m")
+
+
+def test_history_at_finest_resolution():
+    """Short ranges are served from the 1 s ring with gaps as None"""
+    store = MetricsStore(["cpu"])
+    store.record("cpu", 10.0, timestamp=1000.2)
+    store.record("cpu", 20.0, timestamp=1000.7)
+    store.record("cpu", 30.0, timestamp=1002.1)
+
+    series = store.history("cpu", 3, now=1002.5)
+    assert series["step"] == 1
+    assert series["start"] == 1000
+    assert series["mean"] == [15.0, None, 30.0]
+    assert series["max"] == [20.0, None, 30.0]
+    assert store.latest("cpu") == 30.0
+
+
+def test_history_downsamples_long_ranges():
+    """Ranges beyond the 1 s ring use per-minute means and peaks"""
+    store = MetricsStore(["temperature"])
+    for second in range(120):
+        store.record("temperature", 40.0 + (second == 30) * 20, timestamp=second)
+
+    series = store.history("temperature", 3600, now=119)
+    assert series["step"] == 60
+    assert len(series["mean"]) == 60
+    assert series["mean"][-2:] == [pytest.approx(40.33, abs=0.01), 40.0]
+    assert series["max"][-2:] == [60.0, 40.0]
+
+
+def test_ring_overwrites_old_laps():
+    """Buckets from a previous lap of the ring are not returned"""
+    store = MetricsStore(["disk"], resolutions=[(1, 4)])
+    store.record("disk", 1.0, timestamp=0)
+    store.record("disk", 2.0, timestamp=5)
+
+    series = store.history("disk", 4, now=5)
+    assert series["mean"] == [None, None, None, 2.0]
+
+
+def test_unknown_metric():
+    """Unknown metrics raise KeyError"""
+    store = MetricsStore(["cpu"])
+    with pytest.raises(KeyError):
+        store.history("fan", 60)
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import time
+from subprocess import CompletedProcess
+from unittest.mock import AsyncMock
+
+import pytest
+
+from config.config import settings
+from src.core.connection_inventory import ConnectionInventory
+from src.core.mode_manager import ModeManagerSingleton, NetworkMode
+from src.core.models import WiFiNetwork, WiFiStatus
+from src.core.network_events import NetworkEventMonitor, parse_event
+from src.core.sound_manager import SystemEvent
+from src.core.wifi_status_store import WiFiStatusStore
+
+DEVICE_SHOW = "GENERAL.DEVICE:wlan0\nGENERAL.STATE:{state}\n"
+
+
+class FakeNetwork:
+    """Answers nmcli commands from a device state the test controls"""
+
+    def __init__(self):
+        self.state = "20 (unavailable)"
+        self.commands = []
+
+    async def run(self, cmd, timeout=None, dedupe=False):
+        self.commands.append(cmd)
+        if cmd[-3:] == ["device", "show", "wlan0"]:
+            stdout = DEVICE_SHOW.format(state=self.state)
+        else:
+            stdout = ""
+        return CompletedProcess(args=cmd, returncode=0, stdout=stdout, stderr="")
+
+    async def report(self, state: str, line: str, delay: float = 0.05) -> None:
+        """Change the device state and emit the matching nmcli monitor line"""
+        await asyncio.sleep(delay)
+        self.state = state
+        await NetworkEventMonitor.get_instance().dispatch(parse_event(line))
+
+
+@pytest.fixture
+def network(monkeypatch):
+    monkeypatch.setattr(NetworkEventMonitor, "_instance", NetworkEventMonitor())
+    return FakeNetwork()
+
+
+@pytest.fixture
+def mode_manager(monkeypatch, tmp_path, network):
+    monkeypatch.setattr(ModeManagerSingleton, "_instance", None)
+    manager = ModeManagerSingleton()
+    manager._MODE_FILE = tmp_path / "radio_mode.json"
+    manager._current_mode = None
+    manager._run_command = network.run
+    manager._sound_manager.notify = AsyncMock()
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_client_mode_finishes_on_events(mode_manager, network):
+    """Each phase ends when NetworkManager reports it, not after fixed sleeps"""
+
+    async def bring_up():
+        await network.report("30 (disconnected)", "wlan0: disconnected")
+        await network.report("100 (connected)", "wlan0: connected")
+
+    # Events during the switch don't report the modes it passes through
+    mode_manager._current_mode = NetworkMode.AP
+    modes = []
+    mode_manager.subscribe(modes.append)
+    NetworkEventMonitor.get_instance().subscribe(mode_manager.on_event)
+
+    start = time.perf_counter()
+    task = asyncio.create_task(bring_up())
+    assert await mode_manager.enable_client_mode()
+    await task
+    assert time.perf_counter() - start < 1.0
+    assert modes == [NetworkMode.CLIENT]
+
+    # Managed mode and radio were set together, the hotspot deleted once
+    assert ["sudo", "nmcli", "connection", "down", "Hotspot"] not in network.commands
+    assert ["sudo", "nmcli", "radio", "wifi", "on"] in network.commands
+
+    transition = mode_manager.last_transition
+    assert transition.target == NetworkMode.CLIENT.value and transition.success
+    assert [phase.name for phase in transition.phases] == [
+        "stop_hotspot",
+        "prepare_device",
+        "activate",
+        "wait_connected",
+    ]
+    # Each phase is rounded to the millisecond on its own
+    phases = sum(phase.seconds for phase in transition.phases)
+    assert transition.seconds >= phases - 0.001 * len(transition.phases)
+    mode_manager._sound_manager.notify.assert_awaited_with(SystemEvent.WIFI_CONNECTED)
+
+
+@pytest.mark.asyncio
+async def test_client_mode_gives_up_at_deadline(mode_manager, network, monkeypatch):
+    """Without a connection the switch fails once the deadline passes"""
+    monkeypatch.setattr(settings, "MODE_SWITCH_TIMEOUT", 0.2)
+    network.state = "30 (disconnected)"
+
+    assert not await mode_manager.enable_client_mode()
+    transition = mode_manager.last_transition
+    assert transition.success is False
+    assert transition.phases[-1].name == "wait_connected"
+    assert 0.1 < transition.phases[-1].seconds < 1.0
+    mode_manager._sound_manager.notify.assert_awaited_with(SystemEvent.STARTUP_ERROR)
+
+
+@pytest.mark.asyncio
+async def test_mode_cached_and_kept_current_by_events(mode_manager, network):
+    """nmcli is asked once, then wlan0 events update, persist and announce"""
+    modes = []
+    mode_manager.subscribe(modes.append)
+    NetworkEventMonitor.get_instance().subscribe(mode_manager.on_event)
+    network.state = "100 (connected)\nGENERAL.CONNECTION:Home"
+
+    assert await mode_manager.detect_current_mode() == NetworkMode.CLIENT
+    assert await mode_manager.detect_current_mode() == NetworkMode.CLIENT
+    assert len(network.commands) == 1
+
+    await network.report(
+        "100 (connected)\nGENERAL.CONNECTION:Hotspot",
+        "wlan0: using connection 'Hotspot'",
+        delay=0,
+    )
+    await asyncio.sleep(0.05)
+    assert mode_manager.current_mode == NetworkMode.AP
+    assert modes == [NetworkMode.CLIENT, NetworkMode.AP]
+    assert json.loads(mode_manager._MODE_FILE.read_text()) == {"mode": "AP"}
+
+    # Other devices don't cost a read
+    await network.report(network.state, "eth0: connected", delay=0)
+    await asyncio.sleep(0.05)
+    assert len(network.commands) == 2
+
+
+@pytest.mark.asyncio
+async def test_ap_scan_keeps_hotspot_up(
+    mode_manager,
+    network,
+    monkeypatch,
+    tmp_path,
+):
+    """In AP mode wlan0 is never switched, the pre-AP snapshot fills in"""
+    network.state = "100 (connected)\nGENERAL.CONNECTION:Hotspot"
+    mode_manager._ap_scanner.scan = AsyncMock(return_value=None)
+    store = WiFiStatusStore(tmp_path / "last_wifi_status.json")
+    store.update(
+        WiFiStatus(available_networks=[WiFiNetwork(ssid="Home", signal_strength=70)]),
+    )
+    monkeypatch.setattr(WiFiStatusStore, "_instance", store)
+    monkeypatch.setattr(
+        ConnectionInventory.get_instance(),
+        "saved_ssids",
+        AsyncMock(return_value=set()),
+    )
+
+    networks = await mode_manager.scan_wifi_networks()
+    assert [n["ssid"] for n in networks] == ["Home"]
+    assert not any("managed" in cmd or "ap" in cmd for cmd in network.commands)
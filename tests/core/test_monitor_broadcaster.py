@@ -0,0 +1,130 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.monitor_broadcaster import (
+    AdaptiveInterval,
+    MonitorBroadcaster,
+    compute_delta,
+    removed_keys,
+)
+
+
+def test_compute_delta_nested_fields():
+    """Only changed leaf fields of nested dicts are reported"""
+    previous = {"systemInfo": {"cpu": "5%", "mode": "CLIENT"}, "services": [1]}
+    current = {"systemInfo": {"cpu": "7%", "mode": "CLIENT"}, "services": [1]}
+
+    assert compute_delta(previous, current) == {"systemInfo": {"cpu": "7%"}}
+    assert compute_delta(current, current) == {}
+
+
+def test_compute_delta_removed_and_list_fields():
+    """Lists are replaced wholesale, removed keys are listed separately"""
+    previous = {"services": [{"name": "dbus"}], "old": 1, "info": {"a": 1, "b": 2}}
+    current = {"services": [{"name": "dbus"}, {"name": "pigpiod"}], "info": {"a": 1}}
+
+    assert compute_delta(previous, current) == {"services": current["services"]}
+    assert removed_keys(previous, current) == [["old"], ["info", "b"]]
+
+
+def test_adaptive_interval_backoff_and_reset():
+    """Interval grows while idle, capped at the maximum"""
+    interval = AdaptiveInterval(1.0, 3.0, factor=2.0)
+    assert interval.backoff() == 2.0
+    assert interval.backoff() == 3.0
+    assert interval.backoff() == 3.0
+    assert interval.reset() == 1.0
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_sends_deltas_against_acked_snapshot():
+    """First message is full, later ones are deltas against the acked base"""
+    samples = [
+        {"systemInfo": {"cpu": "1%", "mode": "CLIENT"}},
+        {"systemInfo": {"cpu": "2%", "mode": "CLIENT"}},
+    ]
+    sampler = AsyncMock(side_effect=lambda: samples[0])
+    broadcaster = MonitorBroadcaster(sampler, min_interval=0.01, max_interval=0.01)
+    client = MagicMock()
+    client.send_text = AsyncMock()
+
+    broadcaster.subscribe(client)
+    await asyncio.sleep(0.05)
+
+    first = json.loads(client.send_text.call_args_list[0].args[0])
+    assert first["base"] is None
+    assert first["data"] == samples[0]
+    # Unchanged samples are not resent
+    assert client.send_text.call_count == 1
+
+    broadcaster.acknowledge(client, first["seq"])
+    samples.pop(0)
+    await asyncio.sleep(0.05)
+
+    second = json.loads(client.send_text.call_args_list[1].args[0])
+    assert second["base"] == first["seq"]
+    assert second["data"] == {"systemInfo": {"cpu": "2%"}}
+
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_sends_none_values():
+    """A value that becomes None is sent as None, not as a removed key"""
+    samples = [
+        {"systemInfo": {"mode": "AP", "hotspot_ssid": "radio"}},
+        {"systemInfo": {"mode": "CLIENT", "hotspot_ssid": None}},
+    ]
+    sampler = AsyncMock(side_effect=lambda: samples[0])
+    broadcaster = MonitorBroadcaster(sampler, min_interval=0.01, max_interval=0.01)
+    client = MagicMock()
+    client.send_text = AsyncMock()
+
+    broadcaster.subscribe(client)
+    await asyncio.sleep(0.05)
+    first = json.loads(client.send_text.call_args_list[0].args[0])
+    broadcaster.acknowledge(client, first["seq"])
+    samples.pop(0)
+    await asyncio.sleep(0.05)
+
+    second = json.loads(client.send_text.call_args_list[1].args[0])
+    assert second["data"] == {"systemInfo": {"mode": "CLIENT", "hotspot_ssid": None}}
+    assert "removed" not in second
+
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_pauses_without_subscribers():
+    """Sampler is not called once the last client unsubscribed"""
+    sampler = AsyncMock(return_value={"value": 1})
+    broadcaster = MonitorBroadcaster(sampler, min_interval=0.01, max_interval=0.01)
+    client = MagicMock()
+    client.send_text = AsyncMock()
+
+    broadcaster.subscribe(client)
+    await asyncio.sleep(0.03)
+    broadcaster.unsubscribe(client)
+    await asyncio.sleep(0.02)
+    calls = sampler.call_count
+    await asyncio.sleep(0.05)
+
+    assert sampler.call_count == calls
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_drops_failing_client():
+    """A client whose send fails is unsubscribed"""
+    broadcaster = MonitorBroadcaster(AsyncMock(return_value={"value": 1}))
+    client = MagicMock()
+    client.send_text = AsyncMock(side_effect=RuntimeError("closed"))
+
+    broadcaster.subscribe(client)
+    await asyncio.sleep(0.02)
+
+    assert broadcaster.connection_count == 0
+    await broadcaster.stop()
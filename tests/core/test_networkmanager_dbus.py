@@ -0,0 +1,509 @@
+import asyncio
+import shutil
+import subprocess
+from subprocess import CompletedProcess
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+
+pytest.importorskip("dbus_next")
+if shutil.which("dbus-daemon") is None:
+    pytest.skip("dbus-daemon is not installed", allow_module_level=True)
+
+from dbus_next import Variant  # noqa: E402
+from dbus_next.aio import MessageBus  # noqa: E402
+from dbus_next.constants import PropertyAccess  # noqa: E402
+from dbus_next.service import (  # noqa: E402
+    ServiceInterface,
+    dbus_property,
+    method,
+    signal,
+)
+
+from config.config import settings  # noqa: E402
+from src.core.connection_inventory import ConnectionInventory  # noqa: E402
+from src.core.connectivity_monitor import ConnectivityMonitor  # noqa: E402
+from src.core.mode_manager import ModeManagerSingleton, NetworkMode  # noqa: E402
+from src.core.network_events import NetworkEventMonitor  # noqa: E402
+from src.core.services.network_service import get_networkmanager  # noqa: E402
+from src.core.services.networkmanager import (  # noqa: E402
+    ACCESS_POINT_IFACE,
+    ACTIVE_IFACE,
+    CONNECTION_IFACE,
+    DEVICE_IFACE,
+    NM_BUS,
+    NM_IFACE,
+    NM_PATH,
+    SETTINGS_IFACE,
+    SETTINGS_PATH,
+    WIFI_MODE_AP,
+    WIRELESS_IFACE,
+    NetworkManagerService,
+    ap_security,
+)
+
+# D-Bus signatures, as dbus-next reads them from annotations
+BYTE = "y"
+BYTES = "ay"
+OBJECT = "o"
+OBJECTS = "ao"
+OBJECT_PAIR = "oo"
+STRING = "s"
+UINT = "u"
+STATE_CHANGE = "uuu"
+OPTIONS = "a{sv}"
+SETTINGS = "a{sa{sv}}"
+
+DEVICE = f"{NM_PATH}/Devices/3"
+ACTIVE = f"{NM_PATH}/ActiveConnection/1"
+HOME_AP, CAFE_AP, HIDDEN_AP = (f"{NM_PATH}/AccessPoint/{n}" for n in (1, 2, 3))
+HOME, WIRED = f"{SETTINGS_PATH}/1", f"{SETTINGS_PATH}/2"
+
+READ = PropertyAccess.READ
+
+
+class FakeManager(ServiceInterface):
+    def __init__(self):
+        super().__init__(NM_IFACE)
+        self.connectivity = 4
+        self.calls = []
+
+    @method()
+    def GetDeviceByIpIface(self, iface: STRING) -> OBJECT:
+        return DEVICE
+
+    @method()
+    def ActivateConnection(
+        self,
+        connection: OBJECT,
+        device: OBJECT,
+        specific: OBJECT,
+    ) -> OBJECT:
+        self.calls.append(("activate", connection))
+        return ACTIVE
+
+    @method()
+    def AddAndActivateConnection(
+        self,
+        connection: SETTINGS,
+        device: OBJECT,
+        specific: OBJECT,
+    ) -> OBJECT_PAIR:
+        self.calls.append(("add", connection))
+        return [f"{SETTINGS_PATH}/9", ACTIVE]
+
+    @method()
+    def DeactivateConnection(self, active: OBJECT):
+        self.calls.append(("deactivate", active))
+
+    @method()
+    def CheckConnectivity(self) -> UINT:
+        return self.connectivity
+
+    @dbus_property(access=READ)
+    def Connectivity(self) -> UINT:
+        return self.connectivity
+
+
+class FakeDevice(ServiceInterface):
+    def __init__(self):
+        super().__init__(DEVICE_IFACE)
+        self.state = 100
+        self.disconnected = False
+
+    @method()
+    def Disconnect(self):
+        self.disconnected = True
+
+    @signal()
+    def StateChanged(self, new, old, reason) -> STATE_CHANGE:
+        return [new, old, reason]
+
+    @dbus_property(access=READ)
+    def State(self) -> UINT:
+        return self.state
+
+    @dbus_property(access=READ)
+    def Interface(self) -> STRING:
+        return "wlan0"
+
+    @dbus_property(access=READ)
+    def DeviceType(self) -> UINT:
+        return 2
+
+    @dbus_property(access=READ)
+    def ActiveConnection(self) -> OBJECT:
+        return ACTIVE
+
+
+class FakeWireless(ServiceInterface):
+    def __init__(self):
+        super().__init__(WIRELESS_IFACE)
+        self.mode = 2
+        self.scans = 0
+
+    @method()
+    def GetAllAccessPoints(self) -> OBJECTS:
+        return [HOME_AP, CAFE_AP, HIDDEN_AP]
+
+    @method()
+    def RequestScan(self, options: OPTIONS):
+        self.scans += 1
+
+    @dbus_property(access=READ)
+    def ActiveAccessPoint(self) -> OBJECT:
+        return HOME_AP
+
+    @dbus_property(access=READ)
+    def Mode(self) -> UINT:
+        return self.mode
+
+
+class FakeAccessPoint(ServiceInterface):
+    def __init__(self, ssid: bytes, strength: int, rsn_flags: int = 0):
+        super().__init__(ACCESS_POINT_IFACE)
+        self.ssid = ssid
+        self.strength = strength
+        self.rsn_flags = rsn_flags
+
+    @dbus_property(access=READ)
+    def Ssid(self) -> BYTES:
+        return self.ssid
+
+    @dbus_property(access=READ)
+    def Strength(self) -> BYTE:
+        return self.strength
+
+    @dbus_property(access=READ)
+    def Flags(self) -> UINT:
+        return 1 if self.rsn_flags else 0
+
+    @dbus_property(access=READ)
+    def WpaFlags(self) -> UINT:
+        return 0
+
+    @dbus_property(access=READ)
+    def RsnFlags(self) -> UINT:
+        return self.rsn_flags
+
+
+class FakeSettings(ServiceInterface):
+    def __init__(self):
+        super().__init__(SETTINGS_IFACE)
+
+    @method()
+    def ListConnections(self) -> OBJECTS:
+        return [HOME, WIRED]
+
+    @method()
+    def GetConnectionByUuid(self, uuid: STRING) -> OBJECT:
+        return {"home-uuid": HOME, "wired-uuid": WIRED}[uuid]
+
+    @signal()
+    def NewConnection(self, path) -> OBJECT:
+        return path
+
+    @signal()
+    def ConnectionRemoved(self, path) -> OBJECT:
+        return path
+
+
+class FakeConnection(ServiceInterface):
+    def __init__(self, name: str, uuid: str, kind: str, ssid: bytes = b""):
+        super().__init__(CONNECTION_IFACE)
+        self.values = {
+            "connection": {
+                "id": Variant("s", name),
+                "uuid": Variant("s", uuid),
+                "type": Variant("s", kind),
+            },
+        }
+        if ssid:
+            self.values["802-11-wireless"] = {"ssid": Variant("ay", ssid)}
+        self.deleted = False
+
+    @method()
+    def GetSettings(self) -> SETTINGS:
+        return self.values
+
+    @method()
+    def Delete(self):
+        self.deleted = True
+
+
+class FakeActiveConnection(ServiceInterface):
+    def __init__(self):
+        super().__init__(ACTIVE_IFACE)
+
+    @dbus_property(access=READ)
+    def Id(self) -> STRING:
+        return "Home"
+
+    @dbus_property(access=READ)
+    def State(self) -> UINT:
+        return 2  # Activated
+
+
+class FakeNetworkManager:
+    """The parts of NetworkManager's D-Bus API the service uses"""
+
+    def __init__(self):
+        self.manager = FakeManager()
+        self.device = FakeDevice()
+        self.wireless = FakeWireless()
+        self.settings = FakeSettings()
+        self.home = FakeConnection("Home", "home-uuid", "802-11-wireless", b"HomeNet")
+        self.objects = {
+            NM_PATH: [self.manager],
+            DEVICE: [self.device, self.wireless],
+            HOME_AP: [FakeAccessPoint(b"HomeNet", 80, rsn_flags=0x100)],
+            CAFE_AP: [FakeAccessPoint("Café".encode(), 40)],
+            HIDDEN_AP: [FakeAccessPoint(b"", 20)],
+            SETTINGS_PATH: [self.settings],
+            HOME: [self.home],
+            WIRED: [FakeConnection("Wired", "wired-uuid", "802-3-ethernet")],
+            ACTIVE: [FakeActiveConnection()],
+        }
+
+    async def serve(self, bus: MessageBus) -> None:
+        for path, interfaces in self.objects.items():
+            for interface in interfaces:
+                bus.export(path, interface)
+        await bus.request_name(NM_BUS)
+
+
+@pytest.fixture
+def bus_address():
+    """A private bus, so tests never touch the real NetworkManager"""
+    daemon = subprocess.Popen(
+        ["dbus-daemon", "--session", "--nofork", "--print-address"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        yield daemon.stdout.readline().strip()
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+@pytest_asyncio.fixture
+async def network_manager(bus_address):
+    fake = FakeNetworkManager()
+    bus = await MessageBus(bus_address=bus_address).connect()
+    await fake.serve(bus)
+    service = NetworkManagerService(bus_address=bus_address)
+    yield fake, service
+    await service.close()
+    bus.disconnect()
+
+
+def test_ap_security():
+    """Flags are described like nmcli's SECURITY column"""
+    assert ap_security(0, 0, 0) is None
+    assert ap_security(1, 0, 0) == "WEP"
+    assert ap_security(1, 0, 0x100) == "WPA2"
+    assert ap_security(1, 0x100, 0x500) == "WPA1 WPA2 WPA3"
+
+
+@pytest.mark.asyncio
+async def test_device_state(network_manager):
+    """Device properties and the active connection's name"""
+    _, service = network_manager
+    device = await service.get_device_state()
+    assert (device.device, device.type, device.state_text) == (
+        "wlan0",
+        "wifi",
+        "connected",
+    )
+    assert device.connected and device.connection == "Home"
+
+
+@pytest.mark.asyncio
+async def test_access_points(network_manager):
+    """Hidden networks are dropped, SSIDs decoded, the active one marked"""
+    fake, service = network_manager
+    await service.request_scan()
+    networks = await service.get_access_points(saved={"HomeNet"})
+
+    assert fake.wireless.scans == 1
+    assert [(n.ssid, n.signal_strength, n.security) for n in networks] == [
+        ("HomeNet", 80, "WPA2"),
+        ("Café", 40, None),
+    ]
+    assert networks[0].in_use and networks[0].saved
+    assert not networks[1].in_use and not networks[1].saved
+
+
+@pytest.mark.asyncio
+async def test_list_connections(network_manager):
+    """Saved profiles come back as inventory entries with their SSIDs"""
+    _, service = network_manager
+    connections = await service.list_connections()
+    assert [(c.name, c.uuid, c.ssid, c.wireless) for c in connections] == [
+        ("Home", "home-uuid", "HomeNet", True),
+        ("Wired", "wired-uuid", None, False),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_connect_to_wifi(network_manager):
+    """Saved networks are activated, new ones added with their password"""
+    fake, service = network_manager
+    assert await service.connect_to_wifi("HomeNet")
+    assert fake.manager.calls == [("activate", HOME)]
+
+    assert await service.connect_to_wifi("Café", "secret")
+    action, added = fake.manager.calls[-1]
+    assert action == "add"
+    assert added["802-11-wireless"]["ssid"].value == "Café".encode()
+    assert added["802-11-wireless-security"]["psk"].value == "secret"
+
+    # A new password for a saved network replaces its profile
+    assert await service.connect_to_wifi("HomeNet", "changed")
+    assert fake.home.deleted
+
+
+@pytest.mark.asyncio
+async def test_wifi_status_and_access_point(network_manager):
+    """Client and access point modes are told apart"""
+    fake, service = network_manager
+    status = await service.get_wifi_status()
+    assert status["connected"] and status["current_ssid"] == "HomeNet"
+    assert status["has_internet"] and not status["ap_active"]
+
+    assert await service.stop_ap()
+    assert fake.manager.calls == []
+
+    fake.wireless.mode = WIFI_MODE_AP
+    status = await service.get_wifi_status()
+    assert status["ap_active"] and not status["connected"]
+    assert await service.stop_ap()
+    assert fake.manager.calls == [("deactivate", ACTIVE)]
+
+    assert await service.start_ap("radio", "radio@1234")
+    _, added = fake.manager.calls[-1]
+    assert added["802-11-wireless"]["mode"].value == "ap"
+    assert added["ipv4"]["method"].value == "shared"
+
+    assert await service.disconnect_wifi() and fake.device.disconnected
+
+
+@pytest.mark.asyncio
+async def test_signals_reach_subscribers(network_manager):
+    """Signals arrive as the same events nmcli monitor produces"""
+    fake, service = network_manager
+    events = []
+    service.subscribe(events.append)
+    connectivity = ConnectivityMonitor(run=None)
+    service.subscribe(connectivity.on_event)
+    await service.get_device_state()
+
+    fake.device.StateChanged(30, 100, 0)
+    fake.settings.ConnectionRemoved(HOME)
+    fake.manager.connectivity = 2
+    fake.manager.emit_properties_changed({"Connectivity": 2})
+    for _ in range(50):
+        if len(events) == 3:
+            break
+        await asyncio.sleep(0.01)
+
+    assert [(e.kind, e.subject, e.action) for e in events] == [
+        ("device", "wlan0", "disconnected"),
+        ("connection", HOME, "removed"),
+        ("other", None, "Connectivity is now 'portal'"),
+    ]
+    assert connectivity.status.state == "portal"
+
+
+@pytest.fixture
+def dbus_enabled(network_manager, monkeypatch):
+    """Route callers through the fake NetworkManager"""
+    _, service = network_manager
+    monkeypatch.setattr(settings, "NETWORK_DBUS_ENABLED", True)
+    monkeypatch.setattr(NetworkManagerService, "_instance", service)
+    return network_manager
+
+
+@pytest.mark.asyncio
+async def test_wifi_manager_uses_dbus(dbus_enabled, wifi_manager):
+    """Status, connect and forget go over D-Bus, nmcli is never run"""
+    fake, _ = dbus_enabled
+    wifi_manager._run_command = AsyncMock()
+
+    status = await wifi_manager.get_current_status()
+    assert status.ssid == "HomeNet" and status.has_internet
+    assert [(n.ssid, n.saved) for n in status.available_networks] == [
+        ("HomeNet", True),
+        ("Café", False),
+    ]
+
+    assert await wifi_manager.connect_to_network("Home", rescan=False)
+    assert fake.manager.calls == [("activate", HOME)]
+    assert await wifi_manager._remove_connection("Home")
+    assert fake.home.deleted
+    wifi_manager._run_command.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_network_events_follow_signals(dbus_enabled):
+    """The event monitor takes D-Bus signals instead of running nmcli monitor"""
+    fake, service = dbus_enabled
+    monitor = NetworkEventMonitor(command=["false"])
+    events = []
+    monitor.subscribe(events.append)
+    monitor.start()
+    try:
+        for _ in range(50):
+            if service._bus is not None:
+                break
+            await asyncio.sleep(0.01)
+        fake.device.StateChanged(30, 100, 0)
+        for _ in range(50):
+            if events:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await monitor.stop()
+    assert [(e.kind, e.subject, e.action) for e in events] == [
+        ("device", "wlan0", "disconnected"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_nmcli_fallback_without_bus(monkeypatch):
+    """An unreachable bus falls back to nmcli and isn't retried right away"""
+    service = NetworkManagerService(bus_address="unix:path=/nonexistent/bus")
+    monkeypatch.setattr(settings, "NETWORK_DBUS_ENABLED", True)
+    monkeypatch.setattr(NetworkManagerService, "_instance", service)
+    run = AsyncMock(
+        return_value=CompletedProcess(
+            args=[],
+            returncode=0,
+            stdout="Wired:cccc:802-3-ethernet\n",
+            stderr="",
+        ),
+    )
+    inventory = ConnectionInventory(run=run)
+
+    assert [c.name for c in await inventory.connections()] == ["Wired"]
+    assert run.await_count == 1
+    assert not service.available
+    assert get_networkmanager() is None
+
+
+@pytest.mark.asyncio
+async def test_mode_read_over_dbus(dbus_enabled, monkeypatch, tmp_path):
+    """The mode comes from the device's wireless mode"""
+    fake, _ = dbus_enabled
+    monkeypatch.setattr(ModeManagerSingleton, "_instance", None)
+    manager = ModeManagerSingleton()
+    manager._MODE_FILE = tmp_path / "radio_mode.json"
+    manager._run_command = AsyncMock()
+
+    assert await manager.refresh_mode() == NetworkMode.CLIENT
+    fake.wireless.mode = WIFI_MODE_AP
+    assert await manager.refresh_mode() == NetworkMode.AP
+    manager._run_command.assert_not_called()
@@ -0,0 +1,79 @@
+import json
+import os
+
+import pytest
+
+from src.core.station_binary import BinaryCatalog, CatalogFormatError, compile_catalog
+from src.core.station_catalog import StationCatalog
+
+
+@pytest.fixture
+def source(tmp_path):
+    """Catalog source with a shared country, an invalid entry and a duplicate name"""
+    path = tmp_path / "stations.json"
+    path.write_text(
+        json.dumps(
+            [
+                {"name": "Radio A", "url": "http://a", "country": "CH"},
+                {"name": "Broken"},
+                {
+                    "name": "Radio Ä",
+                    "url": "http://ae",
+                    "country": "CH",
+                    "location": "Bern",
+                },
+                {"name": "Radio A", "url": "http://a2"},
+            ],
+        ),
+    )
+    return path
+
+
+def test_compile_and_lookup(source, tmp_path):
+    """Compiled stations keep their positional ids and are found by id and name"""
+    target = tmp_path / "stations.bin"
+    assert compile_catalog(source, target) == 3
+
+    catalog = BinaryCatalog(target)
+    assert len(catalog) == 3
+    assert list(catalog) == [1, 3, 4]
+    assert 2 not in catalog
+    assert catalog[3].as_dict() == {
+        "name": "Radio Ä",
+        "url": "http://ae",
+        "slot": None,
+        "id": 3,
+        "country": "CH",
+        "location": "Bern",
+    }
+    assert catalog[1].location is None
+    # Last entry with a name wins, like the JSON catalog
+    assert catalog.by_name("Radio A").id == 4
+    assert catalog.by_name("Radio B") is None
+    with pytest.raises(KeyError):
+        catalog[2]
+
+
+def test_rejects_other_files(tmp_path):
+    """Files without the catalog header are rejected"""
+    path = tmp_path / "stations.bin"
+    path.write_bytes(b"not a catalog" * 4)
+    with pytest.raises(CatalogFormatError):
+        BinaryCatalog(path)
+
+
+def test_station_catalog_prefers_newer_binary(source, tmp_path):
+    """The mapped catalog is used unless the JSON file is newer"""
+    compile_catalog(source, tmp_path / "stations.bin")
+    catalog = StationCatalog(source, check_interval=0)
+
+    assert isinstance(catalog.all(), BinaryCatalog)
+    assert catalog.get(3).name == "Radio Ä"
+    assert catalog.by_name("Radio Ä").id == 3
+    assert json.loads(catalog.page(limit=1))["next_cursor"] == 1
+
+    source.write_text(json.dumps([{"name": "Fresh", "url": "http://f"}]))
+    stat = (tmp_path / "stations.bin").stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert catalog.get(1).name == "Fresh"
+    assert not isinstance(catalog.all(), BinaryCatalog)
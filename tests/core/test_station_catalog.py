@@ -0,0 +1,104 @@
+import json
+import os
+
+import pytest
+
+from src.core.models import RadioStation, StationRecord
+from src.core.station_catalog import StationCatalog
+
+
+@pytest.fixture
+def catalog_file(tmp_path):
+    """Catalog with two stations"""
+    path = tmp_path / "stations.json"
+    path.write_text(
+        json.dumps(
+            [
+                {"name": "Radio A", "url": "http://a", "country": "CH"},
+                {"name": "Radio B", "url": "http://b"},
+            ],
+        ),
+    )
+    return path
+
+
+def test_catalog_indexes_stations(catalog_file):
+    """Stations get 1-based ids and are found by id and name"""
+    catalog = StationCatalog(catalog_file, check_interval=0)
+
+    assert len(catalog) == 2
+    assert catalog.get(1).name == "Radio A"
+    assert catalog.get(1).id == 1
+    assert catalog.by_name("Radio B").id == 2
+    assert catalog.get(3) is None
+    assert json.loads(catalog.json_bytes())[0] == {
+        "name": "Radio A",
+        "url": "http://a",
+        "slot": None,
+        "id": 1,
+        "country": "CH",
+        "location": None,
+    }
+
+
+def test_catalog_reloads_only_on_change(catalog_file):
+    """The file is parsed again only when its mtime or size changes"""
+    catalog = StationCatalog(catalog_file, check_interval=0)
+    assert catalog.refresh() is True
+    assert catalog.refresh() is False
+
+    catalog_file.write_text(json.dumps([{"name": "Radio C", "url": "http://c"}]))
+    stat = catalog_file.stat()
+    os.utime(catalog_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert catalog.refresh() is True
+    assert catalog.get(1).name == "Radio C"
+    assert catalog.get(2) is None
+
+
+def test_catalog_keeps_previous_on_bad_file(catalog_file):
+    """A broken file keeps the last good catalog, a missing one empties it"""
+    catalog = StationCatalog(catalog_file, check_interval=0)
+    assert len(catalog) == 2
+
+    catalog_file.write_text("[{broken")
+    assert len(catalog) == 2
+
+    catalog_file.unlink()
+    assert len(catalog) == 0
+    assert catalog.json_bytes() == b"[]"
+
+
+def test_catalog_skips_invalid_entries(tmp_path):
+    """Entries missing required fields are skipped, ids stay positional"""
+    path = tmp_path / "stations.json"
+    path.write_text(
+        json.dumps([{"name": "No URL"}, {"name": "Ok", "url": "http://ok"}])
+    )
+    catalog = StationCatalog(path, check_interval=0)
+
+    assert list(catalog.all()) == [2]
+
+
+def test_catalog_pages_and_fields(catalog_file):
+    """Pages follow id order, project fields and are cached until reload"""
+    catalog = StationCatalog(catalog_file, check_interval=0)
+
+    first = json.loads(catalog.page(limit=1, fields=["id", "name"]))
+    assert first == {"stations": [{"name": "Radio A", "id": 1}], "next_cursor": 1}
+    second = json.loads(catalog.page(cursor=first["next_cursor"], limit=1))
+    assert second["stations"][0]["url"] == "http://b"
+    assert second["next_cursor"] is None
+
+    assert catalog.page(limit=1) is catalog.page(limit=1)
+    with pytest.raises(ValueError):
+        catalog.page(fields=["password"])
+
+
+def test_station_record_from_entry():
+    """Records validate the fields they need and convert to the API model"""
+    record = StationRecord.from_entry(7, {"name": "Radio", "url": "http://r"})
+    assert record.to_model() == RadioStation(name="Radio", url="http://r", id=7)
+    with pytest.raises(ValueError):
+        StationRecord.from_entry(1, {"name": "No URL"})
+    with pytest.raises(ValueError):
+        StationRecord.from_entry(1, {"name": "Radio", "url": "http://r", "country": 1})
@@ -0,0 +1,105 @@
+import pytest
+
+from src.core.models import RadioStation
+from src.core.station_search import StationSearch, StationSearchIndex
+
+
+def station(name, country=None, location=None):
+    return RadioStation(
+        name=name, url="http://example", country=country, location=location
+    )
+
+
+@pytest.fixture
+def index():
+    """Index with a handful of stations"""
+    index = StationSearchIndex()
+    index.sync(
+        {
+            1: station("Radio Zürich", "Switzerland", "Zürich"),
+            2: station("SRF 3", "Switzerland", "Basel"),
+            3: station("Radio Paradise", "USA", "California"),
+            4: station("BBC Radio 1", "UK", "London"),
+        },
+    )
+    return index
+
+
+def names(result):
+    return [s.name for s in result["results"]]
+
+
+def test_prefix_search_across_fields(index):
+    """Terms prefix-match name, country or location tokens, accents ignored"""
+    assert names(index.search("zur")) == ["Radio Zürich"]
+    assert names(index.search("rad swi")) == ["Radio Zürich"]
+    assert names(index.search("radio")) == [
+        "BBC Radio 1",
+        "Radio Paradise",
+        "Radio Zürich",
+    ]
+    assert index.search("nothing")["total"] == 0
+
+
+def test_short_terms_match_whole_words(index):
+    """Single characters aren't expanded as prefixes"""
+    assert names(index.search("1")) == ["BBC Radio 1"]
+    assert index.search("r")["total"] == 0
+    assert index.search("ra")["total"] == 3
+
+
+def test_facet_filters_and_counts(index):
+    """Facet filters are exact, counts describe the matching set"""
+    result = index.search(country="switzerland")
+    assert names(result) == ["Radio Zürich", "SRF 3"]
+    assert result["facets"]["location"] == {"Zürich": 1, "Basel": 1}
+    assert index.search()["facets"]["country"]["Switzerland"] == 2
+
+
+def test_cursor_pagination(index):
+    """The last id of a page continues the name order"""
+    first = index.search(limit=2)
+    assert names(first) == ["BBC Radio 1", "Radio Paradise"]
+    second = index.search(limit=2, cursor=first["next_cursor"])
+    assert names(second) == ["Radio Zürich", "SRF 3"]
+    assert second["next_cursor"] is None
+
+    with pytest.raises(ValueError):
+        index.search(cursor=99)
+
+
+def test_sync_updates_only_changes(index):
+    """Sync re-indexes changed stations and drops removed ones"""
+    updated, removed = index.sync(
+        {
+            1: station("Radio Zürich", "Switzerland", "Zürich"),
+            2: station("Couleur 3", "Switzerland", "Lausanne"),
+            3: station("Radio Paradise", "USA", "California"),
+        },
+    )
+    assert (updated, removed) == (1, 1)
+    assert index.search("srf")["total"] == 0
+    assert names(index.search("couleur")) == ["Couleur 3"]
+    assert index.search("bbc")["total"] == 0
+    assert "UK" not in index.search()["facets"]["country"]
+
+
+class FakeCatalog:
+    def __init__(self, stations):
+        self.stations = stations
+
+    def all(self):
+        return self.stations
+
+
+@pytest.mark.asyncio
+async def test_search_rebuilds_after_catalog_reload():
+    """A reloaded catalog is indexed in the background and swapped in"""
+    catalog = FakeCatalog({1: station("Radio Zürich", "Switzerland")})
+    search = StationSearch(catalog)
+    assert names(await search.search("zur")) == ["Radio Zürich"]
+
+    catalog.stations = {1: station("SRF 3", "Switzerland")}
+    search.refresh().result()
+    assert names(await search.search("srf")) == ["SRF 3"]
+    assert (await search.search("zur"))["total"] == 0
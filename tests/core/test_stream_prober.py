@@ -0,0 +1,108 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from src.core.models import StationRecord
+from src.core.stream_prober import (
+    StationHealthIndex,
+    StreamProber,
+    parse_bitrate,
+    probe_stream,
+)
+
+
+def handler(request):
+    if request.url.host == "down":
+        return httpx.Response(404)
+    if request.url.host == "broken":
+        raise httpx.ConnectError("refused")
+    return httpx.Response(
+        200,
+        headers={"content-type": "audio/mpeg", "icy-br": "128"},
+        content=b"\xff" * 8192,
+    )
+
+
+STATIONS = {
+    1: StationRecord(1, "Up", "http://up/stream", None, None),
+    2: StationRecord(2, "Down", "http://down/stream", None, None),
+    3: StationRecord(3, "Broken", "http://broken/stream", None, None),
+}
+
+
+def make_prober(tmp_path, **kwargs):
+    catalog = MagicMock()
+    catalog.all.return_value = STATIONS
+    return StreamProber(
+        catalog=catalog,
+        health=StationHealthIndex(tmp_path / "health.json"),
+        concurrency=2,
+        spacing=0,
+        idle_poll=0.01,
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+def test_parse_bitrate():
+    """Bitrate comes from icy-br or ice-audio-info"""
+    assert parse_bitrate({"icy-br": "128"}) == 128
+    assert parse_bitrate({"icy-br": "128,128"}) == 128
+    assert (
+        parse_bitrate({"ice-audio-info": "ice-samplerate=44100;ice-bitrate=96"}) == 96
+    )
+    assert parse_bitrate({"icy-br": "fast"}) is None
+    assert parse_bitrate({}) is None
+
+
+@pytest.mark.asyncio
+async def test_probe_stream_results():
+    """Reachable, failing and unreachable streams are told apart"""
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        up = await probe_stream(client, "http://up/stream")
+        down = await probe_stream(client, "http://down/stream")
+        broken = await probe_stream(client, "http://broken/stream")
+
+    assert up.ok and (up.status, up.codec, up.bitrate) == (200, "mp3", 128)
+    assert up.latency_ms is not None
+    assert not down.ok and down.error == "HTTP 404"
+    assert not broken.ok and broken.status is None
+    assert broken.error.startswith("ConnectError")
+
+
+@pytest.mark.asyncio
+async def test_round_records_and_persists(tmp_path):
+    """A round probes due stations once and saves the results"""
+    prober = make_prober(tmp_path)
+    async with prober._client() as client:
+        assert await prober.run_round(client) == 3
+        # Nothing is due again until the recheck interval passed
+        assert await prober.run_round(client) == 0
+
+    assert prober.health.ids(True, STATIONS) == {1}
+    assert prober.health.ids(False, STATIONS) == {2, 3}
+
+    saved = json.loads((tmp_path / "health.json").read_text())
+    assert saved["http://up/stream"]["codec"] == "mp3"
+
+    reloaded = StationHealthIndex(tmp_path / "health.json")
+    reloaded.load()
+    assert reloaded.ids(True, STATIONS) == {1}
+
+
+@pytest.mark.asyncio
+async def test_probing_pauses_while_playing(tmp_path):
+    """No stream is probed while audio is playing"""
+    playing = True
+    prober = make_prober(tmp_path, is_playing=lambda: playing)
+    async with prober._client() as client:
+        round_task = asyncio.create_task(prober.run_round(client))
+        await asyncio.sleep(0.1)
+        assert len(prober.health) == 0
+
+        playing = False
+        assert await asyncio.wait_for(round_task, timeout=2) == 3
+    assert len(prober.health) == 3
@@ -1,19 +1,20 @@
 import logging
-from unittest.mock import MagicMock, call
+from unittest.mock import AsyncMock, MagicMock, call
 
 import pytest
 
 
-def test_get_current_status_connected(wifi_manager):
+@pytest.mark.asyncio
+async def test_get_current_status_connected(wifi_manager):
     """Test WiFi status when connected to a network"""
     # Mock the network manager responses
-    wifi_manager._run_command = MagicMock()
+    wifi_manager._run_command = AsyncMock()
     wifi_manager._run_command.return_value = MagicMock(
         returncode=0,
         stdout="MyNetwork:90:WPA2:*\nMyNetwork:85:WPA2:no\nOtherNetwork:85:WPA2:no",
     )
 
-    status = wifi_manager.get_current_status()
+    status = await wifi_manager.get_current_status()
     assert status.ssid == "MyNetwork"
     assert status.is_connected is True
     # Expect only one entry per SSID
@@ -24,15 +25,16 @@ def test_get_current_status_connected(wifi_manager):
     )
 
 
-def test_get_current_status_disconnected(wifi_manager):
+@pytest.mark.asyncio
+async def test_get_current_status_disconnected(wifi_manager):
     """Test WiFi status when not connected"""
-    wifi_manager._run_command = MagicMock()
+    wifi_manager._run_command = AsyncMock()
     wifi_manager._run_command.return_value = MagicMock(
         returncode=0,
         stdout="Network1:80:WPA2:no\nNetwork1:75:WPA2:no\nNetwork2:75:WPA2:no",
     )
 
-    status = wifi_manager.get_current_status()
+    status = await wifi_manager.get_current_status()
     assert status.ssid is None
     assert status.is_connected is False
     # Expect only one entry per SSID
@@ -43,10 +45,30 @@ def test_get_current_status_disconnected(wifi_manager):
     )
 
 
+@pytest.mark.asyncio
+async def test_get_current_status_snapshot(wifi_manager):
+    """Scanned networks are persisted and listed while wlan0 sees none"""
+    wifi_manager._run_command = AsyncMock()
+    wifi_manager._run_command.return_value = MagicMock(
+        returncode=0,
+        stdout="Network1:80:WPA2:no\nNetwork2:75:WPA2:no",
+    )
+    await wifi_manager.get_current_status()
+    wifi_manager._status_store.flush()
+    assert wifi_manager._status_store.path.exists()
+
+    # As in AP mode, where the hotspot has wlan0
+    wifi_manager._run_command.return_value = MagicMock(returncode=0, stdout="")
+    status = await wifi_manager.get_current_status()
+    assert status.is_connected is False
+    assert [net.ssid for net in status.available_networks] == ["Network1", "Network2"]
+    assert all(net.last_seen for net in status.available_networks)
+
+
 @pytest.mark.asyncio
 async def test_connect_to_network(wifi_manager):
     """Test connecting to a WiFi network"""
-    wifi_manager._run_command = MagicMock()
+    wifi_manager._run_command = AsyncMock()
     wifi_manager._run_command.side_effect = [
         MagicMock(returncode=0, stdout=""),  # rescan
         MagicMock(returncode=0, stdout=""),  # check saved networks
@@ -66,7 +88,7 @@ async def test_connect_to_network(wifi_manager):
 @pytest.mark.asyncio
 async def test_connect_to_nonexistent_network(wifi_manager):
     """Test connecting to a non-existent network"""
-    wifi_manager._run_command = MagicMock()
+    wifi_manager._run_command = AsyncMock()
     wifi_manager._run_command.side_effect = [
         MagicMock(returncode=0, stdout=""),  # rescan
         MagicMock(returncode=0, stdout=""),  # check saved networks
@@ -89,7 +111,7 @@ async def test_connect_to_nonexistent_network(wifi_manager):
 @pytest.mark.asyncio
 async def test_connect_to_saved_network(wifi_manager):
     """Test connecting to a saved network"""
-    wifi_manager._run_command = MagicMock()
+    wifi_manager._run_command = AsyncMock()
     wifi_manager._run_command.side_effect = [
         MagicMock(returncode=0, stdout=""),  # rescan
         MagicMock(
@@ -108,28 +130,35 @@ async def test_connect_to_saved_network(wifi_manager):
     assert success is True
 
 
-def test_network_manager_not_running(wifi_manager):
+@pytest.mark.asyncio
+async def test_network_manager_not_running(wifi_manager):
     """Test behavior when network manager is not running"""
-    wifi_manager._run_command = MagicMock(
+    wifi_manager._run_command = AsyncMock(
         return_value=MagicMock(returncode=1, stderr="Network manager is not running"),
     )
 
-    status = wifi_manager.get_current_status()
+    status = await wifi_manager.get_current_status()
     assert status.ssid is None
     assert status.is_connected is False
     assert len(status.available_networks) == 0
 
 
-def test_get_current_status_with_preconfigured_network(wifi_manager):
+@pytest.mark.asyncio
+async def test_get_current_status_with_preconfigured_network(wifi_manager):
     """Test WiFi status with preconfigured network"""
-    wifi_manager._run_command = MagicMock()
+    wifi_manager._run_command = AsyncMock()
     wifi_manager._run_command.side_effect = [
-        # First call - list saved connections
+        # List saved connections
+        MagicMock(
+            returncode=0,
+            stdout="preconfigured:1111:802-11-wireless\n"
+            "Salt_2GHz_D8261F:2222:802-11-wireless\n",
+        ),
+        # Their SSIDs, in one call
         MagicMock(
             returncode=0,
-            stdout="NAME:TYPE:FILENAME\n"
-            "preconfigured:wifi:/etc/NetworkManager/system-connections/preconfigured.nmconnection\n"
-            "Salt_2GHz_D8261F:wifi:/etc/NetworkManager/system-connections/salt2g.nmconnection\n",
+            stdout="connection.uuid:1111\n802-11-wireless.ssid:Salt_5GHz_D8261F\n"
+            "connection.uuid:2222\n802-11-wireless.ssid:Salt_2GHz_D8261F\n",
         ),
         # Second call - list available networks
         MagicMock(
@@ -146,7 +175,7 @@ def test_get_current_status_with_preconfigured_network(wifi_manager):
     ]
 
     wifi_manager.logger.setLevel(logging.DEBUG)
-    status = wifi_manager.get_current_status()
+    status = await wifi_manager.get_current_status()
 
     networks = {net.ssid: net for net in status.available_networks}
     assert networks["Salt_2GHz_D8261F"].saved is True
@@ -154,16 +183,22 @@ def test_get_current_status_with_preconfigured_network(wifi_manager):
     assert networks["Salt_5GHz_D8261F"].in_use is True
 
 
-def test_get_current_status_with_saved_networks(wifi_manager):
+@pytest.mark.asyncio
+async def test_get_current_status_with_saved_networks(wifi_manager):
     """Test WiFi status with saved networks"""
-    wifi_manager._run_command = MagicMock()
+    wifi_manager._run_command = AsyncMock()
     wifi_manager._run_command.side_effect = [
-        # First call - list saved connections
+        # List saved connections
+        MagicMock(
+            returncode=0,
+            stdout="preconfigured:1111:802-11-wireless\n"
+            "Salt_2GHz_D8261F:2222:802-11-wireless\n",
+        ),
+        # Their SSIDs, in one call
         MagicMock(
             returncode=0,
-            stdout="NAME:TYPE:FILENAME\n"
-            "preconfigured:wifi:/etc/NetworkManager/system-connections/preconfigured.nmconnection\n"
-            "Salt_2GHz_D8261F:wifi:/etc/NetworkManager/system-connections/salt2g.nmconnection\n",
+            stdout="connection.uuid:1111\n802-11-wireless.ssid:Salt_2GHz_D8261F\n"
+            "connection.uuid:2222\n802-11-wireless.ssid:Salt_2GHz_D8261F\n",
         ),
         # Second call - list available networks
         MagicMock(
@@ -180,7 +215,7 @@ def test_get_current_status_with_saved_networks(wifi_manager):
     ]
 
     wifi_manager.logger.setLevel(logging.DEBUG)
-    status = wifi_manager.get_current_status()
+    status = await wifi_manager.get_current_status()
 
     networks = {net.ssid: net for net in status.available_networks}
     assert networks["Salt_2GHz_D8261F"].saved is True
@@ -192,7 +227,7 @@ def test_get_current_status_with_saved_networks(wifi_manager):
 @pytest.mark.asyncio
 async def test_failed_connection_gets_removed(wifi_manager):
     """Test that failed connection attempts are removed from saved networks"""
-    wifi_manager._run_command = MagicMock()
+    wifi_manager._run_command = AsyncMock()
     wifi_manager._run_command.side_effect = [
         MagicMock(returncode=0, stdout=""),  # rescan
         MagicMock(returncode=0, stdout=""),  # check saved networks
@@ -225,7 +260,7 @@ async def test_failed_connection_gets_removed(wifi_manager):
 @pytest.mark.asyncio
 async def test_verification_failure_removes_connection(wifi_manager):
     """Test that connections are removed if verification fails"""
-    wifi_manager._run_command = MagicMock()
+    wifi_manager._run_command = AsyncMock()
     wifi_manager._run_command.side_effect = [
         MagicMock(returncode=0, stdout=""),  # rescan
         MagicMock(returncode=0, stdout=""),  # check saved networks
@@ -254,13 +289,13 @@ async def test_verification_failure_removes_connection(wifi_manager):
 @pytest.mark.asyncio
 async def test_forget_network(wifi_manager):
     """Test forgetting a saved network"""
-    wifi_manager._run_command = MagicMock()
+    wifi_manager._run_command = AsyncMock()
     wifi_manager._run_command.side_effect = [
         # Delete connection command
         MagicMock(returncode=0, stdout=""),
     ]
 
-    result = wifi_manager._remove_connection("SavedNetwork")
+    result = await wifi_manager._remove_connection("SavedNetwork")
     assert result is True
 
     # Verify correct command was called
@@ -275,11 +310,11 @@ async def test_forget_network(wifi_manager):
 @pytest.mark.asyncio
 async def test_forget_nonexistent_network(wifi_manager):
     """Test forgetting a non-existent network"""
-    wifi_manager._run_command = MagicMock()
+    wifi_manager._run_command = AsyncMock()
     wifi_manager._run_command.side_effect = [
         # Delete connection command fails
         MagicMock(returncode=1, stdout="", stderr="No such connection profile"),
     ]
 
-    result = wifi_manager._remove_connection("NonExistentNetwork")
+    result = await wifi_manager._remove_connection("NonExistentNetwork")
     assert result is False
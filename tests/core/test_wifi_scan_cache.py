@@ -0,0 +1,178 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.core.models import WiFiNetwork, WiFiStatus
+from src.core.wifi_scan_cache import WiFiScanCache
+
+
+class FakeScanner:
+    def __init__(self, *ssids: str, delay: float = 0.0):
+        self.ssids = list(ssids)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> WiFiStatus:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return WiFiStatus(
+            available_networks=[
+                WiFiNetwork(ssid=ssid, signal_strength=50) for ssid in self.ssids
+            ],
+        )
+
+
+class FakeSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def send_text(self, message: str) -> None:
+        self.messages.append(json.loads(message))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_scan():
+    """Callers arriving during a scan wait for that scan"""
+    scanner = FakeScanner("Home", delay=0.1)
+    cache = WiFiScanCache(scanner)
+
+    results = await asyncio.gather(*(cache.get() for _ in range(5)))
+    assert scanner.calls == 1
+    assert all(r is results[0] for r in results)
+
+    # Fresh results are served without scanning
+    await cache.get()
+    assert scanner.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_results_refresh_in_background():
+    """Stale results are returned immediately while a new scan runs"""
+    scanner = FakeScanner("Home", delay=0.1)
+    cache = WiFiScanCache(scanner, ttl=0.0, forget_after=0.0)
+    first = await cache.get()
+
+    scanner.ssids = ["Office"]
+    stale = await cache.get()
+    assert stale is first
+    await asyncio.sleep(0)
+    assert scanner.calls == 2
+
+    await asyncio.sleep(0.2)
+    assert [n.ssid for n in cache._status.available_networks] == ["Office"]
+
+
+@pytest.mark.asyncio
+async def test_seeded_status_served_while_scanning():
+    """A seeded status is returned right away and replaced by the first scan"""
+    scanner = FakeScanner("Office", delay=0.05)
+    cache = WiFiScanCache(scanner)
+    cache.seed(None)
+    assert cache.age is None
+
+    seeded = WiFiStatus(
+        available_networks=[WiFiNetwork(ssid="Home", signal_strength=50)]
+    )
+    cache.seed(seeded)
+    assert await cache.get() is seeded
+    await asyncio.sleep(0.1)
+    assert scanner.calls == 1
+    assert [n.ssid for n in (await cache.get()).available_networks] == ["Office"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_networks_keep_last_seen():
+    """Networks from a snapshot keep its time and don't count as seen"""
+    saved_at = time.time() - 3600
+
+    async def scanner():
+        # As WiFiManager fills an empty scan from the snapshot
+        return WiFiStatus(
+            available_networks=[
+                WiFiNetwork(ssid="Home", signal_strength=70, last_seen=saved_at),
+            ],
+        )
+
+    cache = WiFiScanCache(scanner)
+    status = await cache.refresh()
+    assert [(n.ssid, n.last_seen) for n in status.available_networks] == [
+        ("Home", saved_at),
+    ]
+    assert not cache.seen("Home")
+
+
+@pytest.mark.asyncio
+async def test_invalidate_discards_running_scan():
+    """A scan started before invalidate() is not cached as fresh"""
+    scanner = FakeScanner("Home", delay=0.05)
+    cache = WiFiScanCache(scanner)
+    running = asyncio.create_task(cache.refresh())
+    await asyncio.sleep(0.01)
+    cache.invalidate()
+
+    assert [n.ssid for n in (await running).available_networks] == ["Home"]
+    assert cache.age is None
+    scanner.ssids = ["Office"]
+    status = await cache.get()
+    assert [n.ssid for n in status.available_networks] == ["Office"]
+    assert scanner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_too_stale_results_wait_for_scan():
+    """Past max_stale the caller waits for a new scan"""
+    scanner = FakeScanner("Home")
+    cache = WiFiScanCache(scanner, ttl=0.0, max_stale=0.0, forget_after=0.0)
+    await cache.get()
+    scanner.ssids = ["Office"]
+    status = await cache.get()
+    assert [n.ssid for n in status.available_networks] == ["Office"]
+
+
+@pytest.mark.asyncio
+async def test_last_seen_and_missing_networks():
+    """Networks carry last_seen and stay listed briefly after disappearing"""
+    scanner = FakeScanner("Home", "Cafe")
+    cache = WiFiScanCache(scanner, forget_after=60.0)
+    before = time.time()
+    status = await cache.refresh()
+    assert all(n.last_seen >= before for n in status.available_networks)
+    cafe_seen = {n.ssid: n for n in status.available_networks}["Cafe"].last_seen
+
+    scanner.ssids = ["Home"]
+    status = await cache.refresh()
+    networks = {n.ssid: n for n in status.available_networks}
+    assert networks["Cafe"].last_seen == cafe_seen
+    assert networks["Home"].last_seen > cafe_seen
+
+    cache._forget_after = 0.0
+    status = await cache.refresh()
+    assert [n.ssid for n in status.available_networks] == ["Home"]
+
+
+@pytest.mark.asyncio
+async def test_subscribers_get_updates():
+    """Subscribers are pushed changed scans and the loop idles without them"""
+    scanner = FakeScanner("Home")
+    cache = WiFiScanCache(scanner, refresh_interval=0.05)
+    socket = FakeSocket()
+
+    cache.subscribe(socket)
+    await asyncio.sleep(0.2)
+    # Unchanged rescans aren't sent again
+    assert len(socket.messages) == 1
+    assert socket.messages[0]["type"] == "wifi_update"
+
+    scanner.ssids = ["Home", "Office"]
+    await asyncio.sleep(0.15)
+    assert len(socket.messages) == 2
+
+    cache.unsubscribe(socket)
+    await asyncio.sleep(0.05)
+    calls = scanner.calls
+    await asyncio.sleep(0.2)
+    assert scanner.calls == calls
+
+    await cache.stop()
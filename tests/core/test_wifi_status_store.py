@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import pytest
+
+from src.core.models import WiFiNetwork, WiFiStatus
+from src.core.wifi_status_store import WiFiStatusStore
+
+
+def status(*networks, ssid=None):
+    return WiFiStatus(
+        ssid=ssid,
+        is_connected=ssid is not None,
+        available_networks=[
+            WiFiNetwork(ssid=name, signal_strength=signal, in_use=name == ssid)
+            for name, signal in networks
+        ],
+    )
+
+
+def test_snapshot_survives_restart(tmp_path):
+    """The compact snapshot is loaded back with networks marked as last seen"""
+    path = tmp_path / "last_wifi_status.json"
+    store = WiFiStatusStore(path)
+    assert store.status is None
+    store.update(status(("Home", 80), ("Cafe", 40), ssid="Home"))
+
+    data = json.loads(path.read_text())
+    assert data["available_networks"][1] == {"ssid": "Cafe", "signal_strength": 40}
+    assert [p.name for p in tmp_path.iterdir()] == ["last_wifi_status.json"]
+
+    loaded = WiFiStatusStore(path)
+    assert loaded.saved_at == data["saved_at"]
+    assert loaded.status.ssid == "Home" and loaded.status.is_connected
+    assert [n.ssid for n in loaded.status.available_networks] == ["Home", "Cafe"]
+    assert all(
+        n.last_seen == data["saved_at"] for n in loaded.status.available_networks
+    )
+
+
+@pytest.mark.asyncio
+async def test_only_changes_are_written(tmp_path):
+    """Signal jitter is ignored, real changes are written once after the delay"""
+    path = tmp_path / "last_wifi_status.json"
+    store = WiFiStatusStore(path, write_delay=0.05)
+    writes = []
+    write = store._write
+    store._write = lambda data: (writes.append(data), write(data))
+
+    assert store.update(status(("Home", 81)))
+    assert not store.update(status(("Home", 84)))
+    assert store.update(status(("Home", 84), ("Cafe", 40)))
+    assert not path.exists()
+
+    await asyncio.sleep(0.1)
+    assert len(writes) == 1
+    assert [n["ssid"] for n in writes[0]["available_networks"]] == ["Home", "Cafe"]
+
+
+def test_unreadable_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "last_wifi_status.json"
+    path.write_text('{"available_networks": [{"ssid": "Home"}]}')
+    assert WiFiStatusStore(path).status is None
@@ -0,0 +1,48 @@
+import asyncio
+import json
+
+import pytest
+
+from src.utils.atomic_write import WriteBehind, atomic_open, write_json
+
+
+def test_write_json_replaces_file(tmp_path):
+    path = tmp_path / "data" / "state.json"
+    write_json(path, {"a": 1})
+    write_json(path, {"a": 2}, indent=2)
+
+    assert json.loads(path.read_text()) == {"a": 2}
+    assert [p.name for p in path.parent.iterdir()] == ["state.json"]
+
+
+def test_failed_write_keeps_old_content(tmp_path):
+    """An error inside the block leaves the file and no temporary behind"""
+    path = tmp_path / "state.json"
+    path.write_text("old")
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as f:
+            f.write("new")
+            raise RuntimeError("disk full")
+
+    assert path.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+@pytest.mark.asyncio
+async def test_write_behind_coalesces():
+    """Changes in the loop flush once after the delay, outside it right away"""
+    flushes = []
+    writer = WriteBehind(lambda: flushes.append(1), delay=0.05)
+    writer.schedule()
+    writer.schedule()
+    assert flushes == []
+    await asyncio.sleep(0.1)
+    assert flushes == [1]
+
+    writer.schedule()
+    writer.cancel()
+    await asyncio.sleep(0.1)
+    assert flushes == [1]
+
+    await asyncio.to_thread(writer.schedule)
+    assert flushes == [1, 1]
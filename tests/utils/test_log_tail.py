@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from src.utils.log_tail import LogFollower, tail_lines
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """Log file with 100 numbered lines"""
+    path = tmp_path / "radio.log"
+    path.write_text("".join(f"line {i}\n" for i in range(100)))
+    return path
+
+
+def test_tail_lines_across_blocks(log_file):
+    """Lines spanning several small blocks are returned in order"""
+    assert tail_lines(log_file, 3, block_size=8) == [
+        "line 97\n",
+        "line 98\n",
+        "line 99\n",
+    ]
+
+
+def test_tail_lines_more_than_available(log_file):
+    """Asking for more lines than the file has returns the whole file"""
+    assert len(tail_lines(log_file, 500)) == 100
+
+
+def test_tail_lines_without_trailing_newline(tmp_path):
+    """A last line without newline is still returned"""
+    path = tmp_path / "radio.log"
+    path.write_text("first\nsecond\nthird")
+    assert tail_lines(path, 2) == ["second\n", "third"]
+
+
+def test_tail_lines_missing_file(tmp_path):
+    """Missing files have no lines"""
+    assert tail_lines(tmp_path / "missing.log", 10) == []
+
+
+def test_read_new_lines_handles_rotation(log_file):
+    """Only appended complete lines are returned, rotation restarts at 0"""
+    follower = LogFollower(log_file)
+    follower._open(from_start=False)
+
+    with open(log_file, "a") as f:
+        f.write("appended\npartial")
+    assert follower.read_new_lines() == ["appended"]
+
+    log_file.rename(log_file.with_suffix(".log.1"))
+    log_file.write_text("fresh\n")
+    assert follower.read_new_lines() == ["fresh"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_inotify", [True, False])
+async def test_follower_streams_appends(log_file, use_inotify):
+    """Subscribers receive lines appended after they subscribed"""
+    received = []
+
+    async def on_lines(lines):
+        received.extend(lines)
+
+    follower = LogFollower(
+        log_file,
+        poll_interval=0.02,
+        batch_delay=0.01,
+        use_inotify=use_inotify,
+    )
+    follower.subscribe(on_lines)
+    await asyncio.sleep(0.05)
+
+    with open(log_file, "a") as f:
+        f.write("new line\n")
+    for _ in range(50):
+        if received:
+            break
+        await asyncio.sleep(0.02)
+
+    assert received == ["new line"]
+    await follower.stop()
@@ -0,0 +1,141 @@
+import logging
+import time
+
+import pytest
+
+from src.utils.logger import (
+    BoundedQueueHandler,
+    RateLimitFilter,
+    RingBufferHandler,
+    queued_handler,
+    setup_logger,
+)
+
+
+@pytest.fixture
+def ring():
+    """Small ring buffer attached to a dedicated logger"""
+    handler = RingBufferHandler(capacity=5, level=logging.DEBUG)
+    log = logging.getLogger("test_ring")
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    log.addHandler(handler)
+    yield handler, log
+    log.removeHandler(handler)
+
+
+def test_ring_keeps_last_records(ring):
+    """Old records are overwritten once capacity is reached"""
+    handler, log = ring
+    for i in range(8):
+        log.info("message %d", i)
+
+    records, next_cursor = handler.query()
+    assert [r["message"] for r in records] == [f"message {i}" for i in (7, 6, 5, 4, 3)]
+    assert records[0]["seq"] == 7
+    assert records[0]["level"] == "INFO"
+    assert records[0]["logger"] == "test_ring"
+    assert next_cursor is None
+
+
+def test_query_filters(ring):
+    """Level and logger filters include child loggers only"""
+    handler, log = ring
+    log.debug("debug")
+    log.warning("warning")
+    child = log.getChild("child")
+    child.error("child error")
+    logging.getLogger("test_ring_other").addHandler(handler)
+    logging.getLogger("test_ring_other").error("other")
+    logging.getLogger("test_ring_other").removeHandler(handler)
+
+    records, _ = handler.query(min_level=logging.WARNING, logger_name="test_ring")
+    assert [r["message"] for r in records] == ["child error", "warning"]
+
+
+def test_query_pagination_and_time(ring):
+    """Cursors page backwards and since stops at older records"""
+    handler, log = ring
+    for i in range(4):
+        log.info("message %d", i)
+
+    page, cursor = handler.query(limit=2)
+    assert [r["message"] for r in page] == ["message 3", "message 2"]
+    page, cursor = handler.query(limit=2, before=cursor)
+    assert [r["message"] for r in page] == ["message 1", "message 0"]
+    assert cursor is None
+
+    newest = handler.query(limit=1)[0][0]["timestamp"]
+    records, _ = handler.query(since=newest + 1)
+    assert records == []
+
+
+def test_exception_info_is_kept(ring):
+    """Tracebacks are stored as text"""
+    handler, log = ring
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        log.exception("failed")
+
+    record = handler.query()[0][0]
+    assert record["level"] == "ERROR"
+    assert "RuntimeError: boom" in record["exc_info"]
+    assert handler.recent_lines(1)[0].endswith(" - test_ring - ERROR - failed\n")
+
+
+def test_queue_handler_drops_when_full():
+    """A full queue drops records instead of blocking the caller"""
+    handler = BoundedQueueHandler(maxsize=2)
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "msg %s", (1,), None)
+    for _ in range(3):
+        handler.handle(record)
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 1
+    # Not formatted on the calling side
+    assert handler.queue.get_nowait().args == (1,)
+
+
+def test_rate_limit_filter():
+    """Low-level records are limited per logger, warnings always pass"""
+    limiter = RateLimitFilter(rate=1.0, burst=2)
+
+    def record(name, level=logging.INFO, created=100.0):
+        r = logging.LogRecord(name, level, __file__, 1, "msg", None, None)
+        r.created = created
+        return r
+
+    assert [limiter.filter(record("hot")) for _ in range(3)] == [True, True, False]
+    assert limiter.filter(record("hot", logging.WARNING))
+    assert limiter.filter(record("other"))
+    assert limiter.filter(record("hot", created=101.0))
+    assert limiter.suppressed == 1
+
+
+def test_queued_handler_writes_from_listener(ring):
+    """Records reach the target handler through the listener thread"""
+    handler, _ = ring
+    log = logging.getLogger("test_queued")
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    queue_handler = queued_handler(handler)
+    log.addHandler(queue_handler)
+    try:
+        log.info("queued %s", "message")
+        for _ in range(100):
+            if handler.query()[0]:
+                break
+            time.sleep(0.01)
+    finally:
+        log.removeHandler(queue_handler)
+
+    assert handler.query()[0][0]["message"] == "queued message"
+
+
+def test_setup_logger_is_idempotent():
+    """Repeated setup keeps one queue, so one thread writes the log file"""
+    log = setup_logger()
+    assert setup_logger() is log
+    queues = [h for h in log.handlers if isinstance(h, BoundedQueueHandler)]
+    assert len(queues) == 1
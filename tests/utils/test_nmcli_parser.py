@@ -0,0 +1,154 @@
+import io
+import random
+import string
+
+import pytest
+
+from src.utils.nmcli_parser import (
+    iter_lines,
+    iter_rows,
+    iter_sections,
+    parse_device_show,
+    parse_wifi_list,
+    split_fields,
+)
+
+# Characters that stress the terse format, next to ordinary ones
+SSID_CHARS = string.ascii_letters + string.digits + " :\\-_.'\"*äöü€😀"
+
+
+def escape(value: str) -> str:
+    """Escape a value the way nmcli -t does"""
+    return value.replace("\\", "\\\\").replace(":", "\\:")
+
+
+def random_ssid(rng: random.Random) -> str:
+    return "".join(rng.choice(SSID_CHARS) for _ in range(rng.randint(1, 32)))
+
+
+def make_scan(rng: random.Random, count: int) -> tuple:
+    networks = [
+        (
+            random_ssid(rng),
+            rng.randint(0, 100),
+            rng.choice(["", "WPA2", "WPA1 WPA2", "WPA3"]),
+            rng.choice(["*", " "]),
+        )
+        for _ in range(count)
+    ]
+    output = "".join(
+        f"{escape(ssid)}:{signal}:{security}:{in_use}\n"
+        for ssid, signal, security, in_use in networks
+    )
+    return networks, output
+
+
+def test_split_fields_escapes():
+    """Escaped colons and backslashes stay inside their field"""
+    assert split_fields("a\\:b:c\\\\:d") == ["a:b", "c\\", "d"]
+    assert split_fields("") == [""]
+    assert split_fields("trailing\\") == ["trailing\\"]
+    assert split_fields("key:a:b\\:c", limit=1) == ["key", "a:b:c"]
+
+
+def test_iter_lines_sources():
+    """Strings, pipes and generators give the same lines"""
+    text = "one\r\ntwo\n\nthree"
+    expected = ["one", "two", "", "three"]
+    assert list(iter_lines(text)) == expected
+    assert list(iter_lines(io.StringIO(text))) == expected
+    assert list(iter_lines(line for line in text.splitlines(True))) == expected
+
+
+def test_iter_rows_skips_malformed_lines():
+    """Lines with the wrong number of fields are skipped"""
+    rows = list(iter_rows("a:1\nbroken\n\nb:2:extra\nc\\::3\n", ("NAME", "N")))
+    assert rows == [{"NAME": "a", "N": "1"}, {"NAME": "c:", "N": "3"}]
+
+
+def test_parse_wifi_list():
+    """Hidden networks and bad signals are dropped, flags are typed"""
+    output = "Cafe\\: Free:70::\n:50:WPA2:\nHome:90:WPA2:*\nOdd:strong:WPA2:\n"
+    networks = list(parse_wifi_list(output, saved={"Home"}))
+    assert [(n.ssid, n.signal_strength) for n in networks] == [
+        ("Cafe: Free", 70),
+        ("Home", 90),
+    ]
+    assert networks[0].security is None and not networks[0].in_use
+    assert networks[1].in_use and networks[1].saved
+
+
+def test_parse_device_show():
+    """GENERAL fields of a device become a typed state"""
+    output = (
+        "GENERAL.DEVICE:wlan0\n"
+        "GENERAL.TYPE:wifi\n"
+        "GENERAL.STATE:100 (connected)\n"
+        "GENERAL.CONNECTION:Home\\:Net\n"
+        "IP4.ADDRESS[1]:192.168.1.20/24\n"
+    )
+    device = parse_device_show(output)
+    assert (device.device, device.type, device.connection) == (
+        "wlan0",
+        "wifi",
+        "Home:Net",
+    )
+    assert (device.state, device.state_text, device.connected) == (
+        100,
+        "connected",
+        True,
+    )
+
+    device = parse_device_show("GENERAL.STATE:30 (disconnected)\nGENERAL.CONNECTION:--")
+    assert device.connection is None and not device.connected
+    assert parse_device_show("").state is None
+
+
+def test_iter_sections_splits_objects():
+    """Objects are split on blank lines and on repeated keys"""
+    output = "a.x:1\na.y:2\n\na.x:3\na.x:4\na.y:5:6\n"
+    assert list(iter_sections(output)) == [
+        {"a.x": "1", "a.y": "2"},
+        {"a.x": "3"},
+        {"a.x": "4", "a.y": "5:6"},
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fuzz_scan_round_trip(seed):
+    """Randomly generated scans parse back to exactly what was written"""
+    rng = random.Random(seed)
+    networks, output = make_scan(rng, 200)
+
+    parsed = list(parse_wifi_list(output))
+    assert [
+        (n.ssid, n.signal_strength, n.security or "", n.in_use) for n in parsed
+    ] == [
+        (ssid, signal, security, in_use == "*")
+        for ssid, signal, security, in_use in networks
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fuzz_garbage_never_raises(seed):
+    """Arbitrary input is skipped or parsed, never an exception"""
+    rng = random.Random(seed)
+    alphabet = string.printable + "\\:::äö"
+    output = "".join(rng.choice(alphabet) for _ in range(5000))
+
+    for network in parse_wifi_list(output):
+        assert network.ssid
+    list(iter_sections(output))
+    parse_device_show(output)
+
+
+def test_large_scan_is_streamed():
+    """A huge scan is consumed lazily, one network at a time"""
+    rng = random.Random(0)
+    networks, output = make_scan(rng, 1000)
+    output *= 50  # 50,000 lines
+
+    parsed = parse_wifi_list(output)
+    first = next(parsed)
+    assert first.ssid == networks[0][0]
+    assert sum(1 for _ in parsed) == 50_000 - 1
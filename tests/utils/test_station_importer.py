@@ -0,0 +1,115 @@
+import io
+import json
+
+import pytest
+
+from src.utils.station_importer import (
+    StationImportError,
+    import_stations,
+    iter_json_entries,
+    main,
+)
+
+
+def test_iter_json_entries_small_chunks():
+    """Entries split across chunks are decoded one at a time"""
+    data = json.dumps([{"name": "A", "tags": "x,y"}, {"name": "B"}, 3])
+    entries = list(iter_json_entries(io.StringIO(data), chunk_size=4))
+    assert entries == [{"name": "A", "tags": "x,y"}, {"name": "B"}, 3]
+
+    lines = '{"name": "A"}\n{"name": "B"}\n'
+    assert len(list(iter_json_entries(io.StringIO(lines), chunk_size=5))) == 2
+
+
+def test_iter_json_entries_errors():
+    """Truncated input and oversized entries are reported"""
+    with pytest.raises(StationImportError):
+        list(iter_json_entries(io.StringIO('[{"name": "A"'), chunk_size=4))
+    with pytest.raises(StationImportError):
+        list(
+            iter_json_entries(
+                io.StringIO('[{"name": "' + "x" * 100 + '"}]'),
+                chunk_size=8,
+                max_entry_size=32,
+            ),
+        )
+
+
+def test_import_normalizes_and_dedupes(tmp_path):
+    """Aliased fields are mapped, duplicates and invalid entries dropped"""
+    dump = tmp_path / "dump.json"
+    dump.write_text(
+        json.dumps(
+            [
+                {
+                    "name": "  Radio   A ",
+                    "url": "http://a",
+                    "url_resolved": "https://a/stream",
+                    "state": "Bern",
+                    "country": "Switzerland",
+                },
+                {"name": "Radio A copy", "url": "https://A/stream/"},
+                {"name": "radio a", "url": "http://other", "country": "Switzerland"},
+                {"name": "No scheme", "url": "a.example.com"},
+                {"name": "", "url": "http://empty"},
+            ],
+        ),
+    )
+    csv_dump = tmp_path / "more.csv"
+    csv_dump.write_text("name,url,country\nRadio B,http://b,Germany\n,http://c,\n")
+    output = tmp_path / "stations.json"
+
+    stats = import_stations([dump, csv_dump], output)
+
+    assert json.loads(output.read_text()) == [
+        {
+            "name": "Radio A",
+            "url": "https://a/stream",
+            "country": "Switzerland",
+            "location": "Bern",
+        },
+        {"name": "Radio B", "url": "http://b", "country": "Germany"},
+    ]
+    assert (stats.read, stats.imported, stats.duplicates, stats.invalid) == (7, 2, 2, 3)
+    assert stats.bytes_read == stats.bytes_total
+
+
+def test_import_append_keeps_existing(tmp_path):
+    """Appending keeps the current catalog first and exactly as it was"""
+    output = tmp_path / "stations.json"
+    current = [
+        {"name": "Existing", "url": "http://e", "extra": 1},
+        # Duplicates and odd entries in the catalog keep their positions (ids)
+        {"name": "Existing", "url": "http://e/"},
+        {"name": "Broken", "url": "ftp://b"},
+    ]
+    output.write_text(json.dumps(current))
+    dump = tmp_path / "dump.jsonl"
+    dump.write_text(
+        '{"name": "New", "url": "http://n"}\n{"name": "Dup", "url": "http://e"}\n'
+    )
+
+    stats = import_stations([dump], output, append=True)
+
+    assert json.loads(output.read_text()) == [
+        *current,
+        {"name": "New", "url": "http://n"},
+    ]
+    assert (stats.existing, stats.imported, stats.duplicates) == (3, 1, 1)
+
+
+def test_cli_failure_keeps_output(tmp_path, capsys):
+    """A broken source fails the CLI and leaves the catalog untouched"""
+    output = tmp_path / "stations.json"
+    output.write_text("[]")
+    broken = tmp_path / "broken.json"
+    broken.write_text('[{"name": ')
+
+    assert main([str(broken), "-o", str(output), "-q"]) == 1
+    assert output.read_text() == "[]"
+    # No temporary file left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "broken.json",
+        "stations.json",
+    ]
+    assert "Import failed" in capsys.readouterr().err